@@ -0,0 +1,7 @@
+"""
+Hermetic benchmarks for the purchase funnel.
+
+The benchmarks seed a test database, replace the external services (LMS, Discovery, Enterprise) with local stub
+servers and drive the hot purchase endpoints through the Django test client. They are run with the
+``run_benchmarks`` management command.
+"""
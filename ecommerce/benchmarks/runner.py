@@ -0,0 +1,149 @@
+""" Runs benchmark scenarios and compares their results to a baseline. """
+from __future__ import unicode_literals
+
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from ecommerce.benchmarks.seed import BENCHMARK_DOMAIN
+
+DEFAULT_LATENCY_TOLERANCE = 0.5
+
+
+class BenchmarkError(Exception):
+    """ Raised when a scenario request does not succeed. """
+    pass
+
+
+def percentile(values, percent):
+    """ Returns the nearest-rank percentile of the given values. """
+    ordered = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+@contextmanager
+def _unbounded_query_log():
+    """ Lift the limit on the number of queries logged by the connection, which would otherwise make requests running
+    more queries than the limit appear to run none. """
+    queries_log = connection.queries_log
+    connection.queries_log = deque(queries_log)
+    try:
+        yield
+    finally:
+        connection.queries_log = queries_log
+
+
+def run_scenario(scenario, stubs, iterations):
+    """ Issue a scenario's request repeatedly and summarize the measurements.
+
+    A single warm-up request is made first, and excluded from the results, so that per-process caches do not skew
+    the numbers.
+
+    Arguments:
+        scenario (Scenario): The scenario to run.
+        stubs (StubServices): Stub servers whose calls are counted.
+        iterations (int): Number of measured requests.
+
+    Returns:
+        dict: p50 and p99 latency in milliseconds, and the median number of queries and outbound calls per request.
+    """
+    client = Client(SERVER_NAME=BENCHMARK_DOMAIN)
+    client.force_login(scenario.get_user())
+
+    latencies = []
+    query_counts = []
+    outbound_calls = []
+
+    for iteration in range(iterations + 1):
+        scenario.prepare(iteration)
+        stubs.reset_calls()
+
+        with _unbounded_query_log():
+            with CaptureQueriesContext(connection) as queries:
+                start = time.time()
+                response = scenario.run(client)
+                duration = time.time() - start
+            query_count = len(queries)
+
+        if not scenario.is_successful(response):
+            raise BenchmarkError('Scenario [{name}] failed with status [{status}].'.format(
+                name=scenario.name, status=response.status_code
+            ))
+
+        if iteration == 0:
+            continue
+
+        latencies.append(duration * 1000)
+        query_counts.append(query_count)
+        outbound_calls.append(sum(stubs.call_counts().values()))
+
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'queries': percentile(query_counts, 50),
+        'outbound_calls': percentile(outbound_calls, 50),
+    }
+
+
+def compare_to_baseline(results, baseline, latency_tolerance=DEFAULT_LATENCY_TOLERANCE):
+    """ Find the scenarios which regressed relative to the baseline.
+
+    Query and outbound call counts are deterministic, so any increase is a regression, as is a scenario missing from
+    the baseline. Latency depends on the machine, so it is only compared when the baseline records it, and is only a
+    regression when it exceeds the baseline by more than the given tolerance, expressed as a fraction of the baseline.
+
+    Returns:
+        list: Descriptions of each regression.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        expected = baseline.get(name)
+        if not expected:
+            regressions.append('{name}: no baseline recorded'.format(name=name))
+            continue
+
+        for metric in ('queries', 'outbound_calls'):
+            if result[metric] > expected[metric]:
+                regressions.append('{name}: {metric} increased from {expected} to {actual}'.format(
+                    name=name, metric=metric, expected=expected[metric], actual=result[metric]
+                ))
+
+        for metric in ('p50_ms', 'p99_ms'):
+            if metric not in expected:
+                continue
+
+            limit = expected[metric] * (1 + latency_tolerance)
+            if result[metric] > limit:
+                regressions.append('{name}: {metric} increased from {expected} to {actual}'.format(
+                    name=name, metric=metric, expected=expected[metric], actual=result[metric]
+                ))
+
+    return regressions
+
+
+def read_baseline(path):
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file).get('scenarios', {})
+    except IOError:
+        return {}
+
+
+def write_baseline(path, results, include_latency=False, **metadata):
+    """ Write results to a baseline file, without their latency unless include_latency is set. """
+    if not include_latency:
+        results = {
+            name: {metric: result[metric] for metric in ('queries', 'outbound_calls')}
+            for name, result in results.items()
+        }
+    data = dict(metadata, scenarios=results)
+    with open(path, 'w') as baseline_file:
+        json.dump(data, baseline_file, indent=2, sort_keys=True, separators=(',', ': '))
+        baseline_file.write('\n')
@@ -0,0 +1,162 @@
+""" Requests made against the purchase funnel during a benchmark run. """
+from __future__ import unicode_literals
+
+import json
+
+from django.urls import reverse
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.benchmarks.seed import FREE_SKU
+from ecommerce.extensions.payment.constants import CARD_TYPES
+from ecommerce.extensions.payment.helpers import sign
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.test.factories import create_basket
+
+Basket = get_model('basket', 'Basket')
+OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
+
+JSON = 'application/json'
+
+
+class Scenario(object):
+    """ A single request, issued repeatedly against seeded data.
+
+    Subclasses implement :meth:`run`. Work which should not be timed, such as building a basket to pay for, belongs
+    in :meth:`prepare`, which is called before every iteration.
+    """
+    name = None
+    expected_status_codes = (200,)
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_user(self):
+        """ Returns the user the client is logged in as. """
+        return self.data.users[0]
+
+    def prepare(self, iteration):  # pylint: disable=unused-argument
+        pass
+
+    def run(self, client):
+        raise NotImplementedError
+
+    def is_successful(self, response):
+        return response.status_code in self.expected_status_codes
+
+
+class BasketAddItemsScenario(Scenario):
+    name = 'basket_add_items'
+    expected_status_codes = (200, 303)
+
+    def run(self, client):
+        sku = self.data.seats[0].stockrecords.first().partner_sku
+        return client.get(reverse('basket:basket-add'), {'sku': sku})
+
+
+class BasketSummaryScenario(Scenario):
+    name = 'basket_summary'
+
+    def prepare(self, iteration):
+        if iteration == 0:
+            basket = Basket.get_basket(self.get_user(), self.data.site)
+            basket.flush()
+            basket.add_product(self.data.seats[0])
+
+    def run(self, client):
+        return client.get(reverse('basket:summary'))
+
+
+class BasketCalculateScenario(Scenario):
+    name = 'basket_calculate'
+
+    def run(self, client):
+        skus = [seat.stockrecords.first().partner_sku for seat in self.data.seats[:3]]
+        return client.get(reverse('api:v2:baskets:calculate'), {'sku': skus})
+
+
+class VoucherOffersScenario(Scenario):
+    name = 'voucher_offers'
+
+    def get_user(self):
+        return self.data.staff_user
+
+    def run(self, client):
+        code = self.data.coupon.attr.coupon_vouchers.vouchers.first().code
+        return client.get(reverse('api:v2:vouchers-offers-list'), {'code': code})
+
+
+class BasketCreateCheckoutScenario(Scenario):
+    name = 'basket_create_checkout'
+
+    def run(self, client):
+        data = {'products': [{'sku': FREE_SKU}], 'checkout': True}
+        return client.post(reverse('api:v2:baskets:create'), data=json.dumps(data), content_type=JSON)
+
+
+class CybersourceNotificationScenario(Scenario):
+    """ Posts a signed, accepted CyberSource notification for a freshly frozen basket. """
+    name = 'cybersource_notification'
+    expected_status_codes = (302,)
+
+    def __init__(self, data):
+        super(CybersourceNotificationScenario, self).__init__(data)
+        self.processor = Cybersource(data.site)
+        self.notification = None
+
+    def prepare(self, iteration):
+        basket = create_basket(owner=self.get_user(), site=self.data.site, empty=True)
+        basket.add_product(self.data.seats[iteration % len(self.data.seats)])
+        basket.freeze()
+
+        notification = {
+            'decision': 'ACCEPT',
+            'reason_code': '100',
+            'req_reference_number': OrderNumberGenerator().order_number(basket),
+            'transaction_id': 'benchmark-{}'.format(basket.id),
+            'auth_amount': unicode(basket.total_incl_tax),
+            'req_amount': unicode(basket.total_incl_tax),
+            'req_tax_amount': '0.00',
+            'req_currency': basket.currency,
+            'req_card_number': 'xxxxxxxxxxxx1111',
+            'req_card_type': CARD_TYPES['visa']['cybersource_code'],
+            'req_profile_id': self.processor.profile_id,
+            'req_bill_to_forename': 'Benchmark',
+            'req_bill_to_surname': 'User',
+            'req_bill_to_address_line1': '141 Portland Ave.',
+            'req_bill_to_address_city': 'Cambridge',
+            'req_bill_to_address_postal_code': '02139',
+            'req_bill_to_address_country': 'US',
+        }
+        field_names = notification.keys()
+        message = ','.join('{}={}'.format(key, notification[key]) for key in field_names)
+        notification['signed_field_names'] = ','.join(field_names)
+        notification['signature'] = sign(message, self.processor.secret_key)
+        self.notification = notification
+
+    def run(self, client):
+        return client.post(reverse('cybersource:redirect'), self.notification)
+
+    def is_successful(self, response):
+        # Failures are also reported with a redirect, to the payment error page.
+        return response.status_code == 302 and response['Location'] != reverse('payment_error')
+
+
+class CouponReportScenario(Scenario):
+    name = 'coupon_report'
+
+    def get_user(self):
+        return self.data.staff_user
+
+    def run(self, client):
+        return client.get(reverse('api:v2:coupons:coupon_reports', kwargs={'coupon_id': self.data.coupon.id}))
+
+
+SCENARIOS = (
+    BasketAddItemsScenario,
+    BasketSummaryScenario,
+    BasketCalculateScenario,
+    VoucherOffersScenario,
+    BasketCreateCheckoutScenario,
+    CybersourceNotificationScenario,
+    CouponReportScenario,
+)
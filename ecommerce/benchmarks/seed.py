@@ -0,0 +1,222 @@
+""" Seed data for benchmark runs. """
+from __future__ import unicode_literals
+
+import datetime
+import logging
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.test import RequestFactory
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.api.v2.views.coupons import CouponViewSet
+from ecommerce.extensions.basket.utils import prepare_basket
+from ecommerce.extensions.catalogue.utils import create_coupon_product
+from ecommerce.extensions.test.factories import (
+    EnterpriseOfferFactory,
+    ProgramCourseRunSeatsConditionFactory,
+    ProgramOfferFactory,
+    create_basket,
+    create_order
+)
+from ecommerce.tests.factories import SiteConfigurationFactory
+
+logger = logging.getLogger(__name__)
+
+Benefit = get_model('offer', 'Benefit')
+BusinessClient = get_model('core', 'BusinessClient')
+Country = get_model('address', 'Country')
+Voucher = get_model('voucher', 'Voucher')
+
+BENCHMARK_DOMAIN = 'benchmark.fake'
+CATALOG_QUERY = 'org:benchmark'
+FREE_SKU = 'BENCHMARK-FREE'
+
+# Number of objects created for each unit of scale.
+COURSES_PER_SCALE = 50
+USERS_PER_SCALE = 100
+ORDERS_PER_USER = 5
+VOUCHERS_PER_SCALE = 10000
+
+
+class BenchmarkData(object):
+    """ References to the objects created by :func:`seed`, used by the benchmark scenarios. """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _scaled(count, scale):
+    return max(1, int(count * scale))
+
+
+def seed(stubs, scale=1.0):
+    """ Populate the database with data representative of production, at the given scale.
+
+    Arguments:
+        stubs (StubServices): Stub servers the site should call in place of the real services.
+        scale (float): Multiplier applied to the number of courses, users, orders and vouchers created.
+
+    Returns:
+        BenchmarkData
+    """
+    Site.objects.all().delete()
+    site_configuration = SiteConfigurationFactory(
+        from_email='benchmark@example.com',
+        lms_url_root=stubs.lms.url,
+        discovery_api_url='{}/api/v1/'.format(stubs.discovery.url),
+        oauth_settings={
+            'SOCIAL_AUTH_EDX_OIDC_KEY': 'key',
+            'SOCIAL_AUTH_EDX_OIDC_SECRET': 'secret',
+        },
+        partner__name='edX',
+        partner__short_code='edx',
+        segment_key=None,
+        site__domain=BENCHMARK_DOMAIN,
+        site__id=settings.SITE_ID,
+    )
+    site = site_configuration.site
+    partner = site_configuration.partner
+
+    courses = [
+        CourseFactory(id='course-v1:Benchmark+BM{}+Run'.format(index), name='Benchmark Course {}'.format(index))
+        for index in range(_scaled(COURSES_PER_SCALE, scale))
+    ]
+    seats = [course.create_or_update_seat('verified', True, 100, partner) for course in courses]
+    for course in courses:
+        course.create_or_update_seat('audit', False, 0, partner)
+
+    stubs.discovery.add_route('/api/v1/course_runs/', {
+        'count': len(courses),
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'key': course.id,
+                'title': course.name,
+                'start': '2016-05-01T00:00:00Z',
+                'enrollment_end': None,
+                'image': {'src': 'https://example.com/image.jpg'},
+            }
+            for course in courses
+        ],
+    })
+
+    free_product = factories.ProductFactory(
+        title='Benchmark Free Product',
+        product_class=factories.ProductClassFactory(
+            name='Benchmark', requires_shipping=False, track_stock=False
+        ),
+        stockrecords__partner=partner,
+        stockrecords__partner_sku=FREE_SKU,
+        stockrecords__price_excl_tax=Decimal('0.00'),
+    )
+
+    program_offer = _seed_program_offer(stubs, courses, seats, site)
+    enterprise_offer = EnterpriseOfferFactory(site=site)
+
+    staff_user = factories.UserFactory(is_staff=True, is_superuser=True)
+    users = [factories.UserFactory() for __ in range(_scaled(USERS_PER_SCALE, scale))]
+    _seed_order_history(users, seats, site)
+
+    coupon = _seed_coupon(partner, site, staff_user, _scaled(VOUCHERS_PER_SCALE, scale))
+
+    Country.objects.get_or_create(iso_3166_1_a2='US', defaults={'name': 'United States', 'printable_name': 'US'})
+
+    logger.info(
+        'Seeded %d courses, %d users with %d orders each and a coupon with %d vouchers.',
+        len(courses), len(users), ORDERS_PER_USER, coupon.attr.coupon_vouchers.vouchers.count()
+    )
+
+    return BenchmarkData(
+        coupon=coupon,
+        courses=courses,
+        enterprise_offer=enterprise_offer,
+        free_product=free_product,
+        partner=partner,
+        program_offer=program_offer,
+        seats=seats,
+        site=site,
+        staff_user=staff_user,
+        users=users,
+    )
+
+
+def _seed_program_offer(stubs, courses, seats, site):
+    program_uuid = uuid.uuid4()
+    program_courses = list(zip(courses, seats))[:3]
+    stubs.discovery.add_route('/api/v1/programs/{}/'.format(program_uuid), {
+        'uuid': str(program_uuid),
+        'title': 'Benchmark Program',
+        'type': 'MicroMasters',
+        'applicable_seat_types': ['verified'],
+        'courses': [
+            {
+                'key': course.id,
+                'title': course.name,
+                'course_runs': [{
+                    'key': course.id,
+                    'seats': [{'type': 'verified', 'sku': seat.stockrecords.first().partner_sku}],
+                }],
+                'entitlements': [],
+            }
+            for course, seat in program_courses
+        ],
+    })
+
+    return ProgramOfferFactory(
+        condition=ProgramCourseRunSeatsConditionFactory(program_uuid=program_uuid),
+        site=site,
+    )
+
+
+def _seed_order_history(users, seats, site):
+    for user_index, user in enumerate(users):
+        for order_index in range(ORDERS_PER_USER):
+            basket = create_basket(owner=user, site=site, empty=True)
+            basket.add_product(seats[(user_index + order_index) % len(seats)])
+            create_order(basket=basket, user=user, site=site)
+
+
+def _seed_coupon(partner, site, staff_user, quantity):
+    """ Create an invoiced, dynamic coupon so that both the offers and coupon report endpoints can be exercised. """
+    coupon = create_coupon_product(
+        benefit_type=Benefit.PERCENTAGE,
+        benefit_value=10,
+        catalog=None,
+        catalog_query=CATALOG_QUERY,
+        category=factories.CategoryFactory(path='1000'),
+        code='',
+        course_seat_types='verified',
+        email_domains=None,
+        end_datetime=datetime.datetime.now() + datetime.timedelta(days=365),
+        enterprise_customer=None,
+        max_uses=None,
+        note=None,
+        partner=partner,
+        price=100,
+        quantity=quantity,
+        start_datetime=datetime.datetime.now() - datetime.timedelta(days=1),
+        title='Benchmark Coupon',
+        voucher_type=Voucher.SINGLE_USE,
+        course_catalog=None,
+        program_uuid=None,
+        site=site,
+    )
+
+    request = RequestFactory().get('/')
+    request.site = site
+    request.user = staff_user
+    request.COOKIES = {}
+
+    basket = prepare_basket(request, [coupon])
+    view = CouponViewSet()
+    view.request = request
+    client, __ = BusinessClient.objects.get_or_create(name='Benchmark Client')
+    view.create_order_for_invoice(basket, coupon_id=coupon.id, client=client)
+
+    return coupon
@@ -0,0 +1,161 @@
+""" Local stub servers standing in for the services called during the purchase funnel. """
+from __future__ import unicode_literals
+
+import json
+import logging
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from collections import Counter
+from SocketServer import ThreadingMixIn
+from urlparse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE = {'count': 0, 'next': None, 'previous': None, 'results': []}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, stub):
+        # HTTPServer is an old-style class.
+        HTTPServer.__init__(self, server_address, handler_class)
+        self.stub = stub
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    def _respond(self):
+        stub = self.server.stub
+        path = urlparse(self.path).path
+        stub.record_call(self.command, path)
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        status, body = stub.get_response(self.command, path)
+        content = json.dumps(body)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.debug('%s: ' + format, self.server.stub.name, *args)
+
+
+class StubServer(object):
+    """ A threaded HTTP server that replies to requests with canned JSON.
+
+    Routes are matched on method and path prefix, with the longest matching prefix winning. Requests which match no
+    route receive an empty, paginated response so that callers iterating over results terminate cleanly.
+
+    Arguments:
+        name (str): Name of the service being replaced, used in reports.
+        routes (dict): Mapping of (method, path prefix) to a (status, body) tuple. The method may be ``None`` to
+            match any method.
+        latency (float): Seconds to wait before responding to each request.
+    """
+
+    def __init__(self, name, routes=None, latency=0):
+        self.name = name
+        self.routes = dict(routes or {})
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return 'http://{host}:{port}'.format(host=host, port=port)
+
+    @property
+    def call_count(self):
+        return sum(self.calls.values())
+
+    def add_route(self, path, body, status=200, method=None):
+        self.routes[(method, path)] = (status, body)
+
+    def get_response(self, method, path):
+        candidates = [
+            (prefix, response) for (route_method, prefix), response in self.routes.items()
+            if route_method in (None, method) and path.startswith(prefix)
+        ]
+        if not candidates:
+            return 200, DEFAULT_RESPONSE
+
+        __, response = max(candidates, key=lambda candidate: len(candidate[0]))
+        return response
+
+    def record_call(self, method, path):
+        with self._lock:
+            self.calls['{} {}'.format(method, path)] += 1
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), _StubRequestHandler, self)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='{}-stub'.format(self.name))
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info('Started %s stub server at %s.', self.name, self.url)
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class StubServices(object):
+    """ The set of stub servers replacing LMS, Discovery and Enterprise for a benchmark run. """
+
+    def __init__(self, latency=0):
+        self.lms = StubServer('lms', latency=latency)
+        self.discovery = StubServer('discovery', latency=latency)
+        self.enterprise = StubServer('enterprise', latency=latency)
+
+        self.lms.add_route('/oauth2/access_token', {
+            'access_token': 'benchmark-token',
+            'expires_in': 3600,
+            'token_type': 'JWT',
+        })
+        self.lms.add_route('/api/enrollment/v1/enrollment', {}, method='POST')
+        self.lms.add_route('/api/enrollment/v1/enrollment', [], method='GET')
+        self.lms.add_route('/api/credit/v1/eligibility/', [])
+        self.lms.add_route('/api/embargo/v1/course_access/', {'access': True})
+
+    @property
+    def servers(self):
+        return [self.lms, self.discovery, self.enterprise]
+
+    def call_counts(self):
+        return {server.name: server.call_count for server in self.servers}
+
+    def reset_calls(self):
+        for server in self.servers:
+            server.reset_calls()
+
+    def start(self):
+        for server in self.servers:
+            server.start()
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,129 @@
+import json
+import tempfile
+from collections import deque
+
+import requests
+from django.db import connection
+from django.http import HttpResponse
+from django.test import override_settings
+
+from ecommerce.benchmarks.runner import compare_to_baseline, percentile, read_baseline, run_scenario, write_baseline
+from ecommerce.benchmarks.scenarios import SCENARIOS, Scenario
+from ecommerce.benchmarks.seed import seed
+from ecommerce.benchmarks.stubs import DEFAULT_RESPONSE, StubServer, StubServices
+from ecommerce.core.management.commands.run_benchmarks import DEFAULT_BASELINE
+from ecommerce.tests.testcases import TestCase
+
+
+class RunnerTests(TestCase):
+    baseline = {
+        'basket_summary': {'p50_ms': 10.0, 'p99_ms': 20.0, 'queries': 12, 'outbound_calls': 1},
+    }
+
+    def test_percentile(self):
+        """ Verify the nearest-rank percentile is returned. """
+        values = range(1, 101)
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_compare_to_baseline_within_tolerance(self):
+        """ Verify results within the latency tolerance, with no more queries or calls, are not regressions. """
+        results = {'basket_summary': {'p50_ms': 14.0, 'p99_ms': 25.0, 'queries': 11, 'outbound_calls': 1}}
+        self.assertEqual(compare_to_baseline(results, self.baseline, latency_tolerance=0.5), [])
+
+    def test_compare_to_baseline_regressions(self):
+        """ Verify additional queries or calls, and latency beyond the tolerance, are regressions. """
+        results = {'basket_summary': {'p50_ms': 16.0, 'p99_ms': 20.0, 'queries': 13, 'outbound_calls': 2}}
+        regressions = compare_to_baseline(results, self.baseline, latency_tolerance=0.5)
+        self.assertEqual(len(regressions), 3)
+
+    def test_compare_to_baseline_missing_scenario(self):
+        """ Verify scenarios without a baseline are regressions. """
+        results = {'coupon_report': {'p50_ms': 1.0, 'p99_ms': 1.0, 'queries': 1, 'outbound_calls': 0}}
+        self.assertEqual(compare_to_baseline(results, self.baseline), ['coupon_report: no baseline recorded'])
+
+    def test_compare_to_baseline_without_latency(self):
+        """ Verify latency is not compared when the baseline does not record it. """
+        baseline = {'basket_summary': {'queries': 12, 'outbound_calls': 1}}
+        results = {'basket_summary': {'p50_ms': 1000.0, 'p99_ms': 1000.0, 'queries': 12, 'outbound_calls': 1}}
+        self.assertEqual(compare_to_baseline(results, baseline), [])
+
+    def test_baseline_round_trip(self):
+        """ Verify a written baseline can be read back. """
+        with tempfile.NamedTemporaryFile(suffix='.json') as baseline_file:
+            write_baseline(baseline_file.name, self.baseline, include_latency=True, scale=1.0)
+            self.assertEqual(read_baseline(baseline_file.name), self.baseline)
+            self.assertEqual(json.load(open(baseline_file.name))['scale'], 1.0)
+
+            write_baseline(baseline_file.name, self.baseline)
+            self.assertEqual(read_baseline(baseline_file.name), {
+                'basket_summary': {'queries': 12, 'outbound_calls': 1},
+            })
+
+    def test_committed_baseline(self):
+        """ Verify the committed baseline records every scenario. """
+        baseline = read_baseline(DEFAULT_BASELINE)
+        self.assertEqual(set(baseline), {scenario.name for scenario in SCENARIOS})
+
+
+class QueryingScenario(Scenario):
+    """ Runs a fixed number of queries, without making a request. """
+    name = 'querying'
+
+    def get_user(self):
+        return self.data
+
+    def run(self, client):
+        for __ in range(10):
+            self.data.refresh_from_db()
+        return HttpResponse()
+
+
+class ScenarioTests(TestCase):
+    def test_queries_beyond_log_limit(self):
+        """ Verify queries are counted when a request runs more of them than the connection logs. """
+        queries_log = connection.queries_log
+        connection.queries_log = deque(maxlen=5)
+        try:
+            with StubServices() as stubs:
+                result = run_scenario(QueryingScenario(self.create_user()), stubs, 1)
+        finally:
+            connection.queries_log = queries_log
+
+        self.assertEqual(result['queries'], 10)
+
+    def test_scenarios(self):
+        """ Verify every scenario runs successfully once against a small seeded database. """
+        with StubServices() as stubs:
+            with override_settings(ENTERPRISE_API_URL='{}/enterprise/api/v1/'.format(stubs.enterprise.url)):
+                data = seed(stubs, scale=0.01)
+                for scenario_class in SCENARIOS:
+                    result = run_scenario(scenario_class(data), stubs, 1)
+                    self.assertEqual(set(result), {'p50_ms', 'p99_ms', 'queries', 'outbound_calls'})
+
+
+class StubServerTests(TestCase):
+    def setUp(self):
+        super(StubServerTests, self).setUp()
+        self.stub = StubServer('lms').start()
+        self.addCleanup(self.stub.stop)
+
+    def test_routes(self):
+        """ Verify requests are answered by the longest matching route, and counted. """
+        self.stub.add_route('/api/', {'route': 'api'})
+        self.stub.add_route('/api/enrollment/', {'route': 'enrollment'}, status=201, method='POST')
+
+        response = requests.post(self.stub.url + '/api/enrollment/v1/enrollment')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'route': 'enrollment'})
+
+        response = requests.get(self.stub.url + '/api/enrollment/v1/enrollment')
+        self.assertEqual(response.json(), {'route': 'api'})
+
+        response = requests.get(self.stub.url + '/unknown/')
+        self.assertEqual(response.json(), DEFAULT_RESPONSE)
+
+        self.assertEqual(self.stub.call_count, 3)
+        self.stub.reset_calls()
+        self.assertEqual(self.stub.call_count, 0)
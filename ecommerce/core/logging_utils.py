@@ -0,0 +1,173 @@
+"""
+Logging handlers and formatters which keep logging off the request thread.
+
+Handlers such as SysLogHandler write to their destination in the thread that logs, so a slow syslog socket
+stalls the request being served. QueueHandler instead places records in a bounded queue, from which a
+background thread passes them to the handler they are destined for. Records are formatted by that thread, and
+records logged while the queue is full are dropped and counted, rather than blocking.
+"""
+from __future__ import unicode_literals
+
+import json
+import logging
+import logging.handlers
+import os
+import platform
+import threading
+from Queue import Full, Queue
+
+import six
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.encoding import python_2_unicode_compatible
+
+# Placed in a queue to stop the thread reading it.
+_STOP = object()
+
+
+@python_2_unicode_compatible
+class AuditMessage(object):
+    """
+    Message of an audit event, rendered as comma-separated key="value" pairs only when it is formatted.
+
+    Log it as the argument of a '%s' message, so that formatting it produces text.
+
+    Arguments:
+        name (str): Name of the event, such as 'payment_received'.
+        data (dict): Data describing the event.
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def __str__(self):
+        payload = ', '.join(['{k}="{v}"'.format(k=k, v=v) for k, v in sorted(self.data.items())])
+        return '{name}: {payload}'.format(name=self.name, payload=payload)
+
+
+class AuditJSONEncoder(DjangoJSONEncoder):
+    """ Encodes decimals, dates and UUIDs as DjangoJSONEncoder does, and any other object as its text. """
+
+    def default(self, o):  # pylint: disable=method-hidden
+        try:
+            return super(AuditJSONEncoder, self).default(o)
+        except TypeError:
+            return six.text_type(o)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as JSON objects, with the name and data of audit events as separate keys.
+    """
+    hostname = platform.node().split('.')[0]
+
+    def format(self, record):
+        data = {
+            'service_variant': 'ecommerce',
+            'hostname': self.hostname,
+            'process': record.process,
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+
+        # Audit events are logged with their AuditMessage as the only argument.
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 1 and isinstance(args[0], AuditMessage):
+            data['event'] = args[0].name
+            data['data'] = args[0].data
+
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(data, cls=AuditJSONEncoder, sort_keys=True)
+
+
+class QueueHandler(logging.handlers.MemoryHandler):
+    """
+    Passes records to a target handler from a background thread.
+
+    At most capacity records wait in the queue. Records logged while it is full are dropped, and a warning
+    reporting the number dropped is passed to the target once the queue has room again.
+
+    The handler is a MemoryHandler, so that logging.config.dictConfig resolves its target from the target's name.
+
+    Arguments:
+        capacity (int): Maximum number of records waiting to be handled.
+        target (logging.Handler): Handler to which records are passed.
+    """
+
+    def __init__(self, capacity, flushLevel=logging.ERROR, target=None):
+        super(QueueHandler, self).__init__(capacity, flushLevel=flushLevel, target=target)
+        self.queue = None
+        self.dropped = 0
+        self._pid = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        """ Start the thread reading the queue, in each process, as threads do not survive forking. """
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self.queue = Queue(self.capacity)
+                self.dropped = 0
+                self._thread = threading.Thread(target=self._run, name='logging-queue', args=(self.queue,))
+                self._thread.daemon = True
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start()
+
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self.lock:
+                self.dropped += 1
+
+    def _run(self, queue):
+        while True:
+            record = queue.get()
+            if record is _STOP:
+                break
+
+            self._handle(record)
+
+            if self.dropped:
+                with self.lock:
+                    dropped, self.dropped = self.dropped, 0
+                self._handle(logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    'Dropped [%d] log records, as the logging queue was full.', (dropped,), None
+                ))
+
+    def _handle(self, record):
+        target = self.target
+        if target and record.levelno >= target.level:
+            try:
+                target.handle(record)
+            except Exception:  # pylint: disable=broad-except
+                target.handleError(record)
+
+    def shouldFlush(self, record):
+        return False
+
+    def flush(self):
+        """ Stop the thread once it has handled the queued records, waiting for it briefly.
+
+        The thread is started again if more records are logged.
+        """
+        if self._pid == os.getpid():
+            try:
+                self.queue.put(_STOP, timeout=1)
+            except Full:
+                return
+            self._thread.join(1)
+            self._pid = None
+
+    def close(self):
+        self.flush()
+        # MemoryHandler.close would also remove the target, which is closed separately.
+        logging.Handler.close(self)
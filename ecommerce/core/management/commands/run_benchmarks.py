@@ -0,0 +1,131 @@
+from __future__ import unicode_literals
+
+import json
+import logging
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment
+)
+
+from ecommerce.benchmarks import runner
+from ecommerce.benchmarks.scenarios import SCENARIOS
+from ecommerce.benchmarks.seed import seed
+from ecommerce.benchmarks.stubs import StubServices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(runner.__file__), 'baseline.json')
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the purchase funnel against a freshly seeded test database, with external services replaced '
+            'by local stubs. Run with --settings=ecommerce.settings.test.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='store',
+            dest='scale',
+            type=float,
+            default=1.0,
+            help='Multiplier for the amount of seeded data. Defaults to 1.'
+        )
+        parser.add_argument(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            type=int,
+            default=20,
+            help='Number of measured requests per scenario. Defaults to 20.'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            action='store',
+            dest='latency_ms',
+            type=int,
+            default=0,
+            help='Latency, in milliseconds, injected into every stubbed service call. Defaults to 0.'
+        )
+        parser.add_argument(
+            '--latency-tolerance',
+            action='store',
+            dest='latency_tolerance',
+            type=float,
+            default=runner.DEFAULT_LATENCY_TOLERANCE,
+            help='Fraction by which latency may exceed the baseline before it is a regression. Defaults to 0.5.'
+        )
+        parser.add_argument(
+            '--scenarios',
+            action='store',
+            dest='scenarios',
+            nargs='+',
+            default=None,
+            help='Names of the scenarios to run. Defaults to all scenarios.'
+        )
+        parser.add_argument(
+            '--baseline',
+            action='store',
+            dest='baseline',
+            default=DEFAULT_BASELINE,
+            help='Path of the baseline file results are compared against.'
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            dest='update_baseline',
+            default=False,
+            help='Write the results to the baseline file instead of comparing against it.'
+        )
+        parser.add_argument(
+            '--record-latency',
+            action='store_true',
+            dest='record_latency',
+            default=False,
+            help='Include latency in the written baseline. Only use on the machine the baseline is compared on.'
+        )
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options['scenarios']:
+            scenarios = [scenario for scenario in SCENARIOS if scenario.name in options['scenarios']]
+            unknown = set(options['scenarios']) - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError('Unknown scenarios: {}'.format(', '.join(sorted(unknown))))
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with StubServices(latency=options['latency_ms'] / 1000.0) as stubs:
+                with override_settings(ENTERPRISE_API_URL='{}/enterprise/api/v1/'.format(stubs.enterprise.url)):
+                    data = seed(stubs, scale=options['scale'])
+                    results = {}
+                    for scenario_class in scenarios:
+                        logger.info('Running scenario [%s]...', scenario_class.name)
+                        results[scenario_class.name] = runner.run_scenario(
+                            scenario_class(data), stubs, options['iterations']
+                        )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps(results, indent=2, sort_keys=True))
+
+        if options['update_baseline']:
+            runner.write_baseline(
+                options['baseline'], results, include_latency=options['record_latency'], scale=options['scale'],
+                latency_ms=options['latency_ms']
+            )
+            logger.info('Wrote baseline to [%s].', options['baseline'])
+            return
+
+        regressions = runner.compare_to_baseline(
+            results, runner.read_baseline(options['baseline']), latency_tolerance=options['latency_tolerance']
+        )
+        if regressions:
+            raise CommandError('Performance regressions detected:\n{}'.format('\n'.join(regressions)))
@@ -0,0 +1,74 @@
+"""
+Middleware for profiling requests.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from ecommerce.core.profiling import Profiler, get_budget
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware(object):
+    """
+    Middleware that profiles each request, logging the SQL queries, outbound calls and cache lookups it made.
+
+    The middleware is only active when REQUEST_PROFILING_ENABLED is set. When DEBUG is also set, the
+    measurements are added to the response as X-Profile-* headers. Requests exceeding the budget
+    declared for their view in REQUEST_PROFILING_BUDGETS are logged as warnings.
+    """
+
+    def __init__(self):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+    def process_request(self, request):
+        profiler = Profiler(site=getattr(request, 'site', None))
+        profiler.__enter__()
+        request._profiler = profiler  # pylint: disable=protected-access
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        profiler = getattr(request, '_profiler', None)
+        if profiler is None:
+            return
+
+        # The site is set by middleware running after this one, so it is only available now.
+        profiler.site = getattr(request, 'site', None)
+        profiler.profile.view_name = request.resolver_match.view_name
+
+    def process_response(self, request, response):
+        profiler = getattr(request, '_profiler', None)
+        if profiler is None:
+            return response
+
+        profiler.__exit__(None, None, None)
+        profile = profiler.profile
+
+        summary = dict(profile.as_dict(), path=request.path, status=response.status_code)
+        logger.info('Request profile: %s', json.dumps(summary, sort_keys=True))
+
+        if profile.duplicate_queries:
+            logger.debug('Duplicate queries for [%s]: %s', profile.view_name, json.dumps(profile.duplicate_queries))
+
+        budget = get_budget(profile.view_name)
+        if budget:
+            violations = budget.check(profile)
+            if violations:
+                logger.warning('Request to [%s] exceeded its budget: %s', profile.view_name, '; '.join(violations))
+
+        if settings.DEBUG:
+            response['X-Profile-Queries'] = profile.query_count
+            response['X-Profile-Duplicate-Queries'] = profile.duplicate_query_count
+            response['X-Profile-DB-Time'] = '{:.1f}ms'.format(profile.db_time * 1000)
+            response['X-Profile-Outbound-Calls'] = profile.outbound_call_count
+            response['X-Profile-HTTP-Time'] = ', '.join(
+                '{}={:.1f}ms'.format(service, call['time'] * 1000)
+                for service, call in sorted(profile.http_calls.items())
+            )
+            if profile.cache_hit_ratio is not None:
+                response['X-Profile-Cache-Hit-Ratio'] = '{:.2f}'.format(profile.cache_hit_ratio)
+
+        return response
@@ -20,7 +20,7 @@ from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from analytics import Client as SegmentClient
 from ecommerce.core.url_utils import get_lms_url
-from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.core.utils import log_message_and_raise_validation_error, run_in_thread
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
 from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
 
@@ -508,15 +508,49 @@ class User(AbstractUser):
             ConnectionError, SlumberBaseException and Timeout for failures in establishing a
             connection with the LMS eligibility API endpoint.
         """
+        return self._get_credit_eligibility(self._get_credit_api(), course_key)
+
+    def get_credit_eligibility(self, course_keys):
+        """
+        Check if a user is eligible for credit in each of several courses.
+        The LMS eligibility API accepts a single course key, so the courses are checked
+        concurrently, at most CREDIT_ELIGIBILITY_CONCURRENCY at a time.
+
+        Args:
+            course_keys (iterable): The course keys for which the eligibility is checked for.
+
+        Returns:
+            A dict mapping each course key to its eligibility information, as returned by is_eligible_for_credit.
+
+        Raises:
+            ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+            connection with the LMS eligibility API endpoint.
+        """
+        course_keys = list(course_keys)
+        if len(course_keys) <= 1:
+            return {course_key: self.is_eligible_for_credit(course_key) for course_key in course_keys}
+
+        # The LMS URL is that of the current site, which is only known to the thread serving the request.
+        api = self._get_credit_api()
+        eligibility = {}
+        size = settings.CREDIT_ELIGIBILITY_CONCURRENCY
+        for start in range(0, len(course_keys), size):
+            waits = [
+                (course_key, run_in_thread(self._get_credit_eligibility, api, course_key))
+                for course_key in course_keys[start:start + size]
+            ]
+            eligibility.update((course_key, wait()) for course_key, wait in waits)
+        return eligibility
+
+    def _get_credit_api(self):
+        return EdxRestApiClient(get_lms_url('api/credit/v1/'), oauth_access_token=self.access_token)
+
+    def _get_credit_eligibility(self, api, course_key):
         query_strings = {
             'username': self.username,
             'course_key': course_key
         }
         try:
-            api = EdxRestApiClient(
-                get_lms_url('api/credit/v1/'),
-                oauth_access_token=self.access_token
-            )
             response = api.eligibility().get(**query_strings)
         except (ConnectionError, SlumberBaseException, Timeout):  # pragma: no cover
             log.exception(
@@ -0,0 +1,295 @@
+"""
+Per-request profiling of database queries, outbound HTTP calls and cache lookups.
+
+Profiling is opt-in. Wrap code in :class:`Profiler` to collect measurements for it, or enable
+``ProfilingMiddleware`` (see ``REQUEST_PROFILING_ENABLED``) to profile every request. Budgets,
+declared per view in ``REQUEST_PROFILING_BUDGETS``, bound what a view may do and are checked by
+the middleware and by tests.
+"""
+from __future__ import unicode_literals
+
+import functools
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from urlparse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.utils import CursorDebugWrapper
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+# Keys produced by ecommerce.core.utils.get_cache_key are MD5 hex digests.
+CACHE_KEY_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Hosts of the payment processors' APIs, used to attribute outbound calls to a service.
+PAYMENT_PROCESSOR_HOSTS = {
+    'cybersource': ('cybersource.com', 'ic3.com'),
+    'paypal': ('paypal.com',),
+    'stripe': ('stripe.com',),
+}
+
+_FINGERPRINT_SUBSTITUTIONS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def fingerprint_query(sql):
+    """ Reduce a SQL statement to its shape, so that queries differing only in their parameters compare equal. """
+    for pattern, replacement in _FINGERPRINT_SUBSTITUTIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_service_name(url, site=None):
+    """ Name the service an outbound request is made to.
+
+    LMS, Discovery and Enterprise are identified by the URLs configured for the site, and payment
+    processors by their API hosts. Calls to any other service are attributed to the host name.
+    """
+    host = urlparse(url).hostname or ''
+
+    if site is not None:
+        site_configuration = site.siteconfiguration
+        service_urls = (
+            ('lms', site_configuration.lms_url_root),
+            ('discovery', site_configuration.discovery_api_url),
+            ('enterprise', settings.ENTERPRISE_API_URL),
+        )
+        for name, service_url in service_urls:
+            if service_url and urlparse(service_url).hostname == host:
+                return name
+
+    for name, processor_hosts in PAYMENT_PROCESSOR_HOSTS.items():
+        if any(host == processor_host or host.endswith('.' + processor_host) for processor_host in processor_hosts):
+            return name
+
+    return host
+
+
+class Budget(object):
+    """ Upper bounds on the work done by a single request. Limits which are None are not enforced. """
+
+    def __init__(self, queries=None, duplicate_queries=None, outbound_calls=None):
+        self.queries = queries
+        self.duplicate_queries = duplicate_queries
+        self.outbound_calls = outbound_calls
+
+    def check(self, profile):
+        """ Returns a description of each limit the given profile exceeds. """
+        measurements = (
+            ('queries', profile.query_count),
+            ('duplicate_queries', profile.duplicate_query_count),
+            ('outbound_calls', profile.outbound_call_count),
+        )
+        violations = []
+        for name, value in measurements:
+            limit = getattr(self, name)
+            if limit is not None and value > limit:
+                violations.append('{name}: {value} exceeds budget of {limit}'.format(
+                    name=name, value=value, limit=limit
+                ))
+        return violations
+
+
+def get_budget(view_name):
+    """ Returns the Budget declared for the named view in REQUEST_PROFILING_BUDGETS, if any. """
+    limits = settings.REQUEST_PROFILING_BUDGETS.get(view_name)
+    return Budget(**limits) if limits else None
+
+
+class Profile(object):
+    """ Measurements collected by a Profiler. """
+
+    def __init__(self):
+        self.queries = []
+        self.http_calls = defaultdict(lambda: {'count': 0, 'time': 0.0})
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duration = 0.0
+        self.view_name = None
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    @property
+    def db_time(self):
+        return sum(float(query['time']) for query in self.queries)
+
+    @property
+    def duplicate_queries(self):
+        """ Fingerprints of queries issued more than once, with their counts. Repeats usually indicate N+1 access. """
+        counts = Counter(fingerprint_query(query['sql']) for query in self.queries)
+        return {fingerprint: count for fingerprint, count in counts.items() if count > 1}
+
+    @property
+    def duplicate_query_count(self):
+        return sum(count - 1 for count in self.duplicate_queries.values())
+
+    @property
+    def outbound_call_count(self):
+        return sum(call['count'] for call in self.http_calls.values())
+
+    @property
+    def http_time(self):
+        return sum(call['time'] for call in self.http_calls.values())
+
+    @property
+    def cache_hit_ratio(self):
+        lookups = self.cache_hits + self.cache_misses
+        return float(self.cache_hits) / lookups if lookups else None
+
+    def as_dict(self):
+        return {
+            'view': self.view_name,
+            'duration_ms': round(self.duration * 1000, 1),
+            'queries': self.query_count,
+            'duplicate_queries': self.duplicate_query_count,
+            'db_ms': round(self.db_time * 1000, 1),
+            'http': {
+                service: {'count': call['count'], 'ms': round(call['time'] * 1000, 1)}
+                for service, call in self.http_calls.items()
+            },
+            'http_ms': round(self.http_time * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+def _active_profilers():
+    if not hasattr(_local, 'profilers'):
+        _local.profilers = []
+    return _local.profilers
+
+
+def _profiled_send(send):
+    def wrapper(session, request, **kwargs):
+        profilers = _active_profilers()
+        if not profilers:
+            return send(session, request, **kwargs)
+
+        start = time.time()
+        try:
+            return send(session, request, **kwargs)
+        finally:
+            duration = time.time() - start
+            for profiler in profilers:
+                profiler.record_http_call(request.url, duration)
+    return wrapper
+
+
+class _ProfiledCursorWrapper(CursorDebugWrapper):
+    """ Records each query logged by the connection with the active profilers.
+
+    Queries are taken from the end of the connection's query log as they are logged, as the log is bounded and
+    positions in it no longer refer to the same queries once it is full.
+    """
+
+    def execute(self, sql, params=None):
+        try:
+            return super(_ProfiledCursorWrapper, self).execute(sql, params)
+        finally:
+            self._record_query()
+
+    def executemany(self, sql, param_list):
+        try:
+            return super(_ProfiledCursorWrapper, self).executemany(sql, param_list)
+        finally:
+            self._record_query()
+
+    def _record_query(self):
+        query = self.db.queries_log[-1]
+        for profiler in _active_profilers():
+            profiler.profile.queries.append(query)
+
+
+def _install_http_hook():
+    """ Route requests made with the requests library (including slumber clients) through the profiler. """
+    global _installed  # pylint: disable=global-statement
+    with _install_lock:
+        if not _installed:
+            requests.Session.send = _profiled_send(requests.Session.send)
+            _installed = True
+
+
+class Profiler(object):
+    """ Context manager collecting a Profile for the code it wraps.
+
+    Example:
+        >>> with Profiler() as profile:
+        ...     client.get('/basket/')
+        >>> profile.query_count
+        12
+    """
+
+    def __init__(self, site=None):
+        self.site = site
+        self.profile = Profile()
+        self._force_debug_cursors = {}
+        self._shadowed_debug_cursors = {}
+        self._cache = None
+        self._shadowed_cache_get = None
+        self._start = None
+
+    def record_http_call(self, url, duration):
+        call = self.profile.http_calls[get_service_name(url, self.site)]
+        call['count'] += 1
+        call['time'] += duration
+
+    def _profiled_cache_get(self, get):
+        def wrapper(key, *args, **kwargs):
+            value = get(key, *args, **kwargs)
+            if CACHE_KEY_PATTERN.match(key):
+                if value is None:
+                    self.profile.cache_misses += 1
+                else:
+                    self.profile.cache_hits += 1
+            return value
+        return wrapper
+
+    def __enter__(self):
+        _install_http_hook()
+
+        for connection in connections.all():
+            self._force_debug_cursors[connection.alias] = connection.force_debug_cursor
+            self._shadowed_debug_cursors[connection.alias] = connection.__dict__.get('make_debug_cursor')
+            connection.force_debug_cursor = True
+            connection.make_debug_cursor = functools.partial(_ProfiledCursorWrapper, db=connection)
+
+        # Caches are thread-local, so wrapping the instance only observes lookups made by this thread.
+        self._cache = caches['default']
+        self._shadowed_cache_get = self._cache.__dict__.get('get')
+        self._cache.get = self._profiled_cache_get(self._cache.get)
+
+        _active_profilers().append(self)
+        self._start = time.time()
+        return self.profile
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.duration = time.time() - self._start
+        _active_profilers().remove(self)
+
+        # Restore whichever get method was in place before, which is an enclosing profiler's when nested.
+        if self._shadowed_cache_get is None:
+            del self._cache.get
+        else:
+            self._cache.get = self._shadowed_cache_get
+
+        for connection in connections.all():
+            if connection.alias not in self._force_debug_cursors:
+                continue
+            connection.force_debug_cursor = self._force_debug_cursors[connection.alias]
+            if self._shadowed_debug_cursors[connection.alias] is None:
+                del connection.make_debug_cursor
+            else:
+                connection.make_debug_cursor = self._shadowed_debug_cursors[connection.alias]
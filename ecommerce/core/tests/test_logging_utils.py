@@ -0,0 +1,60 @@
+import json
+import logging
+import threading
+from decimal import Decimal
+
+from ecommerce.core.logging_utils import AuditMessage, JsonFormatter, QueueHandler
+from ecommerce.tests.testcases import TestCase
+
+
+def make_record(msg, *args):
+    return logging.LogRecord('test', logging.INFO, __file__, 1, msg, args, None)
+
+
+class BlockingHandler(logging.Handler):
+    """ Records the messages it handles, waiting to be released after handling the first. """
+
+    def __init__(self):
+        super(BlockingHandler, self).__init__()
+        self.messages = []
+        self.entered = threading.Event()
+        self.released = threading.Event()
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+        self.entered.set()
+        self.released.wait(5)
+
+
+class AuditMessageTests(TestCase):
+    def test_formatting(self):
+        """ Verify audit messages are rendered as key-value pairs, and as JSON by the JSON formatter. """
+        record = make_record(u'%s', AuditMessage('payment_received', {'amount': Decimal('10.00'), 'basket_id': 1}))
+        expected = 'payment_received: amount="10.00", basket_id="1"'
+        self.assertEqual(record.getMessage(), expected)
+
+        data = json.loads(JsonFormatter().format(record))
+        self.assertEqual(data['message'], expected)
+        self.assertEqual(data['event'], 'payment_received')
+        self.assertEqual(data['data'], {'amount': '10.00', 'basket_id': 1})
+
+
+class QueueHandlerTests(TestCase):
+    def test_handled_in_background(self):
+        """ Verify records are passed to the target by another thread, and dropped while the queue is full. """
+        target = BlockingHandler()
+        handler = QueueHandler(1, target=target)
+        self.addCleanup(handler.close)
+
+        handler.handle(make_record('first'))
+        self.assertTrue(target.entered.wait(5))
+        handler.handle(make_record('second'))
+        handler.handle(make_record('third'))
+        self.assertEqual(handler.dropped, 1)
+
+        target.released.set()
+        handler.flush()
+        self.assertEqual(
+            target.messages,
+            ['first', 'Dropped [1] log records, as the logging queue was full.', 'second']
+        )
@@ -119,6 +119,21 @@ class UserTests(DiscoveryTestMixin, LmsApiMockMixin, TestCase):
         user, course_key = self.prepare_credit_eligibility_info(eligible=False)
         self.assertFalse(user.is_eligible_for_credit(course_key))
 
+    @override_settings(CREDIT_ELIGIBILITY_CONCURRENCY=2)
+    def test_get_credit_eligibility(self):
+        """ Verify the method checks the eligibility in each course, over a single client. """
+        user = self.create_user()
+        course_keys = ['a/b/c', 'd/e/f', 'g/h/i']
+        eligible = {'a/b/c': [{'course_key': 'a/b/c'}], 'd/e/f': [], 'g/h/i': [{'course_key': 'g/h/i'}]}
+
+        with mock.patch.object(User, '_get_credit_api') as mock_get_api:
+            with mock.patch.object(User, '_get_credit_eligibility') as mock_get:
+                mock_get.side_effect = lambda api, course_key: eligible[course_key]
+                self.assertEqual(user.get_credit_eligibility(course_keys), eligible)
+
+        self.assertEqual(mock_get_api.call_count, 1)
+        self.assertEqual(mock_get.call_count, len(course_keys))
+
     @httpretty.activate
     @ddt.data(
         (200, True),
@@ -0,0 +1,156 @@
+import json
+from collections import deque
+
+import httpretty
+import requests
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from testfixtures import LogCapture
+
+from ecommerce.core.profiling import Budget, Profiler, fingerprint_query, get_service_name
+from ecommerce.core.utils import get_cache_key
+from ecommerce.tests.mixins import ProfilingMixin
+from ecommerce.tests.testcases import TestCase
+
+User = get_user_model()
+MIDDLEWARE_LOGGER_NAME = 'ecommerce.core.middleware'
+
+
+class ProfilerTests(ProfilingMixin, TestCase):
+    def test_fingerprint_query(self):
+        """ Verify queries differing only in their parameters share a fingerprint. """
+        self.assertEqual(
+            fingerprint_query('SELECT * FROM "auth_user" WHERE ("id" = 1 AND "username" = \'bob\')'),
+            fingerprint_query('SELECT * FROM "auth_user" WHERE ("id" = 22 AND "username" = \'it\'\'s\')'),
+        )
+        self.assertEqual(
+            fingerprint_query('SELECT * FROM "auth_user" WHERE "id" IN (1, 2, 3)'),
+            fingerprint_query('SELECT * FROM "auth_user" WHERE "id" IN (4)'),
+        )
+
+    def test_get_service_name(self):
+        """ Verify outbound calls are attributed to the configured services and payment processors. """
+        self.assertEqual(get_service_name(self.site.siteconfiguration.build_lms_url('/api/'), self.site), 'lms')
+        self.assertEqual(
+            get_service_name(self.site.siteconfiguration.discovery_api_url + 'course_runs/', self.site), 'discovery'
+        )
+        self.assertEqual(get_service_name('https://api.sandbox.paypal.com/v1/payments/', self.site), 'paypal')
+        self.assertEqual(get_service_name('https://example.com/api/', self.site), 'example.com')
+
+    def test_queries(self):
+        """ Verify queries, and repeated queries, are recorded. """
+        users = [self.create_user() for __ in range(3)]
+
+        with Profiler() as profile:
+            for user in users:
+                User.objects.get(id=user.id)
+            User.objects.count()
+
+        self.assertEqual(profile.query_count, 4)
+        self.assertEqual(profile.duplicate_query_count, 2)
+        self.assertEqual(profile.duplicate_queries.values(), [3])
+
+    def test_queries_with_full_query_log(self):
+        """ Verify queries are recorded once the connection's bounded query log is full. """
+        user = self.create_user()
+        queries_log = connection.queries_log
+        connection.queries_log = deque([{'sql': 'SELECT 1', 'time': '0.000'}] * 2, maxlen=2)
+        self.addCleanup(setattr, connection, 'queries_log', queries_log)
+
+        with Profiler() as profile:
+            for __ in range(3):
+                User.objects.get(id=user.id)
+
+        self.assertEqual(profile.query_count, 3)
+        self.assertEqual(profile.duplicate_query_count, 2)
+
+    def test_cache_lookups(self):
+        """ Verify hits and misses are counted for lookups of keys generated by get_cache_key. """
+        key = get_cache_key(resource='profiling')
+        cache.set(key, 'value')
+
+        with Profiler() as profile:
+            cache.get(key)
+            cache.get(get_cache_key(resource='missing'))
+            cache.get('unrelated')
+
+        self.assertEqual(profile.cache_hits, 1)
+        self.assertEqual(profile.cache_misses, 1)
+        self.assertEqual(profile.cache_hit_ratio, 0.5)
+
+        # The cache should no longer be instrumented.
+        self.assertNotIn('get', caches['default'].__dict__)
+
+    @httpretty.activate
+    def test_outbound_calls(self):
+        """ Verify outbound calls are counted and timed per service. """
+        url = self.site.siteconfiguration.build_lms_url('/api/enrollment/v1/enrollment')
+        httpretty.register_uri(httpretty.GET, url, body='{}', content_type='application/json')
+
+        with Profiler(site=self.site) as profile:
+            requests.get(url)
+            requests.get(url)
+
+        self.assertEqual(profile.outbound_call_count, 2)
+        self.assertEqual(profile.http_calls['lms']['count'], 2)
+
+        # Calls made outside of a profiler are not recorded.
+        requests.get(url)
+        self.assertEqual(profile.outbound_call_count, 2)
+
+    def test_budget(self):
+        """ Verify budgets report each exceeded limit. """
+        with Profiler() as profile:
+            User.objects.count()
+            User.objects.count()
+
+        self.assertEqual(Budget(queries=2, duplicate_queries=1).check(profile), [])
+        self.assertEqual(len(Budget(queries=1, duplicate_queries=0, outbound_calls=0).check(profile)), 2)
+
+    def test_assert_within_budget(self):
+        """ Verify the test helper fails when the budget is exceeded. """
+        with self.assert_within_budget(queries=1):
+            User.objects.count()
+
+        with self.assertRaises(AssertionError):
+            with self.assert_within_budget(queries=1):
+                User.objects.count()
+                User.objects.count()
+
+
+class ProfilingMiddlewareTests(TestCase):
+    path = reverse('health')
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True, DEBUG=True)
+    def test_debug_headers(self):
+        """ Verify the profile is logged and, in debug mode, returned in the response headers. """
+        with LogCapture(MIDDLEWARE_LOGGER_NAME) as log:
+            response = self.client.get(self.path)
+
+        self.assertIn('X-Profile-Queries', response)
+        self.assertIn('X-Profile-DB-Time', response)
+        self.assertIn('X-Profile-Outbound-Calls', response)
+
+        __, level, message = list(log.actual())[0]
+        self.assertEqual(level, 'INFO')
+        summary = json.loads(message.split(': ', 1)[1])
+        self.assertEqual(summary['view'], 'health')
+        self.assertEqual(summary['queries'], int(response['X-Profile-Queries']))
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_BUDGETS={'health': {'queries': 0}})
+    def test_budget_exceeded(self):
+        """ Verify requests exceeding their view's budget are logged as warnings, without debug headers. """
+        with LogCapture(MIDDLEWARE_LOGGER_NAME) as log:
+            response = self.client.get(self.path)
+
+        self.assertNotIn('X-Profile-Queries', response)
+        self.assertIn('WARNING', [level for __, level, __ in log.actual()])
+
+    def test_disabled(self):
+        """ Verify nothing is profiled unless profiling is enabled. """
+        with LogCapture(MIDDLEWARE_LOGGER_NAME) as log:
+            self.client.get(self.path)
+        log.check()
@@ -0,0 +1,178 @@
+import threading
+
+import ddt
+import mock
+from django.core.cache import cache
+
+from ecommerce.core import utils
+from ecommerce.core.utils import (
+    call_collapsed,
+    get_version,
+    iterate_cached_results,
+    iterate_pagination,
+    traverse_pagination,
+    update_version
+)
+from ecommerce.tests.testcases import TestCase
+
+
+class FakeEndpoint(object):
+    """ Serves pages of two results, recording the pages requested. """
+
+    def __init__(self, results):
+        self.results = results
+        self.requested = []
+
+    def page(self, number):
+        start = (number - 1) * 2
+        has_next = start + 2 < len(self.results)
+        return {
+            'next': 'http://example.com/api/?page={}'.format(number + 1) if has_next else None,
+            'results': self.results[start:start + 2],
+        }
+
+    def get(self, page):
+        number = int(page[0])
+        self.requested.append(number)
+        return self.page(number)
+
+
+@ddt.ddt
+class IteratePaginationTests(TestCase):
+    @ddt.data(True, False)
+    def test_iterate_pagination(self, prefetch):
+        """ Verify the results of every page are yielded in order. """
+        endpoint = FakeEndpoint(range(5))
+
+        self.assertEqual(list(iterate_pagination(endpoint.page(1), endpoint, prefetch=prefetch)), range(5))
+        self.assertEqual(traverse_pagination(endpoint.page(1), endpoint), range(5))
+
+    def test_stop_early(self):
+        """ Verify pages are not requested once the caller stops iterating. """
+        endpoint = FakeEndpoint(range(10))
+
+        self.assertIn(1, iterate_pagination(endpoint.page(1), endpoint))
+        self.assertEqual(endpoint.requested, [])
+
+        self.assertIn(3, iterate_pagination(endpoint.page(1), endpoint))
+        self.assertEqual(endpoint.requested, [2])
+
+
+class IterateCachedResultsTests(TestCase):
+    cache_key = 'test-results'
+
+    def test_cached_in_chunks(self):
+        """ Verify results are cached in chunks, and read from the cache once cached. """
+        results = list(iterate_cached_results(self.cache_key, lambda: iter(range(5)), 60, chunk_size=2))
+
+        self.assertEqual(results, range(5))
+        self.assertEqual(cache.get(self.cache_key), {'chunks': 3})
+        self.assertEqual(cache.get('{}.2'.format(self.cache_key)), [4])
+        self.assertEqual(list(iterate_cached_results(self.cache_key, None, 60, chunk_size=2)), range(5))
+
+    def test_not_cached_if_incomplete(self):
+        """ Verify results are not read from the cache if the caller stopped iterating before all were cached. """
+        self.assertIn(1, iterate_cached_results(self.cache_key, lambda: iter(range(5)), 60, chunk_size=2))
+        self.assertIsNone(cache.get(self.cache_key))
+
+    def test_chunk_evicted(self):
+        """ Verify the remaining results are retrieved again if a chunk has been evicted. """
+        list(iterate_cached_results(self.cache_key, lambda: iter(range(5)), 60, chunk_size=2))
+        cache.delete('{}.1'.format(self.cache_key))
+
+        results = list(iterate_cached_results(self.cache_key, lambda: iter(range(5)), 60, chunk_size=2))
+        self.assertEqual(results, range(5))
+        self.assertEqual(cache.get('{}.1'.format(self.cache_key)), [2, 3])
+
+
+class VersionTests(TestCase):
+    cache_key = 'test-version'
+
+    def test_version(self):
+        """ Verify the version is recorded when first requested, and advances when updated. """
+        version = get_version(self.cache_key, 60)
+        self.assertEqual(get_version(self.cache_key, 60), version)
+
+        with mock.patch('ecommerce.core.utils.time.time', return_value=version + 1):
+            update_version(self.cache_key, 60)
+        self.assertEqual(get_version(self.cache_key, 60), version + 1)
+
+
+class CallCollapsedTests(TestCase):
+    cache_key = 'test-call'
+
+    def test_cached(self):
+        """ Verify the result is cached, including falsy results. """
+        func = mock.Mock(return_value=False)
+
+        self.assertFalse(call_collapsed(self.cache_key, func, 60, 1))
+        self.assertFalse(call_collapsed(self.cache_key, func, 60, 1))
+        self.assertEqual(func.call_count, 1)
+        self.assertIsNone(cache.get('{}.lock'.format(self.cache_key)))
+
+    def test_exception_not_cached(self):
+        """ Verify exceptions are raised, and the function called again on the next call. """
+        func = mock.Mock(side_effect=[ValueError, 1])
+
+        with self.assertRaises(ValueError):
+            call_collapsed(self.cache_key, func, 60, 1)
+        self.assertEqual(call_collapsed(self.cache_key, func, 60, 1), 1)
+
+    def test_wait_for_other_process(self):
+        """ Verify a result being computed elsewhere is awaited, and the function called if it never comes. """
+        cache.set('{}.lock'.format(self.cache_key), True)
+        func = mock.Mock(return_value=1)
+
+        with mock.patch('ecommerce.core.utils.time.sleep', side_effect=lambda __: cache.set(self.cache_key, 2)):
+            self.assertEqual(call_collapsed(self.cache_key, func, 60, 1), 2)
+        self.assertFalse(func.called)
+
+        cache.delete(self.cache_key)
+        self.assertEqual(call_collapsed(self.cache_key, func, 60, 0.1), 1)
+        self.assertTrue(cache.get('{}.lock'.format(self.cache_key)))
+
+    def test_keys_not_blocking_each_other(self):
+        """ Verify a slow call for one key does not hold up calls for other keys, and its lock is then released. """
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 1
+
+        thread = threading.Thread(target=call_collapsed, args=(self.cache_key, slow, 60, 1))
+        thread.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.assertEqual(call_collapsed('other-call', lambda: 2, 60, 1), 2)
+            self.assertFalse(release.is_set())
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(cache.get(self.cache_key), 1)
+        self.assertEqual(utils._collapse_locks, {})  # pylint: disable=protected-access
+
+    def test_threads_collapsed(self):
+        """ Verify threads requesting the same key while it is being computed wait for its result. """
+        started = threading.Event()
+        release = threading.Event()
+        func = mock.Mock(side_effect=lambda: started.set() or release.wait(5) and 1)
+        results = []
+
+        def call():
+            results.append(call_collapsed(self.cache_key, func, 60, 1))
+
+        threads = [threading.Thread(target=call) for __ in range(3)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1, 1, 1])
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(utils._collapse_locks, {})  # pylint: disable=protected-access
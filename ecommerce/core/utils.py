@@ -1,14 +1,31 @@
 from __future__ import unicode_literals
 
+import functools
 import hashlib
+import importlib
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from urlparse import parse_qs, urlparse
 
 import six
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
 
 logger = logging.getLogger(__name__)
 
+# Number of results cached under each key by iterate_cached_results.
+CACHE_CHUNK_SIZE = 500
+
+# Threads of a process computing values for call_collapsed wait on the lock of their cache key. Each entry holds the
+# lock and the number of threads using it, so that it is removed once no thread needs it.
+_collapse_locks = {}
+_collapse_locks_lock = threading.Lock()
+_MISSING = object()
+
 
 def log_message_and_raise_validation_error(message):
     """
@@ -48,28 +65,256 @@ def get_cache_key(**kwargs):
     return hashlib.md5(key).hexdigest()
 
 
-def traverse_pagination(response, endpoint):
+def traverse_pagination(response, endpoint, prefetch=False):
     """
     Traverse a paginated API response.
 
     Extracts and concatenates "results" (list of dict) returned by DRF-powered
-    APIs.
+    APIs. Prefer iterate_pagination when the results do not all need to be held
+    in memory at once.
 
     Arguments:
         response (Dict): Current response dict from service API
         endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        prefetch (bool): Whether to request each page while the previous page is processed
 
     Returns:
         list of dict.
 
     """
-    results = response.get('results', [])
+    return list(iterate_pagination(response, endpoint, prefetch=prefetch))
+
+
+def iterate_pagination(response, endpoint, prefetch=False):
+    """
+    Iterate over the "results" of a paginated API response, requesting pages as they are needed.
+
+    Only one page is held at a time, and callers which stop iterating early do not
+    request the remaining pages. If prefetch is True, the next page is requested in
+    a new thread while the results of the current page are consumed.
+
+    Arguments:
+        response (Dict): Current response dict from service API
+        endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        prefetch (bool): Whether to request the next page while the current page is consumed
 
-    next_page = response.get('next')
-    while next_page:
-        querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
-        response = endpoint.get(**querystring)
-        results += response.get('results', [])
+    Yields:
+        dict
+    """
+    while response:
         next_page = response.get('next')
+        get_next_page = None
+        if next_page:
+            querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
+            if prefetch:
+                get_next_page = run_in_thread(endpoint.get, **querystring)
+            else:
+                get_next_page = functools.partial(endpoint.get, **querystring)
+
+        for result in response.get('results', []):
+            yield result
+
+        response = get_next_page() if get_next_page else None
+
+
+def _chunk_cache_key(cache_key, index):
+    return '{}.{}'.format(cache_key, index)
+
+
+def iterate_cached_results(cache_key, get_results, timeout, chunk_size=CACHE_CHUNK_SIZE):
+    """
+    Iterate over a large result set, cached in chunks rather than as a single value.
+
+    The results are cached in lists of chunk_size results, and a header recording the
+    number of chunks is cached under cache_key once every chunk has been cached. Chunks
+    are read from the cache one at a time, so callers which stop iterating early do not
+    read the remaining chunks. If a chunk has been evicted, the remaining results are
+    retrieved again. The header is only cached once the results have been iterated to the
+    end, so the chunks cached for callers which stop early are never read back.
+
+    Example:
+        >>> results = iterate_cached_results(cache_key, lambda: iterate_pagination(response, endpoint), 3600)
+
+    Arguments:
+        cache_key (str): Key of the header of the cached results.
+        get_results (callable): Returns an iterable of the results. Only called if the results are not cached.
+        timeout (int): Number of seconds the results are cached for.
+        chunk_size (int): Number of results cached under each key.
+
+    Yields:
+        The results.
+    """
+    yielded = 0
+    header = cache.get(cache_key)
+    if header is not None:
+        for index in range(header['chunks']):
+            chunk = cache.get(_chunk_cache_key(cache_key, index))
+            if chunk is None:
+                logger.info('Chunk %d of cached results [%s] was evicted. Retrieving the results.', index, cache_key)
+                break
+            for result in chunk:
+                yield result
+            yielded += len(chunk)
+        else:
+            return
+
+    chunks = 0
+    chunk = []
+    for position, result in enumerate(get_results()):
+        chunk.append(result)
+        if len(chunk) == chunk_size:
+            cache.set(_chunk_cache_key(cache_key, chunks), chunk, timeout)
+            chunks += 1
+            chunk = []
+        # Results already yielded from the cache, before a chunk was found to be evicted, are not yielded again.
+        if position >= yielded:
+            yield result
+
+    if chunk:
+        cache.set(_chunk_cache_key(cache_key, chunks), chunk, timeout)
+        chunks += 1
+
+    # The header is cached last, so that the results are only read from the cache once every chunk is cached.
+    cache.set(cache_key, {'chunks': chunks}, timeout)
+
+
+def get_version(cache_key, timeout):
+    """
+    Returns the time at which the data versioned under cache_key last changed, as a POSIX timestamp.
+
+    If the version is no longer cached, the current time is recorded, as the data may have changed
+    since it was evicted.
+
+    Arguments:
+        cache_key (str): Key the version is cached under.
+        timeout (int): Number of seconds the version is cached for.
+
+    Returns:
+        float: The version.
+    """
+    version = cache.get(cache_key)
+    if version is None:
+        version = time.time()
+        cache.add(cache_key, version, timeout)
+        version = cache.get(cache_key, version)
+    return version
 
-    return results
+
+def update_version(cache_key, timeout):
+    """
+    Record that the data versioned under cache_key changed, now and again once the transaction commits.
+
+    Updating the version after commit prevents a concurrent request from caching the data as it
+    was before the change with the new version.
+
+    Arguments:
+        cache_key (str): Key the version is cached under.
+        timeout (int): Number of seconds the version is cached for.
+    """
+    def update():
+        cache.set(cache_key, time.time(), timeout)
+
+    update()
+    transaction.on_commit(update)
+
+
+@contextmanager
+def _collapse_lock(cache_key):
+    """ Holds the lock of a cache key, shared by the threads of this process collapsing calls for that key. """
+    with _collapse_locks_lock:
+        entry = _collapse_locks.setdefault(cache_key, [threading.Lock(), 0])
+        entry[1] += 1
+
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _collapse_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _collapse_locks[cache_key]
+
+
+def call_collapsed(cache_key, func, timeout, wait):
+    """ Returns the result of a function, cached, calling it at most once at a time for each key.
+
+    Concurrent requests for a key that is not cached are collapsed: threads of the same process wait for the
+    thread calling the function, and other processes wait for up to `wait` seconds for its result to be cached,
+    before calling the function themselves. Exceptions raised by the function are not cached.
+
+    Arguments:
+        cache_key (str): Key under which the result is cached.
+        func (callable): Function computing the result, called without arguments.
+        timeout (int): Number of seconds for which the result is cached.
+        wait (float): Maximum number of seconds spent waiting for another process to compute the result.
+    """
+    result = cache.get(cache_key, _MISSING)
+    if result is not _MISSING:
+        return result
+
+    with _collapse_lock(cache_key):
+        # Another thread may have cached the result while this one waited for the lock.
+        result = cache.get(cache_key, _MISSING)
+        if result is not _MISSING:
+            return result
+
+        lock_key = '{}.lock'.format(cache_key)
+        locked = cache.add(lock_key, True, int(wait) + 1)
+        if not locked:
+            deadline = time.time() + wait
+            while time.time() < deadline:
+                time.sleep(0.05)
+                result = cache.get(cache_key, _MISSING)
+                if result is not _MISSING:
+                    return result
+
+        try:
+            result = func()
+            cache.set(cache_key, result, timeout)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+        return result
+
+
+def run_in_thread(func, *args, **kwargs):
+    """ Call a function in a new thread.
+
+    Returns:
+        callable: Waits for the function to return, and returns its result or raises its exception.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            outcome['exception'] = exc
+
+    thread = threading.Thread(target=target)
+    thread.start()
+
+    def wait():
+        thread.join()
+        if 'exception' in outcome:
+            raise outcome['exception']
+        return outcome['result']
+
+    return wait
+
+
+def lazy_import(module_name):
+    """ Returns a proxy for a module, which imports the module when one of its attributes is first used.
+
+    Use it for heavy optional dependencies, such as payment SDKs, so that they are not imported by every process
+    that imports the module using them. Setting an attribute of the proxy sets it on the module, so module
+    attributes can still be patched through the proxy in tests.
+
+    Arguments:
+        module_name (str): Absolute name of the module, such as 'paypalrestsdk'.
+
+    Returns:
+        SimpleLazyObject
+    """
+    return SimpleLazyObject(lambda: importlib.import_module(module_name))
@@ -7,7 +7,7 @@ from django.core.cache import cache
 from oscar.core.loading import get_model
 from slumber.exceptions import HttpNotFoundError
 
-from ecommerce.core.utils import get_cache_key, traverse_pagination
+from ecommerce.core.utils import get_cache_key, iterate_cached_results, iterate_pagination
 
 Product = get_model('catalogue', 'Product')
 
@@ -54,6 +54,15 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
         Timeout: requests exception "Timeout"
 
     """
+    if not limit:
+        results = list(iterate_catalog_course_runs(site, query))
+        return {
+            'count': len(results),
+            'next': 'None',
+            'previous': 'None',
+            'results': results,
+        }
+
     api_resource_name = 'course_runs'
     partner_code = site.siteconfiguration.partner.short_code
     cache_key = '{site_domain}_{partner_code}_{resource}_{query}_{limit}_{offset}'.format(
@@ -70,32 +79,50 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
     if not response:
         api = site.siteconfiguration.discovery_api_client
         endpoint = getattr(api, api_resource_name)
-
-        if limit:
-            response = endpoint().get(
-                partner=partner_code,
-                q=query,
-                limit=limit,
-                offset=offset
-            )
-        else:
-            response = endpoint().get(
-                partner=partner_code,
-                q=query
-            )
-            all_response_results = traverse_pagination(response, endpoint)
-            response = {
-                'count': len(all_response_results),
-                'next': 'None',
-                'previous': 'None',
-                'results': all_response_results,
-            }
-
+        response = endpoint().get(
+            partner=partner_code,
+            q=query,
+            limit=limit,
+            offset=offset
+        )
         cache.set(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
 
     return response
 
 
+def iterate_catalog_course_runs(site, query):
+    """
+    Iterate over all course runs for a site matching the provided query from the Course Catalog API.
+
+    Pages are requested as they are needed, the next page being requested while the
+    current page is consumed, and the results are cached in chunks. Callers which stop
+    iterating early do not request or read the remaining pages.
+
+    Arguments:
+        query (str): ElasticSearch Query
+        site (Site): Site object containing Site Configuration data
+
+    Yields:
+        dict: Course run received from Course Catalog API
+
+    Raises:
+        ConnectionError: requests exception "ConnectionError"
+        SlumberBaseException: slumber exception "SlumberBaseException"
+        Timeout: requests exception "Timeout"
+    """
+    partner_code = site.siteconfiguration.partner.short_code
+    cache_key = get_cache_key(
+        site_domain=site.domain, partner_code=partner_code, resource='course_runs', query=query
+    )
+
+    def get_results():
+        endpoint = site.siteconfiguration.discovery_api_client.course_runs
+        response = endpoint().get(partner=partner_code, q=query)
+        return iterate_pagination(response, endpoint, prefetch=True)
+
+    return iterate_cached_results(cache_key, get_results, settings.COURSES_API_CACHE_TIMEOUT)
+
+
 def prepare_course_seat_types(course_seat_types):
     """
     Convert list of course seat types into comma-separated string.
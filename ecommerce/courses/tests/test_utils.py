@@ -111,7 +111,7 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
         Helper method to validate the response from the method
         "get_course_catalogs".
         """
-        cache_key = '{}.catalog.api.data'.format(self.request.site.domain)
+        cache_key = '{}.catalog.api.data.chunked'.format(self.request.site.domain)
         cache_key = hashlib.md5(cache_key).hexdigest()
         cached_course_catalogs = cache.get(cache_key)
         self.assertIsNone(cached_course_catalogs)
@@ -122,8 +122,9 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
         for catalog_index, catalog in enumerate(response):
             self.assertEqual(catalog['name'], catalog_name_list[catalog_index])
 
-        cached_course = cache.get(cache_key)
-        self.assertEqual(cached_course, response)
+        # The catalogs are cached in a single chunk.
+        self.assertEqual(cache.get(cache_key), {'chunks': 1})
+        self.assertEqual(cache.get('{}.0'.format(cache_key)), response)
 
     def test_get_course_catalogs_for_single_catalog_with_id(self):
         """
@@ -5,7 +5,7 @@ from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
 
-from ecommerce.core.utils import traverse_pagination
+from ecommerce.core.utils import iterate_cached_results, iterate_pagination
 
 
 def mode_for_product(product):
@@ -64,21 +64,25 @@ def get_course_catalogs(site, resource_id=None):
     resource = 'catalogs'
     base_cache_key = '{}.catalog.api.data'.format(site.domain)
 
-    cache_key = '{}.{}'.format(base_cache_key, resource_id) if resource_id else base_cache_key
-    cache_key = hashlib.md5(cache_key).hexdigest()
+    def get_endpoint():
+        api = site.siteconfiguration.discovery_api_client
+        return getattr(api, resource)
+
+    if not resource_id:
+        def get_results():
+            endpoint = get_endpoint()
+            return iterate_pagination(endpoint().get(), endpoint, prefetch=True)
+
+        # The list of catalogs is cached in chunks, as it can be too large to cache as a single value.
+        cache_key = hashlib.md5('{}.chunked'.format(base_cache_key)).hexdigest()
+        return list(iterate_cached_results(cache_key, get_results, settings.COURSES_API_CACHE_TIMEOUT))
+
+    cache_key = hashlib.md5('{}.{}'.format(base_cache_key, resource_id)).hexdigest()
     cached = cache.get(cache_key)
     if cached:
         return cached
 
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, resource)
-    response = endpoint(resource_id).get()
-
-    if resource_id:
-        results = response
-    else:
-        results = traverse_pagination(response, endpoint)
-
+    results = get_endpoint()(resource_id).get()
     cache.set(cache_key, results, settings.COURSES_API_CACHE_TIMEOUT)
     return results
 
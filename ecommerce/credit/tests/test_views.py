@@ -9,6 +9,9 @@ from datetime import timedelta
 import ddt
 import httpretty
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from oscar.core.loading import get_model
@@ -265,3 +268,40 @@ class CheckoutPageTest(DiscoveryTestMixin, TestCase, JwtMixin):
 
         self.assertEqual(provider_info['new_price'], '0.00')
         self.assertEqual(provider_info['discount'], discount)
+
+    @httpretty.activate
+    def test_providers_cached(self):
+        """ Verify provider details are cached, while eligibility is checked on every request. """
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data)
+        self._assert_success_checkout_page()
+
+        self._mock_providers_api(body=[], status=500)
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['providers'][0]['id'], self.provider)
+
+        self._mock_eligibility_api(body=[])
+        self._assert_error_without_deadline()
+
+    @httpretty.activate
+    def test_queries(self):
+        """ Verify the number of queries does not grow with the number of credit seats. """
+        self.course.create_or_update_seat(
+            'credit', True, self.price, self.partner, self.provider, credit_hours=self.credit_hours
+        )
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data)
+
+        # Warm up the caches which are not cleared between requests.
+        self.client.get(self.path)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.path)
+
+        self.course.create_or_update_seat('credit', True, self.price, self.partner, 'MIT', credit_hours=3)
+        self._mock_providers_api(body=self.provider_data + [dict(self.provider_data[0], id='MIT')])
+        cache.clear()
+
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(self.path)
+        self.assertEqual(len(response.context['providers']), 2)
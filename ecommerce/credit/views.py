@@ -3,7 +3,9 @@ from __future__ import unicode_literals
 import logging
 
 from dateutil.parser import parse
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
@@ -14,13 +16,17 @@ from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.url_utils import get_lms_url
+from ecommerce.core.utils import get_cache_key, run_in_thread
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.extensions.voucher.utils import get_cached_voucher
 
 logger = logging.getLogger(__name__)
-Voucher = get_model('voucher', 'Voucher')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+
+SEAT_ATTRIBUTES = ('certificate_type', 'credit_provider', 'credit_hours',)
 
 
 class Checkout(TemplateView):
@@ -36,7 +42,18 @@ class Checkout(TemplateView):
         course = get_object_or_404(Course, id=kwargs.get('course_id'))
         context['course'] = course
 
+        credit_seats = self._get_credit_seats(course)
+
+        # The provider details are requested while the eligibility of the user is checked.
+        wait_for_providers = None
+        if credit_seats:
+            # Build the client, which reads the user's access token from the database, before starting the thread.
+            self.credit_api_client  # pylint: disable=pointless-statement
+            wait_for_providers = run_in_thread(self._get_providers_from_lms, credit_seats)
+
         deadline = self._check_credit_eligibility(self.request.user, kwargs.get('course_id'))
+        providers = wait_for_providers() if wait_for_providers else None
+
         if not deadline:
             context.update({
                 'error': _('An error has occurred. We could not confirm that you are eligible for course credit. '
@@ -44,20 +61,6 @@ class Checkout(TemplateView):
             })
             return context
 
-        partner = get_partner_for_site(self.request)
-        strategy = self.request.strategy
-        # Audit seats do not have a `certificate_type` attribute, so
-        # we use getattr to avoid an exception.
-        credit_seats = []
-
-        for seat in course.seat_products:
-            if getattr(seat.attr, 'certificate_type', None) != self.CREDIT_MODE:
-                continue
-
-            purchase_info = strategy.fetch_for_product(seat)
-            if purchase_info.availability.is_available_to_buy and seat.stockrecords.filter(partner=partner).exists():
-                credit_seats.append(seat)
-
         if not credit_seats:
             msg = _(
                 'Credit is not currently available for "{course_name}". If you are currently enrolled in the '
@@ -71,7 +74,7 @@ class Checkout(TemplateView):
             context.update({'error': msg})
             return context
 
-        providers = self._get_providers_detail(credit_seats)
+        providers = self._get_providers_detail(credit_seats, providers)
         if not providers:
             context.update({
                 'error': _('An error has occurred. We could not confirm that the institution you selected offers this '
@@ -95,6 +98,42 @@ class Checkout(TemplateView):
     def get(self, request, *args, **kwargs):
         return super(Checkout, self).get(request, args, **kwargs)
 
+    def _get_credit_seats(self, course):
+        """ Get the credit seats of a course which are available to buy from the site's partner.
+
+        The seats, their stock records and the attributes used by the checkout page are loaded with a
+        fixed number of queries.
+
+        Arguments:
+            course (Course): The course.
+
+        Returns:
+            A list of (seat, stock record, attributes) tuples, attributes being a dict mapping the codes
+            in SEAT_ATTRIBUTES to their values.
+        """
+        seats = list(course.seat_products)
+        attributes = {seat.id: {} for seat in seats}
+        attribute_values = ProductAttributeValue.objects.filter(
+            product__in=seats, attribute__code__in=SEAT_ATTRIBUTES
+        ).select_related('attribute')
+        for attribute_value in attribute_values:
+            attributes[attribute_value.product_id][attribute_value.attribute.code] = attribute_value.value
+
+        # Audit seats do not have a `certificate_type` attribute.
+        seats = [seat for seat in seats if attributes[seat.id].get('certificate_type') == self.CREDIT_MODE]
+
+        partner = get_partner_for_site(self.request)
+        purchase_infos = self.request.strategy.fetch_for_products(seats)
+        credit_seats = []
+        for seat in seats:
+            stockrecord = next(
+                (stockrecord for stockrecord in seat.stockrecords.all() if stockrecord.partner_id == partner.id), None
+            )
+            if purchase_infos[seat.id].availability.is_available_to_buy and stockrecord:
+                credit_seats.append((seat, stockrecord, attributes[seat.id]))
+
+        return credit_seats
+
     def _check_credit_eligibility(self, user, course_key):
         """ Check that the user is eligible for credit.
 
@@ -121,45 +160,43 @@ class Checkout(TemplateView):
             )
             return None
 
-    def _get_providers_detail(self, credit_seats):
+    def _get_providers_detail(self, credit_seats, providers):
         """ Get details for the credit providers for the given credit seats.
 
         Arguments:
-            credit_seats (Products[]): List of credit_seats objects.
+            credit_seats (list): (seat, stock record, attributes) tuples returned by _get_credit_seats.
+            providers (list): Provider details returned by _get_providers_from_lms.
 
         Returns:
-            A list of dictionaries with provider(s) detail.
+            A list of dictionaries with provider(s) detail, including the price of their seat.
         """
-        code = self.request.GET.get('code')
-        if code:
-            voucher = Voucher.objects.get(code=code)
-            discount_type = voucher.benefit.type
-            discount_value = voucher.benefit.value
-
-        providers = self._get_providers_from_lms(credit_seats)
         if not providers:
             return None
 
+        code = self.request.GET.get('code')
+        discount = None
+        if code:
+            benefit = get_cached_voucher(code).benefit
+            discount_type = benefit.type
+            discount_value = benefit.value
+            discount = format_benefit_value(benefit)
+
         providers_dict = {}
         for provider in providers:
-            providers_dict[provider['id']] = provider
+            providers_dict[provider['id']] = dict(provider)
 
-        partner = get_partner_for_site(self.request)
-        for seat in credit_seats:
-            stockrecord = seat.stockrecords.filter(partner=partner).first()
+        for __, stockrecord, attributes in credit_seats:
             new_price = None
-            discount = None
             if code:
-                discount = format_benefit_value(voucher.benefit)
                 if discount_type == 'Percentage':
                     new_price = stockrecord.price_excl_tax - (stockrecord.price_excl_tax * (discount_value / 100))
                 else:
                     new_price = stockrecord.price_excl_tax - discount_value
                 new_price = '{0:.2f}'.format(new_price)
-            providers_dict[seat.attr.credit_provider].update({
+            providers_dict[attributes.get('credit_provider')].update({
                 'price': stockrecord.price_excl_tax,
                 'sku': stockrecord.partner_sku,
-                'credit_hours': seat.attr.credit_hours,
+                'credit_hours': attributes.get('credit_hours'),
                 'discount': discount,
                 'new_price': new_price
             })
@@ -169,21 +206,33 @@ class Checkout(TemplateView):
     def _get_providers_from_lms(self, credit_seats):
         """ Helper method for getting provider info from LMS.
 
+        Provider details do not depend on the user, and are cached for CREDIT_PROVIDER_CACHE_TIMEOUT seconds.
+
         Arguments:
-            credit_seats (Products): List of credit_seats objects.
+            credit_seats (list): (seat, stock record, attributes) tuples returned by _get_credit_seats.
 
         Returns:
             Response from LMS as json, containing list of providers.
         """
 
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
+        provider_ids = ",".join(
+            [attributes['credit_provider'] for __, __, attributes in credit_seats if attributes.get('credit_provider')]
+        )
+        cache_key = get_cache_key(resource='credit_providers', provider_ids=provider_ids)
+        providers = cache.get(cache_key)
+        if providers is not None:
+            return providers
 
         try:
-            return self.credit_api_client.providers.get(provider_ids=provider_ids)
+            providers = self.credit_api_client.providers.get(provider_ids=provider_ids)
         except SlumberHttpBaseException:
             logger.exception('An error occurred while retrieving credit provider details.')
             return None
 
+        if providers:
+            cache.set(cache_key, providers, settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+        return providers
+
     @cached_property
     def credit_api_client(self):
         """ Returns an instance of the Credit API client. """
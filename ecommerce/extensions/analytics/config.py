@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.signals import request_finished
 from oscar.apps.analytics import config
 
 
@@ -6,5 +7,8 @@ class AnalyticsConfig(config.AnalyticsConfig):
     name = 'ecommerce.extensions.analytics'
 
     def ready(self):
+        from ecommerce.extensions.analytics.tracking import flush_tracking_context_updates
+        request_finished.connect(flush_tracking_context_updates, dispatch_uid='analytics.flush_tracking_context')
+
         if settings.INSTALL_DEFAULT_ANALYTICS_RECEIVERS:
             from oscar.apps.analytics import receivers  # noqa pylint: disable=unused-variable
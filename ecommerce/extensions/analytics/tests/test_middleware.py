@@ -1,6 +1,9 @@
+from django.contrib.auth import get_user_model
 from django.test.client import RequestFactory
 
 from ecommerce.extensions.analytics import middleware
+from ecommerce.extensions.analytics.tracking import flush_tracking_context_updates
+from ecommerce.extensions.analytics.utils import parse_tracking_context
 from ecommerce.tests.testcases import TestCase
 
 
@@ -12,11 +15,17 @@ class TrackingMiddlewareTests(TestCase):
         self.request_factory = RequestFactory()
         self.user = self.create_user()
 
-    def _assert_ga_client_id(self, ga_client_id):
+        # Discard updates buffered by other tests.
+        flush_tracking_context_updates()
+
+    def _process_request(self, ga_client_id):
         self.request_factory.cookies['_ga'] = 'GA1.2.{}'.format(ga_client_id)
         request = self.request_factory.get('/')
         request.user = self.user
         self.middleware.process_request(request)
+
+    def _assert_ga_client_id(self, ga_client_id):
+        self._process_request(ga_client_id)
         expected_client_id = self.user.tracking_context.get('ga_client_id')
         self.assertEqual(ga_client_id, expected_client_id)
 
@@ -28,3 +37,31 @@ class TrackingMiddlewareTests(TestCase):
         updated_client_id = 'updated-client-id'
         self.assertNotEqual(updated_client_id, self.user.tracking_context.get('ga_client_id'))
         self._assert_ga_client_id(updated_client_id)
+
+    def test_updates_are_deferred(self):
+        """ Test that the tracking context is written to the database when buffered updates are flushed. """
+        self._process_request('first-client-id')
+        self._process_request('second-client-id')
+
+        stored_user = get_user_model().objects.get(id=self.user.id)
+        self.assertIsNone(stored_user.tracking_context)
+
+        # The buffered value is read before it reaches the database.
+        __, ga_client_id, __ = parse_tracking_context(stored_user)
+        self.assertEqual(ga_client_id, 'second-client-id')
+
+        # Updates are coalesced into a single write of the latest value.
+        with self.assertNumQueries(2):
+            flush_tracking_context_updates()
+
+        stored_user = get_user_model().objects.get(id=self.user.id)
+        self.assertEqual(stored_user.tracking_context, {'ga_client_id': 'second-client-id'})
+
+    def test_unchanged_client_id_is_not_buffered(self):
+        """ Test that a request with the stored client ID does not result in a write. """
+        self._process_request('test-client-id')
+        flush_tracking_context_updates()
+
+        self._process_request('test-client-id')
+        with self.assertNumQueries(0):
+            flush_tracking_context_updates()
@@ -14,6 +14,7 @@ from ecommerce.extensions.analytics.utils import (
     parse_tracking_context,
     prepare_analytics_data,
     track_segment_event,
+    track_segment_events,
     translate_basket_line_for_segment
 )
 from ecommerce.extensions.basket.tests.mixins import BasketMixin
@@ -97,6 +98,28 @@ class UtilsTest(DiscoveryTestMixin, BasketMixin, TransactionTestCase):
             track_segment_event(self.site, user, event, properties)
             mock_track.assert_called_once_with(user_tracking_id, event, properties, context=context)
 
+    @override_switch('basket_transaction_on_commit', active=True)
+    def test_track_segment_events(self):
+        """ The function should fire each event to Segment, in order, once the transaction is committed. """
+        self.site_configuration.segment_key = 'fake-key'
+        self.site_configuration.save()
+        user, event, properties = self._get_generic_segment_event_parameters()
+        user_tracking_id, ga_client_id, lms_ip = parse_tracking_context(user)
+        context = {
+            'ip': lms_ip,
+            'Google Analytics': {
+                'clientId': ga_client_id
+            }
+        }
+        events = [(event, properties), ('Checkout Step Viewed', {'step': 2})]
+        with mock.patch.object(Client, 'track') as mock_track:
+            track_segment_events(self.site, user, events)
+            mock_track.assert_has_calls([
+                mock.call(user_tracking_id, name, event_properties, context=context)
+                for name, event_properties in events
+            ])
+            self.assertEqual(mock_track.call_count, len(events))
+
     def test_track_segment_event(self):
         """ The function should fire an event to Segment if the site is properly configured. """
         self.site_configuration.segment_key = 'fake-key'
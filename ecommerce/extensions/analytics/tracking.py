@@ -0,0 +1,89 @@
+"""
+Deferred storage of updates to users' tracking contexts.
+
+TrackingMiddleware sees a user's Google Analytics client ID on every request, and the ID changes whenever the user
+switches device or browser. Rather than saving the user in the request thread each time, updates are buffered:
+
+* The pending client ID is written to the cache, so that parse_tracking_context in any process reads the freshest
+  value before it reaches the database.
+* Updates are coalesced per user in a process-local queue, which is flushed with narrow update_fields writes when
+  the request finishes, after the response has been sent.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+_pending_updates = {}
+_pending_updates_lock = threading.Lock()
+
+
+def _get_buffer_cache_key(user_id):
+    return get_cache_key(resource='tracking_context.ga_client_id', user_id=user_id)
+
+
+def get_buffered_ga_client_id(user):
+    """ Return the Google Analytics client ID buffered for the given user, or None if no update is pending. """
+    if not user.id:
+        return None
+    return cache.get(_get_buffer_cache_key(user.id))
+
+
+def buffer_ga_client_id(user, ga_client_id):
+    """
+    Record a new Google Analytics client ID for the given user, to be written to the database later.
+
+    The in-memory user is updated immediately, so that code handling the current request sees the new value.
+
+    Args:
+        user (User): user whose tracking context should be updated.
+        ga_client_id (str): new Google Analytics client ID.
+    """
+    tracking_context = user.tracking_context or {}
+    tracking_context['ga_client_id'] = ga_client_id
+    user.tracking_context = tracking_context
+
+    cache.set(_get_buffer_cache_key(user.id), ga_client_id, settings.TRACKING_CONTEXT_BUFFER_TIMEOUT)
+    with _pending_updates_lock:
+        _pending_updates[user.id] = ga_client_id
+
+
+def flush_tracking_context_updates(**kwargs):  # pylint: disable=unused-argument
+    """
+    Write all buffered tracking context updates from this process to the database.
+
+    Used as a request_finished receiver. Each user's tracking context is re-read before the update is applied,
+    so that fields updated elsewhere (e.g. the LMS user ID) are preserved, and only the tracking_context column is
+    written.
+    """
+    if not _pending_updates:
+        return
+
+    with _pending_updates_lock:
+        updates = dict(_pending_updates)
+        _pending_updates.clear()
+
+    User = get_user_model()
+    users = User.objects.filter(id__in=updates.keys()).only('id', 'tracking_context')
+    for user in users:
+        ga_client_id = updates[user.id]
+        tracking_context = user.tracking_context or {}
+
+        if tracking_context.get('ga_client_id') != ga_client_id:
+            tracking_context['ga_client_id'] = ga_client_id
+            user.tracking_context = tracking_context
+            try:
+                user.save(update_fields=['tracking_context'])
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to save tracking context for user [%d].', user.id)
+                continue
+
+        cache.delete(_get_buffer_cache_key(user.id))
@@ -5,7 +5,9 @@ from functools import wraps
 import waffle
 from django.db import transaction
 
+from ecommerce.core.logging_utils import AuditMessage
 from ecommerce.courses.utils import mode_for_product
+from ecommerce.extensions.analytics.tracking import get_buffered_ga_client_id
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +32,10 @@ def parse_tracking_context(user):
         user_tracking_id = 'ecommerce-{}'.format(user.id)
 
     lms_ip = tracking_context.get('lms_ip')
-    ga_client_id = tracking_context.get('ga_client_id')
+
+    # Updates to the client ID are written to the database after the request that sees them, so prefer any
+    # pending update (see ecommerce.extensions.analytics.tracking).
+    ga_client_id = get_buffered_ga_client_id(user) or tracking_context.get('ga_client_id')
 
     return user_tracking_id, ga_client_id, lms_ip
 
@@ -80,12 +85,9 @@ def audit_log(name, **kwargs):
     Returns:
         None
     """
-    # Joins sorted keyword argument keys and values with an "=", wraps each value
-    # in quotes, and separates each pair with a comma and a space.
-    payload = u', '.join([u'{k}="{v}"'.format(k=k, v=v) for k, v in sorted(kwargs.items())])
-    message = u'{name}: {payload}'.format(name=name, payload=payload)
-
-    logger.info(message)
+    # The message is only rendered if the record is handled, when it is formatted. Formatters which
+    # support it, such as ecommerce.core.logging_utils.JsonFormatter, record the event's data as JSON.
+    logger.info(u'%s', AuditMessage(name, kwargs))
 
 
 def prepare_analytics_data(user, segment_key):
@@ -134,12 +136,32 @@ def track_segment_event(site, user, event, properties):
         (success, msg): Tuple indicating the success of enqueuing the event on the message queue.
             This can be safely ignored unless needed for debugging purposes.
     """
+    return track_segment_events(site, user, [(event, properties)])[0]
+
+
+def track_segment_events(site, user, events):
+    """ Fire several tracking events via Segment, for the same user.
+
+    The user's tracking context is read once for all of the events, and, if the waffle switch
+    'basket_transaction_on_commit' is active, the events are all fired once the current transaction is committed.
+
+    Args:
+        site (Site): Site whose Segment client should be used.
+        user (User): User to which the events should be associated.
+        events (list): Tuples of the name and properties of each event, in the order they are to be fired.
+
+    Returns:
+        list: The result of enqueuing each event, as returned by track_segment_event.
+    """
     site_configuration = site.siteconfiguration
     if not site_configuration.segment_key:
-        msg = 'Event [{event}] was NOT fired because no Segment key is set for site configuration [{site_id}]'
-        msg = msg.format(event=event, site_id=site_configuration.pk)
-        logger.debug(msg)
-        return False, msg
+        results = []
+        for event, __ in events:
+            msg = 'Event [{event}] was NOT fired because no Segment key is set for site configuration [{site_id}]'
+            msg = msg.format(event=event, site_id=site_configuration.pk)
+            logger.debug(msg)
+            results.append((False, msg))
+        return results
 
     user_tracking_id, ga_client_id, lms_ip = parse_tracking_context(user)
     context = {
@@ -148,13 +170,18 @@ def track_segment_event(site, user, event, properties):
             'clientId': ga_client_id
         }
     }
+
+    def track():
+        return [
+            site.siteconfiguration.segment_client.track(user_tracking_id, event, properties, context=context)
+            for event, properties in events
+        ]
+
     if waffle.switch_is_active('basket_transaction_on_commit'):
-        return transaction.on_commit(
-            lambda: site.siteconfiguration.segment_client.track(user_tracking_id, event, properties, context=context)
-            # pylint: disable=cell-var-from-loop
-        )
+        transaction.on_commit(track)
+        return [None] * len(events)
     else:
-        return site.siteconfiguration.segment_client.track(user_tracking_id, event, properties, context=context)
+        return track()
 
 
 def translate_basket_line_for_segment(line):
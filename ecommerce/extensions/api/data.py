@@ -4,6 +4,7 @@ import logging
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.extensions.api import exceptions
+from ecommerce.extensions.partner.sku_index import resolve_sku
 
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
@@ -15,12 +16,16 @@ logger = logging.getLogger(__name__)
 
 def get_product(sku):
     """Retrieve the product corresponding to the provided SKU."""
-    try:
-        return Product.objects.get(stockrecords__partner_sku=sku)
-    except Product.DoesNotExist:
-        raise exceptions.ProductNotFoundError(
-            exceptions.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku)
-        )
+    record = resolve_sku(sku)
+    if record is not None:
+        try:
+            return Product.objects.get(id=record.product_id)
+        except Product.DoesNotExist:
+            pass
+
+    raise exceptions.ProductNotFoundError(
+        exceptions.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku)
+    )
 
 
 def get_order_metadata(basket):
@@ -2,6 +2,7 @@ import django_filters
 from django.db.models import Q
 from oscar.core.loading import get_model
 
+CouponSummary = get_model('voucher', 'CouponSummary')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 
@@ -28,3 +29,15 @@ class OrderFilter(django_filters.FilterSet):
     class Meta(object):
         model = Order
         fields = ('username',)
+
+
+class CouponSummaryFilter(django_filters.FilterSet):
+    """ Filter coupon summaries via query string parameters. """
+    category = django_filters.CharFilter(name='category__name', lookup_expr='iexact')
+    client = django_filters.CharFilter(name='client', lookup_expr='icontains')
+    code = django_filters.CharFilter(name='code', lookup_expr='iexact')
+    title = django_filters.CharFilter(name='title', lookup_expr='startswith')
+
+    class Meta(object):
+        model = CouponSummary
+        fields = ('benefit_type', 'category', 'client', 'code', 'title', 'voucher_type',)
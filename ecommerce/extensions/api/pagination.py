@@ -7,3 +7,14 @@ class PageNumberPagination(pagination.PageNumberPagination):
     # NOTE (CCB): This is a hack, necessary until the frontend
     # can properly follow our paginated lists.
     max_page_size = 10000
+
+
+class OrderHistoryCursorPagination(pagination.CursorPagination):
+    """ Paginates order histories by position, so that pages are not counted and do not shift as orders are placed. """
+    ordering = '-date_placed'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        # CursorPagination ignores page_size_query_param before DRF 3.7.
+        return pagination.PageNumberPagination.get_page_size.__func__(self, request)
@@ -32,6 +32,7 @@ Benefit = get_model('offer', 'Benefit')
 BillingAddress = get_model('order', 'BillingAddress')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
+CouponSummary = get_model('voucher', 'CouponSummary')
 Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 Partner = get_model('partner', 'Partner')
@@ -48,11 +49,6 @@ COURSE_DETAIL_VIEW = 'api:v2:course-detail'
 PRODUCT_DETAIL_VIEW = 'api:v2:product-detail'
 
 
-def is_custom_code(obj):
-    """Helper method to check if the voucher contains custom code. """
-    return not is_enrollment_code(obj) and retrieve_quantity(obj) == 1
-
-
 def is_enrollment_code(obj):
     benefit = retrieve_voucher(obj).benefit
     return benefit.type == Benefit.PERCENTAGE and benefit.value == 100
@@ -119,9 +115,10 @@ class ProductPaymentInfoMixin(serializers.ModelSerializer):
         return None
 
     def _get_info(self, product):
-        return Selector().strategy(
-            request=self.context.get('request')
-        ).fetch_for_product(product)
+        request = self.context.get('request')
+        # Reuse the request's strategy, which memoizes purchase info, so that each product is only priced once.
+        strategy = getattr(request, 'strategy', None) or Selector().strategy(request=request)
+        return strategy.fetch_for_product(product)
 
 
 class BillingAddressSerializer(serializers.ModelSerializer):
@@ -275,6 +272,34 @@ class OrderSerializer(serializers.ModelSerializer):
         )
 
 
+class LineSummarySerializer(serializers.ModelSerializer):
+    """ Serializer for line items of order summaries, referencing products by ID. """
+
+    class Meta(object):
+        model = Line
+        fields = (
+            'title', 'quantity', 'status', 'line_price_excl_tax', 'unit_price_excl_tax', 'partner_sku', 'product',
+        )
+
+
+class OrderSummarySerializer(OrderSerializer):
+    """ Serializer for order histories, omitting the fields which require product, pricing and voucher lookups. """
+    lines = LineSummarySerializer(many=True)
+
+    class Meta(object):
+        model = Order
+        fields = (
+            'currency',
+            'date_placed',
+            'discount',
+            'lines',
+            'number',
+            'payment_processor',
+            'status',
+            'total_excl_tax',
+        )
+
+
 class PaymentProcessorSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     """ Serializer to use with instances of processors.BasePaymentProcessor """
 
@@ -580,25 +605,21 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('id', 'name',)
 
 
-class CouponListSerializer(serializers.ModelSerializer):
-    category = serializers.SerializerMethodField()
-    client = serializers.SerializerMethodField()
+class CouponSummarySerializer(serializers.ModelSerializer):
+    """ Serializer for the denormalized summaries of coupons, listed by the coupon administration tool. """
+    category = CategorySerializer()
     code = serializers.SerializerMethodField()
-
-    def get_category(self, obj):
-        category = ProductCategory.objects.filter(product=obj).first().category
-        return CategorySerializer(category).data
-
-    def get_client(self, obj):
-        return Invoice.objects.get(order__lines__product=obj).business_client.name
+    id = serializers.IntegerField(source='coupon_id')
 
     def get_code(self, obj):
-        if is_custom_code(obj):
-            return retrieve_voucher(obj).code
+        return obj.code or None
 
     class Meta(object):
-        model = Product
-        fields = ('category', 'client', 'code', 'id', 'title', 'date_created')
+        model = CouponSummary
+        fields = (
+            'benefit_type', 'benefit_value', 'category', 'client', 'code', 'date_created', 'end_date', 'id',
+            'max_uses', 'num_uses', 'quantity', 'start_date', 'title', 'voucher_type',
+        )
 
 
 class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
@@ -701,7 +722,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
 
     def get_num_uses(self, obj):
         offer = retrieve_offer(obj)
-        return offer.num_applications
+        return offer.get_num_applications()
 
     def get_program_uuid(self, obj):
         """ Get the Program UUID attached to the coupon. """
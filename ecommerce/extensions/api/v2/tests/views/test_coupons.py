@@ -8,8 +8,11 @@ from uuid import uuid4
 
 import ddt
 import httpretty
+import mock
 import pytz
-from django.test import RequestFactory
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
@@ -490,6 +493,27 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
         self.assertEqual(coupon_data['category']['name'], self.data['category']['name'])
         self.assertEqual(coupon_data['client'], self.data['client'])
 
+    def test_list_coupons_queries(self):
+        """ Verify the number of queries made to list coupons does not grow with the number of coupons. """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(COUPONS_LINK)
+
+        for index in range(3):
+            self.create_coupon(partner=self.partner, title='Coupon {}'.format(index))
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(COUPONS_LINK)
+        self.assertEqual(json.loads(response.content)['count'], 4)
+
+    def test_list_coupons_filtering_and_sorting(self):
+        """ Verify coupons can be filtered and sorted by their summarized fields. """
+        self.create_coupon(partner=self.partner, quantity=2, title='A coupon')
+
+        response = self.client.get(COUPONS_LINK, {'title': 'A c'})
+        self.assertEqual([coupon['title'] for coupon in response.data['results']], ['A coupon'])
+
+        response = self.client.get(COUPONS_LINK, {'ordering': 'quantity'})
+        self.assertEqual([coupon['quantity'] for coupon in response.data['results']], [2, self.data['quantity']])
+
     def test_list_and_details_endpoint_return_custom_code(self):
         """Test that the list and details endpoints return the correct code."""
         self.data.update({
@@ -595,6 +619,25 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
         for voucher in vouchers:
             self.assertEqual(voucher.offers.first().benefit.value, Decimal(50.0))
 
+    @override_settings(COUPON_BULK_UPDATE_ASYNC_THRESHOLD=0)
+    def test_update_benefit_value_in_background(self):
+        """ Verify the offers of large coupons are updated by a background task, whose progress is reported. """
+        path = reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id})
+        progress_path = reverse('api:v2:coupons-update-progress', kwargs={'pk': self.coupon.id})
+        self.assertEqual(self.client.get(progress_path).status_code, 404)
+
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda func: func()):
+            response = self.client.put(path, json.dumps({'benefit_value': 50}), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        vouchers = Product.objects.get(id=self.coupon.id).attr.coupon_vouchers.vouchers.all()
+        for voucher in vouchers:
+            self.assertEqual(voucher.offers.first().benefit.value, Decimal(50.0))
+
+        progress = json.loads(self.client.get(progress_path).content)
+        self.assertEqual(progress['state'], 'complete')
+        self.assertEqual(progress['completed'], progress['total'])
+
     def test_update_category(self):
         category = factories.CategoryFactory()
         path = reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id})
@@ -726,7 +769,6 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
 
         CouponViewSet().update_coupon_offer(
             benefit_value=benefit_value,
-            vouchers=vouchers,
             coupon=self.coupon
         )
         for voucher in vouchers:
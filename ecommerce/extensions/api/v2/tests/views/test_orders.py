@@ -4,7 +4,9 @@ import ddt
 import httpretty
 import mock
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from oscar.core.loading import get_model
 
@@ -156,6 +158,64 @@ class OrderListViewTests(AccessTokenMixin, ThrottlingMixin, TestCase):
             OrderSerializer(order, context={'request': RequestFactory(SERVER_NAME=self.site.domain).get('/')}).data
         )
 
+    def test_summary_view(self):
+        """ Verify the summary view paginates orders with a cursor, and omits product and voucher details. """
+        orders = [create_order(site=self.site, user=self.user) for __ in range(3)]
+
+        response = self.client.get(self.path, {'view': 'summary', 'page_size': 2}, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(response.content)
+
+        self.assertNotIn('count', content)
+        self.assertEqual([order['number'] for order in content['results']], [orders[2].number, orders[1].number])
+        line = orders[2].lines.first()
+        self.assertEqual(content['results'][0]['lines'][0]['product'], line.product.id)
+        self.assertNotIn('vouchers', content['results'][0])
+
+        response = self.client.get(content['next'], HTTP_AUTHORIZATION=self.token)
+        self.assertEqual([order['number'] for order in response.data['results']], [orders[0].number])
+
+    def test_summary_view_queries(self):
+        """ Verify the number of queries made by the summary view does not grow with the number of orders. """
+        create_order(site=self.site, user=self.user)
+        # Warm the caches read by every request.
+        self.client.get(self.path, {'view': 'summary'}, HTTP_AUTHORIZATION=self.token)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.path, {'view': 'summary'}, HTTP_AUTHORIZATION=self.token)
+
+        for __ in range(3):
+            create_order(site=self.site, user=self.user)
+        with self.assertNumQueries(len(queries)):
+            self.client.get(self.path, {'view': 'summary'}, HTTP_AUTHORIZATION=self.token)
+
+    def test_conditional_get(self):
+        """ Verify unchanged order lists are not modified, and lists are revalidated once the user's orders change. """
+        order = create_order(site=self.site, user=self.user)
+        response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Other query parameters return other representations.
+        response = self.client.get(
+            self.path, {'view': 'summary'}, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+        order.status = ORDER.COMPLETE
+        order.save()
+        response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_all_users(self):
+        """ Verify lists of the orders of all users are not validated. """
+        requester = self.create_user(is_staff=True)
+        response = self.client.get(self.path, HTTP_AUTHORIZATION=self.generate_jwt_token_header(requester))
+        self.assertNotIn('ETag', response)
+
 
 @ddt.ddt
 @override_settings(ECOMMERCE_SERVICE_WORKER_USERNAME='test-service-user')
@@ -4,7 +4,9 @@ import datetime
 import json
 
 import pytz
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from oscar.core.loading import get_model
 
@@ -68,6 +70,26 @@ class ProductViewSetTests(ProductViewSetBase):
         self.assertEqual(response.status_code, 200)
         self.assertDictEqual(json.loads(response.content), self.serialize_product(self.seat))
 
+    def test_cached(self):
+        """ Verify responses are cached, and tagged with an ETag, until the catalog changes. """
+        path = reverse('api:v2:product-detail', kwargs={'pk': self.seat.id})
+        response = self.client.get(path)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(path)
+        with CaptureQueriesContext(connection) as cached_queries:
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(cached_queries), len(queries))
+
+        self.seat.title = 'Updated title'
+        self.seat.save()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['title'], 'Updated title')
+
     def test_destroy(self):
         """ Verify the view does NOT allow products to be destroyed. """
         product_id = self.seat.id
@@ -223,6 +223,25 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         self.assertIn(valid_seat, products)
         self.assertNotIn(expired_seat, products)
 
+    def test_retrieve_course_objects_query_count(self):
+        """Verify products and stock records for a page of results are retrieved in a fixed number of queries."""
+        seats = [
+            CourseFactory().create_or_update_seat(seat_type, False, 100, partner=self.partner)
+            for seat_type in ('verified', 'professional', 'verified', 'professional')
+        ]
+        course_discovery_results = [{'key': seat.course_id, 'enrollment_end': None} for seat in seats]
+
+        with self.assertNumQueries(3):
+            products, stock_records = VoucherViewSet().retrieve_course_objects(
+                course_discovery_results, 'professional,verified'
+            )
+
+        # Products are grouped by seat type, in the order the seat types are given.
+        self.assertEqual(set(products[:2]), {seats[1], seats[3]})
+        self.assertEqual(set(products[2:]), {seats[0], seats[2]})
+        for seat in seats:
+            self.assertEqual(stock_records[seat.id], seat.stockrecords.first())
+
 
 @ddt.ddt
 @httpretty.activate
@@ -319,18 +338,8 @@ class VoucherViewOffersEndpointTests(DiscoveryMockMixin, CouponMixin, DiscoveryT
 
         self.assertEqual(response.status_code, 200)
 
-    @ddt.data(
-        (
-            StockRecord.objects.none(),
-            'ecommerce.extensions.api.v2.views.vouchers.StockRecord.objects.filter'
-        ),
-        (
-            Product.objects.none(),
-            'ecommerce.extensions.api.v2.views.vouchers.Product.objects.filter'
-        )
-    )
-    @ddt.unpack
-    def test_voucher_offers_listing_catalog_query_exception(self, return_value, method):
+    @ddt.data(True, False)
+    def test_voucher_offers_listing_catalog_query_exception(self, products_found):
         """
         Verify the endpoint returns status 200 and an empty list of course offers
         when all product Courses and Stock Records are not found
@@ -346,9 +355,16 @@ class VoucherViewOffersEndpointTests(DiscoveryMockMixin, CouponMixin, DiscoveryT
         voucher, __ = prepare_voucher(_range=new_range)
         request = self.prepare_offers_listing_request(voucher.code)
 
-        with mock.patch(method, mock.Mock(return_value=return_value)):
+        if products_found:
+            seat.stockrecords.all().delete()
             offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
-            self.assertEqual(len(offers), 0)
+        else:
+            with mock.patch(
+                'ecommerce.extensions.api.v2.views.vouchers.Product.objects.filter',
+                mock.Mock(return_value=Product.objects.none())
+            ):
+                offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 0)
 
     def test_voucher_offers_listing_catalog_query(self):
         """ Verify the endpoint returns offers data for single product range. """
@@ -1,5 +1,79 @@
-from rest_framework import viewsets, mixins
+import time
+from collections import OrderedDict
+
+import six
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.response import Response
+
+from ecommerce.core.utils import get_cache_key
+from ecommerce.extensions.catalogue.utils import get_catalog_version
+
+
+def _detach_serializers(data):
+    """
+    Returns a copy of serialized data made of plain lists, dicts and strings.
+
+    The lists and dicts returned by serializers link back to them, and hyperlinks to the objects they identify,
+    neither of which should be pickled.
+    """
+    if isinstance(data, dict):
+        return OrderedDict((key, _detach_serializers(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return [_detach_serializers(value) for value in data]
+    if isinstance(data, six.text_type):
+        return six.text_type(data)
+    return data
 
 
 class NonDestroyableModelViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, viewsets.ReadOnlyModelViewSet):
     pass
+
+
+class CatalogResponseCacheMixin(object):
+    """
+    Caches the responses of the list and retrieve actions of viewsets serving catalog data.
+
+    Responses are cached per catalog version, site, URL and accepted media type, and carry a strong ETag derived
+    from the same values, so that requests made with an up-to-date If-None-Match header are answered with a 304
+    after a single cache lookup. Responses also expire after CATALOG_API_RESPONSE_CACHE_TIMEOUT, as the
+    availability of products changes over time.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._get_cached_response(super(CatalogResponseCacheMixin, self).list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._get_cached_response(super(CatalogResponseCacheMixin, self).retrieve, request, *args, **kwargs)
+
+    def _get_cached_response(self, get_response, request, *args, **kwargs):
+        timeout = settings.CATALOG_API_RESPONSE_CACHE_TIMEOUT
+        cache_key = get_cache_key(
+            resource='catalog_api_response',
+            version=repr(get_catalog_version()),
+            period=int(time.time() // timeout),
+            site_id=request.site.id,
+            url=request.build_absolute_uri(),
+            accept=request.META.get('HTTP_ACCEPT'),
+        )
+        etag = quote_etag(cache_key)
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        data = cache.get(cache_key)
+        if data is None:
+            response = get_response(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(cache_key, _detach_serializers(response.data), timeout)
+        else:
+            response = Response(data)
+
+        response['ETag'] = etag
+        return response
@@ -27,6 +27,7 @@ from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.basket.utils import attribute_cookie_data
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.extensions.partner.sku_index import resolve_skus
 from ecommerce.extensions.payment import exceptions as payment_exceptions
 from ecommerce.extensions.payment.helpers import get_default_processor_class, get_processor_class_by_name
 
@@ -413,7 +414,9 @@ class BasketCalculateView(generics.GenericAPIView):
         except Voucher.DoesNotExist:
             voucher = None
 
-        products = Product.objects.filter(stockrecords__partner=partner, stockrecords__partner_sku__in=skus)
+        products = Product.objects.filter(
+            id__in=[record.product_id for record in resolve_skus(skus, partner).values()]
+        )
         if not products:
             return HttpResponseBadRequest(_('Products with SKU(s) [{skus}] do not exist.').format(skus=', '.join(skus)))
 
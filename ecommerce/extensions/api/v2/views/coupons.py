@@ -9,6 +9,7 @@ from django.http import Http404
 from django.shortcuts import get_object_or_404
 from oscar.core.loading import get_model
 from rest_framework import filters, generics, serializers, status, viewsets
+from rest_framework.decorators import detail_route
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
@@ -17,21 +18,22 @@ from ecommerce.core.models import BusinessClient
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.extensions.api import data as data_api
-from ecommerce.extensions.api.filters import ProductFilter
-from ecommerce.extensions.api.serializers import CategorySerializer, CouponListSerializer, CouponSerializer
+from ecommerce.extensions.api.filters import CouponSummaryFilter, ProductFilter
+from ecommerce.extensions.api.serializers import CategorySerializer, CouponSerializer, CouponSummarySerializer
 from ecommerce.extensions.basket.utils import prepare_basket
 from ecommerce.extensions.catalogue.utils import create_coupon_product, get_or_create_catalog
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.processors.invoice import InvoicePayment
-from ecommerce.extensions.voucher.models import CouponVouchers
-from ecommerce.extensions.voucher.utils import update_voucher_offer
+from ecommerce.extensions.voucher.bulk import CouponBulkUpdate, get_update_progress, set_update_progress
+from ecommerce.extensions.voucher.models import CouponSummary, CouponVouchers
+from ecommerce.extensions.voucher.summary import update_coupon_summary
+from ecommerce.extensions.voucher.tasks import update_coupon_offers
 from ecommerce.invoice.models import Invoice
 
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
-Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
@@ -46,18 +48,31 @@ Voucher = get_model('voucher', 'Voucher')
 class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
     """ Coupon resource. """
     permission_classes = (IsAuthenticated, IsAdminUser)
-    filter_backends = (filters.DjangoFilterBackend,)
-    filter_class = ProductFilter
+    filter_backends = (filters.DjangoFilterBackend, filters.OrderingFilter,)
+    ordering_fields = (
+        'client', 'date_created', 'end_date', 'num_uses', 'quantity', 'start_date', 'title', 'voucher_type',
+    )
+
+    @property
+    def filter_class(self):
+        if self.action == 'list':
+            return CouponSummaryFilter
+        return ProductFilter
 
     def get_queryset(self):
+        partner = self.request.site.siteconfiguration.partner
+        if self.action == 'list':
+            # Coupons are listed from their denormalized summaries, with a single query.
+            return CouponSummary.objects.filter(partner=partner).select_related('category')
+
         return Product.objects.filter(
             product_class__name=COUPON_PRODUCT_CLASS_NAME,
-            stockrecords__partner=self.request.site.siteconfiguration.partner
+            stockrecords__partner=partner
         )
 
     def get_serializer_class(self):
         if self.action == 'list':
-            return CouponListSerializer
+            return CouponSummarySerializer
         return CouponSerializer
 
     def create(self, request, *args, **kwargs):
@@ -337,18 +352,28 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             coupon = self.get_object()
             vouchers = coupon.attr.coupon_vouchers.vouchers
             baskets = Basket.objects.filter(lines__product_id=coupon.id, status=Basket.SUBMITTED)
+            bulk_update = CouponBulkUpdate(coupon)
             data = self.create_update_data_dict(data=request.data, fields=CouponVouchers.UPDATEABLE_VOUCHER_FIELDS)
-
-            if data:
-                vouchers.all().update(**data)
+            bulk_update.update_vouchers(**data)
 
             self.update_range_data(request, vouchers)
 
             program_uuid = request.data.get('program_uuid')
             benefit_value = request.data.get('benefit_value')
-            if benefit_value or program_uuid:
-                self.update_coupon_offer(benefit_value=benefit_value, vouchers=vouchers,
-                                         coupon=coupon, program_uuid=program_uuid)
+            offer_data = self.validate_offer_data(request.data, vouchers, coupon.id)
+            response_status = status.HTTP_200_OK
+            if (benefit_value or program_uuid or offer_data) and self.should_update_in_background(bulk_update):
+                set_update_progress(coupon.id, 'pending', total=len(bulk_update.offer_ids))
+                # The task must not start before the changes made by this request are committed.
+                transaction.on_commit(lambda: update_coupon_offers.delay(
+                    coupon.id, benefit_value=benefit_value, program_uuid=program_uuid, offer_data=offer_data
+                ))
+                response_status = status.HTTP_202_ACCEPTED
+            else:
+                # Offers replaced by update_coupon_offer copy the fields of the offers they replace.
+                bulk_update.update_offers(**offer_data)
+                if benefit_value or program_uuid:
+                    self.update_coupon_offer(benefit_value=benefit_value, coupon=coupon, program_uuid=program_uuid)
 
             category_data = request.data.get('category')
             if category_data:
@@ -368,11 +393,12 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                 coupon.attr.note = note
                 coupon.save()
 
-            self.update_offer_data(request.data, vouchers, coupon.id)
             self.update_invoice_data(coupon, request.data)
+            # Several of the changes above are made with queryset updates, which do not send signals.
+            update_coupon_summary(coupon)
 
             serializer = self.get_serializer(coupon)
-            return Response(serializer.data)
+            return Response(serializer.data, status=response_status)
         except ValidationError as error:
             error_message = 'Failed to update Coupon [{coupon_id}]. {msg}'.format(
                 coupon_id=coupon.id,
@@ -407,39 +433,20 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                     update_dict[field.replace('invoice_', '')] = value
         return update_dict
 
-    def update_coupon_offer(self, coupon, vouchers, benefit_value=None, program_uuid=None):
+    def should_update_in_background(self, bulk_update):
+        """ Returns True if the coupon has enough offers for them to be updated by a background task. """
+        threshold = settings.COUPON_BULK_UPDATE_ASYNC_THRESHOLD
+        return threshold is not None and len(bulk_update.offer_ids) > threshold
+
+    def update_coupon_offer(self, coupon, benefit_value=None, program_uuid=None):
         """
-        Remove all offers from the vouchers and add a new offer
+        Replace the offers of the coupon's vouchers with offers having the new benefit
         Arguments:
             coupon (Product): Coupon product associated with vouchers
-            vouchers (ManyRelatedManager): Vouchers associated with the coupon to be updated
             benefit_value (Decimal): Benefit value associated with a new offer
             program_uuid (str): Program UUID
         """
-        voucher_offers = vouchers.first().offers
-        voucher_offer = voucher_offers.first()
-
-        if program_uuid:
-            Condition.objects.filter(
-                program_uuid=voucher_offer.condition.program_uuid
-            ).update(program_uuid=program_uuid)
-
-        # The program uuid (if program coupon) is required for the benefit and condition update logic
-        program_uuid = program_uuid or voucher_offer.condition.program_uuid
-
-        new_offer = update_voucher_offer(
-            offer=voucher_offer,
-            benefit_value=benefit_value or voucher_offer.benefit.value,
-            benefit_type=voucher_offer.benefit.type or getattr(
-                voucher_offer.benefit.proxy(), 'benefit_class_type', None
-            ),
-            coupon=coupon,
-            max_uses=voucher_offer.max_global_applications,
-            program_uuid=program_uuid
-        )
-        for voucher in vouchers.all():
-            voucher.offers.clear()
-            voucher.offers.add(new_offer)
+        CouponBulkUpdate(coupon).replace_benefit(benefit_value=benefit_value, program_uuid=program_uuid)
 
     def update_coupon_client(self, baskets, client_username):
         """
@@ -465,7 +472,13 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         if invoice_data:
             Invoice.objects.filter(order__lines__product=coupon).update(**invoice_data)
 
-    def update_offer_data(self, data, vouchers, coupon_id):
+    def validate_offer_data(self, data, vouchers, coupon_id):
+        """
+        Returns the validated offer fields to update from the request data.
+
+        Raises:
+            ValidationError: If max_global_applications is not a positive number, or the coupon is single use.
+        """
         offer_data = self.create_update_data_dict(data=data, fields=ConditionalOffer.UPDATABLE_OFFER_FIELDS)
 
         if offer_data:
@@ -484,7 +497,16 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                         raise ValueError
                 except ValueError:
                     raise ValidationError('max_global_applications field must be a positive number.')
-            ConditionalOffer.objects.filter(vouchers__in=vouchers.all()).update(**offer_data)
+        return offer_data
+
+    @detail_route(methods=['get'])
+    def update_progress(self, request, pk=None):  # pylint: disable=unused-argument
+        """ Returns the progress of the latest background update of the coupon's offers. """
+        coupon = self.get_object()
+        progress = get_update_progress(coupon.id)
+        if progress is None:
+            raise Http404
+        return Response(progress)
 
     def destroy(self, request, pk):  # pylint: disable=unused-argument
         try:
@@ -10,13 +10,13 @@ from rest_framework.response import Response
 from ecommerce.core.constants import COURSE_ID_REGEX
 from ecommerce.courses.models import Course
 from ecommerce.extensions.api import serializers
-from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.api.v2.views import CatalogResponseCacheMixin, NonDestroyableModelViewSet
 
 Product = get_model('catalogue', 'Product')
 ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 
 
-class CourseViewSet(NonDestroyableModelViewSet):
+class CourseViewSet(CatalogResponseCacheMixin, NonDestroyableModelViewSet):
     product_attribute_value_prefetch = Prefetch(
         'products__attribute_values',
         queryset=ProductAttributeValue.objects.select_related('attribute').all()
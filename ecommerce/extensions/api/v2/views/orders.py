@@ -1,6 +1,9 @@
 """HTTP endpoints for interacting with orders."""
 import logging
 
+from django.contrib.auth import get_user_model
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from oscar.core.loading import get_class, get_model
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import detail_route
@@ -8,17 +11,30 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import DjangoModelPermissions, IsAuthenticated
 from rest_framework.response import Response
 
+from ecommerce.core.utils import get_cache_key
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import OrderFilter
+from ecommerce.extensions.api.pagination import OrderHistoryCursorPagination
 from ecommerce.extensions.api.permissions import IsStaffOrOwner
 from ecommerce.extensions.api.throttles import ServiceUserThrottle
+from ecommerce.extensions.order.history import get_order_history_version
 
 logger = logging.getLogger(__name__)
 
 Order = get_model('order', 'Order')
+User = get_user_model()
+
+SUMMARY_VIEW = 'summary'
 
 
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Orders, visible to their owners and staff.
+
+    Passing view=summary serializes orders with OrderSummarySerializer, which requires a fixed number of queries
+    per page, and paginates them with a cursor. Lists of a single user's orders carry an ETag and Last-Modified
+    header derived from the time the user's orders last changed, so that unchanged lists can be revalidated.
+    """
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
     queryset = Order.objects.all()
@@ -27,6 +43,42 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = (filters.DjangoFilterBackend,)
     filter_class = OrderFilter
 
+    @property
+    def is_summary(self):
+        # The schema generator inspects the view without a request.
+        return self.request is not None and self.request.query_params.get('view') == SUMMARY_VIEW
+
+    @property
+    def paginator(self):
+        # Cached like GenericAPIView.paginator, which also assigns _paginator when first used.
+        # pylint: disable=attribute-defined-outside-init
+        if not hasattr(self, '_paginator'):
+            if self.is_summary:
+                self._paginator = OrderHistoryCursorPagination()
+            else:
+                self._paginator = super(OrderViewSet, self).paginator
+        return self._paginator
+
+    def get_serializer_class(self):
+        if self.is_summary:
+            return serializers.OrderSummarySerializer
+        return self.serializer_class
+
+    def get_queryset(self):
+        queryset = super(OrderViewSet, self).get_queryset().prefetch_related(
+            'discounts', 'lines', 'sources__source_type'
+        )
+        if self.is_summary:
+            return queryset
+
+        return queryset.select_related('basket', 'billing_address__country', 'user').prefetch_related(
+            'basket__vouchers',
+            'lines__product__attribute_values__attribute',
+            'lines__product__parent__product_class',
+            'lines__product__product_class',
+            'lines__product__stockrecords',
+        )
+
     def filter_queryset(self, queryset):
         queryset = super(OrderViewSet, self).filter_queryset(queryset)
 
@@ -42,6 +94,53 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset.filter(site=self.request.site)
 
+    def _get_history_user_id(self):
+        """ Returns the ID of the user whose orders are listed, or None if the orders of all users are listed. """
+        user = self.request.user
+        username = self.request.query_params.get('username')
+        if not user.is_staff or username == user.username:
+            return user.id
+        if username:
+            return User.objects.filter(username=username).values_list('id', flat=True).first()
+        return None
+
+    def list(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        queryset = self.filter_queryset(self.get_queryset())
+
+        etag = last_modified = None
+        user_id = self._get_history_user_id()
+        if user_id:
+            version = get_order_history_version(user_id)
+            etag = quote_etag(get_cache_key(
+                version=repr(version), path=request.get_full_path(), site_id=request.site.id
+            ))
+            last_modified = int(version)
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return self._set_validators(not_modified, etag, last_modified)
+
+        page = self.paginate_queryset(queryset)
+        orders = queryset if page is None else page
+
+        if not self.is_summary:
+            # Price the products of all lines at once, rather than line by line.
+            request.strategy.fetch_for_products(
+                [line.product for order in orders for line in order.lines.all() if line.product]
+            )
+
+        serializer = self.get_serializer(orders, many=True)
+        response = Response(serializer.data) if page is None else self.get_paginated_response(serializer.data)
+
+        if etag:
+            self._set_validators(response, etag, last_modified)
+        return response
+
+    @staticmethod
+    def _set_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
     @detail_route(methods=['put', 'patch'])
     def fulfill(self, request, number=None):  # pylint: disable=unused-argument
         """ Fulfill order """
@@ -4,11 +4,12 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.api.v2.views import CatalogResponseCacheMixin
 
 Partner = get_model('partner', 'Partner')
 
 
-class PartnerViewSet(viewsets.ReadOnlyModelViewSet):
+class PartnerViewSet(CatalogResponseCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Partner.objects.all()
     serializer_class = serializers.PartnerSerializer
     permission_classes = (IsAuthenticated, IsAdminUser,)
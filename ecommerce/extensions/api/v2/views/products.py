@@ -7,12 +7,12 @@ from rest_framework_extensions.mixins import NestedViewSetMixin
 
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import ProductFilter
-from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.api.v2.views import CatalogResponseCacheMixin, NonDestroyableModelViewSet
 
 Product = get_model('catalogue', 'Product')
 
 
-class ProductViewSet(NestedViewSetMixin, NonDestroyableModelViewSet):
+class ProductViewSet(CatalogResponseCacheMixin, NestedViewSetMixin, NonDestroyableModelViewSet):
     serializer_class = serializers.ProductSerializer
     filter_backends = (filters.DjangoFilterBackend,)
     filter_class = ProductFilter
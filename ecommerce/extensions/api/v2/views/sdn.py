@@ -27,16 +27,21 @@ class SDNCheckViewSet(APIView):
         hits = 0
 
         site_configuration = request.site.siteconfiguration
-        basket = Basket.get_basket(request.user, site_configuration.site)
-
+        sdn_check = None
         if site_configuration.enable_sdn_check:
             sdn_check = SDNClient(
                 api_url=site_configuration.sdn_api_url,
                 api_key=site_configuration.sdn_api_key,
                 sdn_list=site_configuration.sdn_api_list
             )
+            # The search runs while the basket is retrieved.
+            wait_for_search = sdn_check.search_async(name, city, country)
+
+        basket = Basket.get_basket(request.user, site_configuration.site)
+
+        if sdn_check:
             try:
-                response = sdn_check.search(name, city, country)
+                response = wait_for_search()
                 hits = response['total']
                 if hits > 0:
                     sdn_check.deactivate_user(
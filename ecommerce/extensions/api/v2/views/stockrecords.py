@@ -4,11 +4,12 @@ from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
 from rest_framework.response import Response
 
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.api.v2.views import CatalogResponseCacheMixin
 
 StockRecord = get_model('partner', 'StockRecord')
 
 
-class StockRecordViewSet(viewsets.ModelViewSet):
+class StockRecordViewSet(CatalogResponseCacheMixin, viewsets.ModelViewSet):
     permission_classes = (DjangoModelPermissionsOrAnonReadOnly,)
     serializer_class = serializers.StockRecordSerializer
 
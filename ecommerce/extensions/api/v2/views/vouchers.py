@@ -4,6 +4,7 @@ from urlparse import urlparse
 
 import django_filters
 from dateutil import parser
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
@@ -23,8 +24,9 @@ from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndSta
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
 
 logger = logging.getLogger(__name__)
-Order = get_model('order', 'Order')
+Line = get_model('order', 'Line')
 Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 
@@ -104,25 +106,79 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            List of products, ordered by seat type, and a dict mapping product IDs to their stock records.
         """
-        all_course_ids = []
-        nonexpired_course_ids = []
+        products, stock_records, __ = self._retrieve_course_objects(results, course_seat_types)
+        return products, stock_records
+
+    def _retrieve_course_objects(self, results, course_seat_types):
+        """ Retrieve the products, stock records and seat types for course catalog response results.
+
+        All products for the page of results are loaded, along with their courses and stock records, in a
+        fixed number of queries.
+
+        Returns:
+            A list of products, a dict mapping product IDs to stock records and a dict mapping product IDs
+            to seat types.
+        """
+        seat_types = course_seat_types.split(',')
+        nonexpired_course_ids = set()
         for result in results:
-            all_course_ids.append(result['key'])
             if not result['enrollment_end'] or \
                     (result['enrollment_end'] and parser.parse(result['enrollment_end']) > now()):
-                nonexpired_course_ids.append(result['key'])
-
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
-                course_id__in=nonexpired_course_ids if seat_type == 'professional' else all_course_ids,
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
-        stock_records = StockRecord.objects.filter(product__in=products)
-        return products, stock_records
+                nonexpired_course_ids.add(result['key'])
+
+        certificate_types = ProductAttributeValue.objects.filter(
+            attribute__name='certificate_type',
+            product__course_id__in=[result['key'] for result in results],
+            value_text__in=seat_types,
+        ).values_list('product_id', 'product__course_id', 'value_text')
+
+        seat_types_by_product = {}
+        for product_id, course_id, seat_type in certificate_types:
+            if seat_type != 'professional' or course_id in nonexpired_course_ids:
+                seat_types_by_product[product_id] = seat_type
+
+        products = Product.objects.filter(
+            id__in=seat_types_by_product.keys()
+        ).select_related('course', 'parent').prefetch_related('stockrecords')
+        # Group products by seat type, in the order the seat types are listed on the range.
+        products = sorted(products, key=lambda product: seat_types.index(seat_types_by_product[product.id]))
+
+        stock_records = {}
+        for product in products:
+            product_stock_records = product.stockrecords.all()
+            if product_stock_records:
+                stock_records[product.id] = product_stock_records[0]
+
+        return products, stock_records, seat_types_by_product
+
+    def get_credit_seat_data(self, request, products):
+        """ Collect, in bulk, the data needed to list credit seats.
+
+        Args:
+            request (WSGIRequest): Request data.
+            products (list): Credit seat products.
+
+        Returns:
+            A set of the IDs of courses for which the user is eligible for credit, a set of the IDs of products
+            the user has already purchased and a dict mapping parent product IDs to their number of credit seats.
+        """
+        eligibility = request.user.get_credit_eligibility({product.course_id for product in products})
+        eligible_course_ids = {course_id for course_id, eligible in eligibility.items() if eligible}
+        purchased_product_ids = set(
+            Line.objects.filter(order__user=request.user, product__in=products).values_list('product_id', flat=True)
+        )
+        credit_seat_counts = dict(
+            Product.objects.filter(
+                parent_id__in={product.parent_id for product in products},
+                attributes__name='credit_provider'
+            ).order_by().values('parent_id').annotate(
+                count=Count('id', distinct=True)
+            ).values_list('parent_id', 'count')
+        )
+
+        return eligible_course_ids, purchased_product_ids, credit_seat_counts
 
     def get_offers_from_query(self, request, voucher, catalog_query):
         """ Helper method for collecting offers from catalog query.
@@ -149,46 +205,48 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             offset=request.GET.get('offset'),
         )
         next_page = response['next']
-        products, stock_records = self.retrieve_course_objects(response['results'], course_seat_types)
+        products, stock_records, seat_types = self._retrieve_course_objects(response['results'], course_seat_types)
         contains_verified_course = (course_seat_types == 'verified')
+
+        # Index the Discovery results by course key, keeping the first result for each key.
+        course_catalog_data_by_key = {}
+        for result in response['results']:
+            course_catalog_data_by_key.setdefault(result['key'], result)
+
+        if course_seat_types == 'credit':
+            eligible_course_ids, purchased_product_ids, credit_seat_counts = self.get_credit_seat_data(
+                request, products
+            )
+
+        purchase_infos = request.strategy.fetch_for_products(products)
         for product in products:
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
-            if not request.strategy.fetch_for_product(product).availability.is_available_to_buy:
+            if not purchase_infos[product.id].availability.is_available_to_buy:
                 logger.info('%s is unavailable to buy. Omitting it from the results.', product)
                 continue
 
             course_id = product.course_id
-            course_catalog_data = next(
-                (result for result in response['results'] if result['key'] == course_id),
-                None
-            )
+            course_catalog_data = course_catalog_data_by_key.get(course_id)
+            stock_record = stock_records.get(product.id)
+
             if course_seat_types == 'credit':
                 # Omit credit seats for which the user is not eligible or which the user already bought.
-                if request.user.is_eligible_for_credit(product.course_id):
-                    if Order.objects.filter(user=request.user, lines__product=product).exists():
-                        continue
-                else:
+                if course_id not in eligible_course_ids or product.id in purchased_product_ids:
                     continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
 
-                if credit_seats.count() > 1:
+                if credit_seat_counts.get(product.parent_id, 0) > 1:
                     multiple_credit_providers = True
                     credit_provider_price = None
                 else:
                     multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price_excl_tax
+                    credit_provider_price = stock_record.price_excl_tax if stock_record else None
 
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
+            if not stock_record:
                 logger.error('Stock Record for product %s not found.', product.id)
 
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
+            course = product.course
+            if not course:  # pragma: no cover
                 logger.error('Course %s not found.', course_id)
 
             if course_catalog_data and course and stock_record:
@@ -201,7 +259,8 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                     is_verified=contains_verified_course,
                     product=product,
                     stock_record=stock_record,
-                    voucher=voucher
+                    voucher=voucher,
+                    seat_type=seat_types[product.id],
                 ))
 
         return offers, next_page
@@ -257,7 +316,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
 
     def get_course_offer_data(
             self, benefit, course, course_info, credit_provider_price, is_verified,
-            multiple_credit_providers, product, stock_record, voucher
+            multiple_credit_providers, product, stock_record, voucher, seat_type=None
     ):
         """
         Gets course offer data.
@@ -268,6 +327,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             is_verified (bool): Indicated whether or not the voucher's range of products contains a verified course seat
             stock_record (StockRecord): Stock record associated with the course seat
             voucher (Voucher): Voucher for which the course offer data is being fetched
+            seat_type (str): Certificate type of the course seat, if already known
         Returns:
             dict: Course offer data
         """
@@ -284,7 +344,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             'multiple_credit_providers': multiple_credit_providers,
             'organization': CourseKey.from_string(course.id).org,
             'credit_provider_price': credit_provider_price,
-            'seat_type': product.attr.certificate_type,
+            'seat_type': seat_type or product.attr.certificate_type,
             'stockrecords': serializers.StockRecordSerializer(stock_record).data,
             'title': course_info.get('title', course.name),
             'voucher_end_date': voucher.end_datetime
@@ -151,6 +151,19 @@ class BasketUtilsTests(DiscoveryTestMixin, TestCase):
         basket = prepare_basket(self.request, [product])
         self.assertEqual(basket.lines.count(), 0)
 
+    @httpretty.activate
+    def test_prepare_basket_embargo_check_cached(self):
+        """ Verify the result of the embargo check is cached for the user, IP address and courses. """
+        self.site_configuration.enable_embargo_check = True
+        self.mock_access_token_response()
+        self.mock_embargo_api(body=json.dumps({'access': False}))
+        course = CourseFactory()
+        product = course.create_or_update_seat('verified', False, 10, self.partner)
+
+        self.assertEqual(prepare_basket(self.request, [product]).lines.count(), 0)
+        self.mock_embargo_api(body=json.dumps({'access': True}))
+        self.assertEqual(prepare_basket(self.request, [product]).lines.count(), 0)
+
     @httpretty.activate
     def test_prepare_basket_embargo_with_enrollment_code(self):
         """ Verify a basket is returned after adding enrollment code. """
@@ -31,6 +31,7 @@ from ecommerce.extensions.basket.utils import add_utm_params_to_url, get_basket_
 from ecommerce.extensions.offer.utils import format_benefit_value, render_email_confirmation_if_required
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.extensions.partner.sku_index import resolve_skus
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
 
@@ -56,7 +57,9 @@ class BasketAddItemsView(View):
         if not skus:
             return HttpResponseBadRequest(_('No SKUs provided.'))
 
-        products = Product.objects.filter(stockrecords__partner=partner, stockrecords__partner_sku__in=skus)
+        products = Product.objects.filter(
+            id__in=[record.product_id for record in resolve_skus(skus, partner).values()]
+        )
         if not products:
             return HttpResponseBadRequest(_('Products with SKU(s) [{skus}] do not exist.').format(skus=', '.join(skus)))
 
@@ -79,8 +82,9 @@ class BasketAddItemsView(View):
 
         # check availability of products
         unavailable_product_ids = []
+        purchase_infos = request.strategy.fetch_for_products(products)
         for product in products:
-            purchase_info = request.strategy.fetch_for_product(product)
+            purchase_info = purchase_infos[product.id]
             if not purchase_info.availability.is_available_to_buy:
                 logger.warning('Product [%s] is not available to buy.', product.title)
                 unavailable_product_ids.append(product.id)
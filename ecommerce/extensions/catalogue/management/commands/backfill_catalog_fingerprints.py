@@ -0,0 +1,69 @@
+"""
+Management command that computes the stock record fingerprints of catalogs created before fingerprints existed.
+"""
+from __future__ import unicode_literals
+
+import logging
+import time
+from collections import defaultdict
+
+from django.core.management import BaseCommand
+from oscar.core.loading import get_model
+
+logger = logging.getLogger(__name__)
+Catalog = get_model('catalogue', 'Catalog')
+
+
+class Command(BaseCommand):
+    help = 'Populate the stock record fingerprints of catalogs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Number of catalogs to update in each batch.')
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=0,
+                            type=float,
+                            help='Seconds to sleep between batches.')
+        parser.add_argument('--all',
+                            action='store_true',
+                            dest='all',
+                            default=False,
+                            help='Recompute the fingerprints of all catalogs, not only those without one.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Catalog.objects.order_by('id')
+        if not options['all']:
+            queryset = queryset.filter(stock_records_fingerprint__isnull=True)
+
+        through = Catalog.stock_records.through
+        updated = 0
+        last_id = 0
+
+        while True:
+            catalog_ids = list(queryset.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+            if not catalog_ids:
+                break
+
+            stock_record_ids = defaultdict(list)
+            for catalog_id, stock_record_id in through.objects.filter(catalog_id__in=catalog_ids).values_list(
+                    'catalog_id', 'stockrecord_id'):
+                stock_record_ids[catalog_id].append(stock_record_id)
+
+            for catalog_id in catalog_ids:
+                Catalog.objects.filter(id=catalog_id).update(
+                    stock_records_fingerprint=Catalog.get_stock_records_fingerprint(stock_record_ids[catalog_id])
+                )
+
+            updated += len(catalog_ids)
+            last_id = catalog_ids[-1]
+            logger.info('Updated fingerprints for [%d] catalogs.', updated)
+            time.sleep(options['sleep_seconds'])
+
+        logger.info('Finished updating fingerprints for [%d] catalogs.', updated)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0030_auto_20180124_1131'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalog',
+            name='stock_records_fingerprint',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Hash of the IDs of the stock records in this catalog, used to look up catalogs by content.', max_length=40, null=True),
+        ),
+    ]
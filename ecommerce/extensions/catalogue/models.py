@@ -1,5 +1,7 @@
+import hashlib
+
 from django.db import models
-from django.db.models.signals import post_init, post_save
+from django.db.models.signals import m2m_changed, post_init, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.catalogue.abstract_models import AbstractProduct
@@ -84,6 +86,10 @@ class Catalog(models.Model):
     name = models.CharField(max_length=255)
     partner = models.ForeignKey('partner.Partner', related_name='catalogs', on_delete=models.CASCADE)
     stock_records = models.ManyToManyField('partner.StockRecord', blank=True, related_name='catalogs')
+    stock_records_fingerprint = models.CharField(
+        max_length=40, null=True, blank=True, db_index=True, editable=False,
+        help_text=_('Hash of the IDs of the stock records in this catalog, used to look up catalogs by content.')
+    )
 
     def __unicode__(self):
         return u'{id}: {partner_code}-{catalog_name}'.format(
@@ -92,4 +98,41 @@ class Catalog(models.Model):
             catalog_name=self.name
         )
 
+    @staticmethod
+    def get_stock_records_fingerprint(stock_record_ids):
+        """ Returns the fingerprint of a catalog containing the stock records with the given IDs. """
+        key = ','.join(str(stock_record_id) for stock_record_id in sorted(set(stock_record_ids)))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def update_stock_records_fingerprint(self):
+        """ Recomputes and saves the fingerprint of this catalog's stock records. """
+        fingerprint = self.get_stock_records_fingerprint(self.stock_records.values_list('id', flat=True))
+        Catalog.objects.filter(pk=self.pk).update(stock_records_fingerprint=fingerprint)
+        self.stock_records_fingerprint = fingerprint
+
+    def save(self, *args, **kwargs):
+        if self.pk is None and self.stock_records_fingerprint is None:
+            # New catalogs have no stock records until after they are saved.
+            self.stock_records_fingerprint = self.get_stock_records_fingerprint([])
+        super(Catalog, self).save(*args, **kwargs)
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through)
+def update_catalog_fingerprint(sender, instance, action, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """Keeps catalog fingerprints up to date as stock records are added to or removed from catalogs."""
+    if kwargs['reverse']:
+        # The instance is a stock record, and the catalogs changed are identified by pk_set. Clearing all
+        # catalogs from a stock record does not provide pk_set, so remember them before they are removed.
+        if action == 'pre_clear':
+            instance._cleared_catalog_ids = list(instance.catalogs.values_list('id', flat=True))  # pylint: disable=protected-access
+            return
+        if action == 'post_clear':
+            pk_set = getattr(instance, '_cleared_catalog_ids', [])
+
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            for catalog in Catalog.objects.filter(pk__in=pk_set):
+                catalog.update_stock_records_fingerprint()
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        instance.update_stock_records_fingerprint()
+
 from oscar.apps.catalogue.models import *  # noqa isort:skip pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order,ungrouped-imports
@@ -0,0 +1,28 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.courses.models import Course
+from ecommerce.extensions.catalogue.utils import update_catalog_version
+
+Catalog = get_model('catalogue', 'Catalog')
+Partner = get_model('partner', 'Partner')
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+@receiver(post_save, sender=Catalog, dispatch_uid='catalogue.version.catalog_saved')
+@receiver(post_delete, sender=Catalog, dispatch_uid='catalogue.version.catalog_deleted')
+@receiver(post_save, sender=Course, dispatch_uid='catalogue.version.course_saved')
+@receiver(post_delete, sender=Course, dispatch_uid='catalogue.version.course_deleted')
+@receiver(post_save, sender=Partner, dispatch_uid='catalogue.version.partner_saved')
+@receiver(post_delete, sender=Partner, dispatch_uid='catalogue.version.partner_deleted')
+@receiver(post_save, sender=Product, dispatch_uid='catalogue.version.product_saved')
+@receiver(post_delete, sender=Product, dispatch_uid='catalogue.version.product_deleted')
+@receiver(post_save, sender=StockRecord, dispatch_uid='catalogue.version.stock_record_saved')
+@receiver(post_delete, sender=StockRecord, dispatch_uid='catalogue.version.stock_record_deleted')
+@receiver(m2m_changed, sender=Catalog.stock_records.through, dispatch_uid='catalogue.version.catalog_stock_records')
+def catalog_changed(sender, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Change the catalog version, so that the cached responses of the catalog APIs are no longer used. """
+    if not raw:
+        update_catalog_version()
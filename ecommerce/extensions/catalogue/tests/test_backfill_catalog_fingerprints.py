@@ -0,0 +1,33 @@
+from __future__ import unicode_literals
+
+from django.core.management import call_command
+from oscar.core.loading import get_model
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.tests.testcases import TestCase
+
+Catalog = get_model('catalogue', 'Catalog')
+
+
+class BackfillCatalogFingerprintsTests(TestCase):
+    """Tests for the backfill_catalog_fingerprints command."""
+
+    def test_backfill(self):
+        """Verify the command populates missing fingerprints from the catalogs' stock records."""
+        seat = CourseFactory().create_or_update_seat('verified', False, 0, self.partner)
+        stock_record = seat.stockrecords.first()
+        catalogs = [Catalog.objects.create(name='Test', partner=self.partner) for __ in range(3)]
+        catalogs[0].stock_records.add(stock_record)
+        Catalog.objects.update(stock_records_fingerprint=None)
+
+        call_command('backfill_catalog_fingerprints', batch_size=2)
+
+        self.assertEqual(
+            Catalog.objects.get(id=catalogs[0].id).stock_records_fingerprint,
+            Catalog.get_stock_records_fingerprint([stock_record.id])
+        )
+        for catalog in catalogs[1:]:
+            self.assertEqual(
+                Catalog.objects.get(id=catalog.id).stock_records_fingerprint,
+                Catalog.get_stock_records_fingerprint([])
+            )
@@ -10,7 +10,12 @@ from oscar.core.loading import get_model
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
-from ecommerce.extensions.catalogue.utils import create_coupon_product, generate_sku, get_or_create_catalog
+from ecommerce.extensions.catalogue.utils import (
+    create_coupon_product,
+    generate_sku,
+    get_catalog_version,
+    get_or_create_catalog
+)
 from ecommerce.tests.factories import ProductFactory
 from ecommerce.tests.testcases import TestCase
 
@@ -86,6 +91,41 @@ class UtilsTests(DiscoveryTestMixin, TestCase):
         self.assertNotEqual(self.catalog, new_catalog)
         self.assertEqual(Catalog.objects.count(), 2)
 
+    def test_get_or_create_catalog_after_stock_record_removal(self):
+        """Verify catalogs are found by their current stock records after stock records are removed."""
+        stock_record = self.seat.stockrecords.first()
+        self.catalog.stock_records.add(stock_record)
+        self.catalog.stock_records.remove(stock_record)
+
+        catalog, created = get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=[])
+        self.assertFalse(created)
+        self.assertEqual(catalog, self.catalog)
+
+        stock_record.catalogs.add(self.catalog)
+        catalog, created = get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=[stock_record.id])
+        self.assertFalse(created)
+        self.assertEqual(catalog, self.catalog)
+
+    def test_get_or_create_catalog_with_string_ids(self):
+        """Verify catalogs are found when the IDs of their stock records are given as strings."""
+        course = CourseFactory(id='sku/test2/course', name='Test Course 2', site=self.site)
+        stock_records = [self.seat.stockrecords.first(), course.create_or_update_seat(
+            'verified', False, 0, self.partner
+        ).stockrecords.first()]
+        # The IDs sort differently as strings than as integers.
+        for stock_record, stock_record_id in zip(stock_records, (99, 100)):
+            StockRecord.objects.filter(id=stock_record.id).update(id=stock_record_id)
+        self.catalog.stock_records.add(99, 100)
+
+        catalog, created = get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=['99', '100'])
+        self.assertFalse(created)
+        self.assertEqual(catalog, self.catalog)
+
+    def test_get_or_create_catalog_with_invalid_stock_record(self):
+        """Verify an error is raised if a stock record does not exist."""
+        with self.assertRaises(StockRecord.DoesNotExist):
+            get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=[0])
+
 
 class CouponUtilsTests(CouponMixin, DiscoveryTestMixin, TestCase):
     def setUp(self):
@@ -180,3 +220,13 @@ class CouponCreationTests(CouponMixin, TestCase):
         coupon = self.create_custom_coupon(max_uses=max_uses_number)
         voucher = coupon.attr.coupon_vouchers.vouchers.first()
         self.assertEqual(voucher.offers.first().max_global_applications, max_uses_number)
+
+
+class CatalogVersionTests(TestCase):
+    def test_catalog_version(self):
+        """ Verify the catalog version is recorded when first requested, and changes when products are saved. """
+        version = get_catalog_version()
+        self.assertEqual(get_catalog_version(), version)
+
+        ProductFactory()
+        self.assertGreater(get_catalog_version(), version)
@@ -8,7 +8,9 @@ from django.db.utils import IntegrityError
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import get_cache_key, get_version, update_version
 from ecommerce.extensions.voucher.models import CouponVouchers
+from ecommerce.extensions.voucher.summary import update_coupon_summary
 from ecommerce.extensions.voucher.utils import create_vouchers
 
 Catalog = get_model('catalogue', 'Catalog')
@@ -125,6 +127,7 @@ def create_coupon_product(
         product=coupon_product
     )
 
+    update_coupon_summary(coupon_product)
     return coupon_product
 
 
@@ -176,16 +179,43 @@ def get_or_create_catalog(name, partner, stock_record_ids):
     """
     Returns the catalog which has the same name, partner and stock records.
     If there isn't one with that data, creates and returns a new one.
+
+    Catalogs are looked up by the indexed fingerprint of their stock records, rather than by comparing the stock
+    records of every catalog. Catalogs created before fingerprints were introduced must be backfilled with the
+    backfill_catalog_fingerprints management command to be found.
     """
-    catalogs = Catalog.objects.all()
-    stock_records = [StockRecord.objects.get(id=id) for id in stock_record_ids]  # pylint: disable=redefined-builtin
+    stock_record_ids = set(stock_record_ids)
+    stock_records = list(StockRecord.objects.filter(id__in=stock_record_ids))
+    if len(stock_records) != len(stock_record_ids):
+        raise StockRecord.DoesNotExist(
+            'Stock records {} do not exist.'.format(sorted(stock_record_ids - {sr.id for sr in stock_records}))
+        )
 
-    for catalog in catalogs:
-        if catalog.name == name and catalog.partner == partner:
-            if set(catalog.stock_records.all()) == set(stock_records):
-                return catalog, False
+    # The IDs given may be strings, which do not sort like the IDs the fingerprints of catalogs are computed from.
+    fingerprint = Catalog.get_stock_records_fingerprint([sr.id for sr in stock_records])
+    catalog = Catalog.objects.filter(
+        name=name, partner=partner, stock_records_fingerprint=fingerprint
+    ).order_by('id').first()
+    if catalog:
+        return catalog, False
 
     catalog = Catalog.objects.create(name=name, partner=partner)
-    for stock_record in stock_records:
-        catalog.stock_records.add(stock_record)
+    catalog.stock_records.add(*stock_records)
     return catalog, True
+
+
+def _catalog_version_cache_key():
+    return get_cache_key(resource='catalog_version')
+
+
+def get_catalog_version():
+    """ Returns the time at which the catalog last changed, as a POSIX timestamp.
+
+    The time is recorded when products, stock records, courses, catalogs or partners are saved or deleted.
+    """
+    return get_version(_catalog_version_cache_key(), settings.CATALOG_VERSION_CACHE_TIMEOUT)
+
+
+def update_catalog_version():
+    """ Record that the catalog changed. """
+    update_version(_catalog_version_cache_key(), settings.CATALOG_VERSION_CACHE_TIMEOUT)
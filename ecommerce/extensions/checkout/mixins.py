@@ -11,12 +11,14 @@ from oscar.apps.checkout.mixins import OrderPlacementMixin
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.models import BusinessClient
-from ecommerce.extensions.analytics.utils import audit_log, track_segment_event
+from ecommerce.extensions.analytics.utils import audit_log, track_segment_events
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.basket.utils import ORGANIZATION_ATTRIBUTE_TYPE
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.customer.utils import Dispatcher
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
 from ecommerce.extensions.order.constants import PaymentEventTypeName
+from ecommerce.extensions.payment.utils import get_payment_type
 from ecommerce.invoice.models import Invoice
 
 CommunicationEventType = get_model('customer', 'CommunicationEventType')
@@ -27,6 +29,7 @@ BasketAttributeType = get_model('basket', 'BasketAttributeType')
 Order = get_model('order', 'Order')
 post_checkout = get_class('checkout.signals', 'post_checkout')
 PaymentEvent = get_model('order', 'PaymentEvent')
+PaymentEventQuantity = get_model('order', 'PaymentEventQuantity')
 PaymentEventType = get_model('order', 'PaymentEventType')
 Source = get_model('payment', 'Source')
 SourceType = get_model('payment', 'SourceType')
@@ -60,24 +63,29 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
         handled_processor_response = self.payment_processor.handle_processor_response(response, basket=basket)
         self.record_payment(basket, handled_processor_response)
 
-    def emit_checkout_step_events(self, basket, handled_processor_response, payment_processor):
-        """ Emit events necessary to track the user in the checkout funnel. """
+    def emit_checkout_step_events(self, basket, handled_processor_response, payment_processor, extra_events=None):
+        """ Emit events necessary to track the user in the checkout funnel.
 
-        properties = {
-            'checkout_id': basket.order_number,
-            'step': 1,
-            'payment_method': '{} | {}'.format(handled_processor_response.card_type, payment_processor.NAME)
-        }
-        track_segment_event(basket.site, basket.owner, 'Checkout Step Completed', properties)
-
-        properties['step'] = 2
-        track_segment_event(basket.site, basket.owner, 'Checkout Step Viewed', properties)
-        track_segment_event(basket.site, basket.owner, 'Checkout Step Completed', properties)
+        Any extra_events, given as (event, properties) pairs, are sent in the same batch as the step events.
+        """
+        payment_method = '{} | {}'.format(handled_processor_response.card_type, payment_processor.NAME)
+        step_1 = {'checkout_id': basket.order_number, 'step': 1, 'payment_method': payment_method}
+        step_2 = dict(step_1, step=2)
+        events = [
+            ('Checkout Step Completed', step_1),
+            ('Checkout Step Viewed', step_2),
+            ('Checkout Step Completed', step_2),
+        ]
+        events.extend(extra_events or [])
+        track_segment_events(basket.site, basket.owner, events)
 
     def record_payment(self, basket, handled_processor_response):
-        self.emit_checkout_step_events(basket, handled_processor_response, self.payment_processor)
-        track_segment_event(basket.site, basket.owner, 'Payment Info Entered', {'checkout_id': basket.order_number})
-        source_type, __ = SourceType.objects.get_or_create(name=self.payment_processor.NAME)
+        self.emit_checkout_step_events(
+            basket, handled_processor_response, self.payment_processor,
+            extra_events=[('Payment Info Entered', {'checkout_id': basket.order_number})]
+        )
+
+        source_type = get_payment_type(SourceType, self.payment_processor.NAME)
         total = handled_processor_response.total
         reference = handled_processor_response.transaction_id
         source = Source(
@@ -89,7 +97,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
             label=handled_processor_response.card_number,
             card_type=handled_processor_response.card_type
         )
-        event_type, __ = PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.PAID)
+        event_type = get_payment_type(PaymentEventType, PaymentEventTypeName.PAID)
         payment_event = PaymentEvent(event_type=event_type, amount=total, reference=reference,
                                      processor_name=self.payment_processor.NAME)
         self.add_payment_source(source)
@@ -104,6 +112,20 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
             user_id=basket.owner.id
         )
 
+    def save_payment_events(self, order):
+        """ Save the payment events recorded for the order, inserting the quantities of all their lines at once. """
+        if not self._payment_events:
+            return
+
+        lines = list(order.lines.all())
+        quantities = []
+        for event in self._payment_events:
+            event.order = order
+            event.save()
+            quantities.extend(PaymentEventQuantity(event=event, line=line, quantity=line.quantity) for line in lines)
+
+        PaymentEventQuantity.objects.bulk_create(quantities)
+
     def handle_order_placement(self,
                                order_number,
                                user,
@@ -121,25 +143,45 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
         Differs from the superclass' method by wrapping order placement
         and basket submission in a transaction. Should be used only in
         the context of an exception handler.
+
+        If an offer applied to the basket has since reached its maximum number of applications, the payments
+        recorded for the basket are refunded before OfferApplicationLimitReached is raised.
         """
-        with transaction.atomic():
-            order = self.place_order(
-                order_number=order_number,
-                user=user,
-                basket=basket,
-                shipping_address=shipping_address,
-                shipping_method=shipping_method,
-                shipping_charge=shipping_charge,
-                order_total=order_total,
-                billing_address=billing_address,
-                request=request,
-                **kwargs
+        try:
+            with transaction.atomic():
+                order = self.place_order(
+                    order_number=order_number,
+                    user=user,
+                    basket=basket,
+                    shipping_address=shipping_address,
+                    shipping_method=shipping_method,
+                    shipping_charge=shipping_charge,
+                    order_total=order_total,
+                    billing_address=billing_address,
+                    request=request,
+                    **kwargs
+                )
+
+                basket.submit()
+        except OfferApplicationLimitReached:
+            logger.warning(
+                'An offer applied to basket [%d] has reached its maximum number of applications.', basket.id
             )
-
-            basket.submit()
+            self.refund_payments(basket)
+            raise
 
         return self.handle_successful_order(order, request)
 
+    def refund_payments(self, basket):
+        """ Refund the payments recorded for a basket whose order could not be placed. """
+        for source in self._payment_sources or []:
+            try:
+                self.payment_processor.issue_credit(
+                    basket.order_number, basket, source.reference, source.amount_debited, source.currency
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to refund payment [%s] of basket [%d].', source.reference, basket.id)
+
     def handle_successful_order(self, order, request=None):  # pylint: disable=arguments-differ
         """Send a signal so that receivers can perform relevant tasks (e.g., fulfill the order)."""
         audit_log(
@@ -89,6 +89,21 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, PaymentEventsMixin,
         paid_type = PaymentEventType.objects.get(code='paid')
         self.assert_valid_payment_event_fields(mixin._payment_events[-1], total, paid_type, processor_name, reference)
 
+    def test_save_payment_events(self, __):
+        """ Verify the payment events are saved with the quantity of each line of the order. """
+        basket = create_basket(owner=self.user, site=self.site)
+
+        mixin = EdxOrderPlacementMixin()
+        mixin.payment_processor = DummyProcessor(self.site)
+        mixin.handle_payment({}, basket)
+        mixin.save_payment_events(self.order)
+
+        event = self.order.payment_events.get()
+        lines = self.order.lines.all()
+        self.assertEqual(event.line_quantities.count(), lines.count())
+        for line in lines:
+            self.assertEqual(event.line_quantities.get(line=line).quantity, line.quantity)
+
     def test_order_number_collision(self, _mock_track):
         """
         Verify that an attempt to create an order with the same number as an existing
@@ -358,7 +373,7 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, PaymentEventsMixin,
             'payment_method': 'Visa | ' + DummyProcessor.NAME,
         }
         calls.append(mock.call(user_tracking_id, 'Checkout Step Completed', properties, context=context))
-        properties['step'] = 2
+        properties = dict(properties, step=2)
         calls.append(mock.call(user_tracking_id, 'Checkout Step Viewed', properties, context=context))
         calls.append(mock.call(user_tracking_id, 'Checkout Step Completed', properties, context=context))
 
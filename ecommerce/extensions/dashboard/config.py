@@ -3,3 +3,9 @@ from oscar.apps.dashboard import config
 
 class DashboardConfig(config.DashboardConfig):
     name = 'ecommerce.extensions.dashboard'
+
+    def ready(self):
+        super(DashboardConfig, self).ready()
+
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.dashboard.signals  # pylint: disable=unused-variable
@@ -0,0 +1,41 @@
+"""
+Management command that recomputes the hourly statistics displayed on the dashboard.
+
+Run it once to backfill statistics for existing orders, and periodically to correct any drift in the counters
+maintained as orders are placed.
+"""
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.dashboard.rollups import compact_rollups, truncate_to_hour
+
+Voucher = get_model('voucher', 'Voucher')
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hourly dashboard statistics rollups from the order and user tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours',
+                            action='store',
+                            dest='hours',
+                            default=24,
+                            type=int,
+                            help='Number of completed hours, up to the current one, to recompute.')
+
+    def handle(self, *args, **options):
+        end = truncate_to_hour(now())
+        start = end - timedelta(hours=options['hours'])
+
+        current_time = now()
+        active_vouchers = Voucher.objects.filter(start_datetime__lte=current_time, end_datetime__gt=current_time)
+
+        count = compact_rollups(start, end, active_voucher_count=active_vouchers.count())
+        self.stderr.write('Wrote [{count}] rollups for [{start}] through [{end}].'.format(
+            count=count, start=start, end=end
+        ))
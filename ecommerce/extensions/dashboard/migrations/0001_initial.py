@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyStatsRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(db_index=True, verbose_name='Hour')),
+                ('order_count', models.PositiveIntegerField(default=0, verbose_name='Orders')),
+                ('paid_order_count', models.PositiveIntegerField(default=0, verbose_name='Paid orders')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Revenue')),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Paid revenue')),
+                ('new_customer_count', models.PositiveIntegerField(default=0, verbose_name='New customers')),
+                ('active_voucher_count', models.PositiveIntegerField(blank=True, help_text='Snapshot of the number of active vouchers, recorded when the hour is compacted.', null=True, verbose_name='Active vouchers')),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='sites.Site')),
+            ],
+            options={
+                'get_latest_by': 'hour',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='hourlystatsrollup',
+            unique_together=set([('site', 'hour')]),
+        ),
+    ]
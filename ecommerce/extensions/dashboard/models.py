@@ -1,2 +1,34 @@
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class HourlyStatsRollup(models.Model):
+    """
+    Counters summarizing store activity for a single site during a single hour.
+
+    Rows are incremented as orders are placed and users join (see ecommerce.extensions.dashboard.rollups), and can be
+    recomputed from the source tables with the compact_dashboard_stats management command. The dashboard reads these
+    rows instead of aggregating over the order table.
+    """
+    site = models.ForeignKey('sites.Site', null=True, blank=True, on_delete=models.CASCADE)
+    hour = models.DateTimeField(_('Hour'), db_index=True)
+    order_count = models.PositiveIntegerField(_('Orders'), default=0)
+    paid_order_count = models.PositiveIntegerField(_('Paid orders'), default=0)
+    revenue = models.DecimalField(_('Revenue'), max_digits=12, decimal_places=2, default=0)
+    paid_revenue = models.DecimalField(_('Paid revenue'), max_digits=12, decimal_places=2, default=0)
+    new_customer_count = models.PositiveIntegerField(_('New customers'), default=0)
+    active_voucher_count = models.PositiveIntegerField(
+        _('Active vouchers'), null=True, blank=True,
+        help_text=_('Snapshot of the number of active vouchers, recorded when the hour is compacted.')
+    )
+
+    class Meta(object):
+        unique_together = ('site', 'hour',)
+        get_latest_by = 'hour'
+
+    def __unicode__(self):
+        return '{site}: {hour}'.format(site=self.site_id, hour=self.hour)
+
+
 # noinspection PyUnresolvedReferences
-from oscar.apps.dashboard.models import *  # pragma: no cover noqa pylint: disable=wildcard-import,unused-wildcard-import
+from oscar.apps.dashboard.models import *  # noqa isort:skip pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order,ungrouped-imports
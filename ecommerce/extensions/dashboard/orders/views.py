@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.db.models import Prefetch
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
@@ -6,8 +7,10 @@ from oscar.apps.dashboard.orders.views import OrderDetailView as CoreOrderDetail
 from oscar.apps.dashboard.orders.views import OrderListView as CoreOrderListView
 from oscar.core.loading import get_model
 
+from ecommerce.extensions.dashboard.pagination import KeysetPaginationMixin
 from ecommerce.extensions.dashboard.views import FilterFieldsMixin
 
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 Partner = get_model('partner', 'Partner')
 Refund = get_model('refund', 'Refund')
@@ -26,9 +29,16 @@ def queryset_orders_for_user(user):  # pylint: disable=unused-argument
     return Order._default_manager.select_related('user').prefetch_related('lines')  # pylint: disable=protected-access
 
 
-class OrderListView(FilterFieldsMixin, CoreOrderListView):
+class OrderListView(KeysetPaginationMixin, FilterFieldsMixin, CoreOrderListView):
     base_queryset = None
     form = None
+    keyset_ordering = ('-date_placed', '-id',)
+
+    # Columns rendered by the order list template. Other columns are only loaded when downloading orders as CSV.
+    list_fields = (
+        'id', 'number', 'currency', 'total_incl_tax', 'status', 'date_placed',
+        'user__id', 'user__username', 'user__email',
+    )
 
     def dispatch(self, request, *args, **kwargs):
         # NOTE: This method is overridden so that we can use our override of `queryset_orders_for_user`.
@@ -53,6 +63,12 @@ class OrderListView(FilterFieldsMixin, CoreOrderListView):
                     if _filter:
                         queryset = queryset.filter(**{_filter['query_filter']: value})
 
+        if self.request.GET.get('response_format', 'html') == 'html':
+            # Order.num_items only needs the quantity of each line.
+            queryset = queryset.only(*self.list_fields).prefetch_related(None).prefetch_related(
+                Prefetch('lines', queryset=Line.objects.only('id', 'order', 'quantity'))
+            )
+
         return queryset
 
 
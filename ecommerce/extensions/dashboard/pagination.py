@@ -0,0 +1,214 @@
+"""
+Pagination for dashboard list views over large tables.
+
+Django's Paginator issues an exact COUNT(*) over the filtered queryset and an OFFSET query for every page, both of
+which get slower as the order and refund tables grow. KeysetPaginationMixin instead seeks to the rows following
+(or preceding) the boundary row of the current page, using an indexed, unique ordering, and never counts. When a
+list is sorted by another column, views fall back to offset pagination with a bounded count.
+"""
+from __future__ import unicode_literals
+
+import base64
+import json
+
+from django.core.paginator import Paginator
+from django.db import models
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that stops counting after max_count rows.
+
+    Result sets larger than max_count are reported as having max_count rows, so pages past that point are not
+    reachable with offset pagination; such lists should be narrowed down with filters instead.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        try:
+            count = self.object_list[:self.max_count + 1].count()
+        except (AttributeError, TypeError):
+            count = len(self.object_list)
+
+        return min(count, self.max_count)
+
+    @property
+    def count_is_estimated(self):
+        return self.count >= self.max_count
+
+
+class KeysetPaginator(object):
+    """ Minimal paginator used to expose the page size to templates in keyset mode. """
+    def __init__(self, per_page):
+        self.per_page = per_page
+
+
+class KeysetPage(object):
+    """ A page of results retrieved by seeking past a cursor. """
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _field_name(ordering_field):
+    return ordering_field.lstrip('-')
+
+
+def encode_cursor(direction, values):
+    """ Encode the direction and boundary values of a page into an opaque, URL-safe cursor. """
+    payload = json.dumps([direction] + [value.isoformat() if hasattr(value, 'isoformat') else value
+                                        for value in values])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, model, ordering):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Returns:
+        tuple: direction and list of boundary values, converted to the types of the ordering fields.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (TypeError, UnicodeError, ValueError) as exc:
+        raise ValueError('Invalid cursor: {}'.format(exc))
+
+    if not isinstance(payload, list) or len(payload) != len(ordering) + 1 or payload[0] not in (NEXT, PREVIOUS):
+        raise ValueError('Invalid cursor.')
+
+    direction, values = payload[0], payload[1:]
+    converted = []
+    for ordering_field, value in zip(ordering, values):
+        field = model._meta.get_field(_field_name(ordering_field))  # pylint: disable=protected-access
+        if isinstance(field, models.DateTimeField):
+            value = parse_datetime(value) if value else None
+            if value is None:
+                raise ValueError('Invalid cursor.')
+        else:
+            value = field.to_python(value)
+        converted.append(value)
+
+    return direction, converted
+
+
+def seek_filter(ordering, values, reverse=False):
+    """
+    Build a filter selecting the rows that follow the given boundary values in the given ordering.
+
+    For an ordering of ('-date_placed', '-id') this is equivalent to the row comparison
+    (date_placed, id) < (value_1, value_2), expanded into conditions that can use a composite index.
+
+    Args:
+        ordering (tuple): ordering fields, the last of which must be unique.
+        values (list): values of the ordering fields for the boundary row.
+        reverse (bool): select the rows preceding the boundary row instead.
+
+    Returns:
+        Q
+    """
+    condition = Q()
+    for index, ordering_field in enumerate(ordering):
+        descending = ordering_field.startswith('-') != reverse
+        lookup = '{field}__{operator}'.format(field=_field_name(ordering_field), operator='lt' if descending else 'gt')
+
+        clause = Q(**{lookup: values[index]})
+        for previous_field, previous_value in zip(ordering[:index], values[:index]):
+            clause &= Q(**{_field_name(previous_field): previous_value})
+
+        condition |= clause
+
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [_field_name(field) if field.startswith('-') else '-' + field for field in ordering]
+
+
+class KeysetPaginationMixin(object):
+    """
+    ListView mixin that paginates with keyset pagination unless the user has chosen a different sort order.
+
+    Views must set keyset_ordering to an ordering whose last field is unique (typically the primary key), and whose
+    leading fields are indexed.
+    """
+    keyset_ordering = ('-id',)
+    cursor_param = 'cursor'
+    paginator_class = EstimatedCountPaginator
+
+    def use_keyset_pagination(self):
+        return not self.request.GET.get('sort')
+
+    def get_keyset_values(self, obj):
+        return [getattr(obj, _field_name(field)) for field in self.keyset_ordering]
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super(KeysetPaginationMixin, self).paginate_queryset(queryset, page_size)
+
+        ordering = list(self.keyset_ordering)
+        cursor = self.request.GET.get(self.cursor_param)
+        direction = NEXT
+
+        if cursor:
+            try:
+                direction, values = decode_cursor(cursor, queryset.model, ordering)
+            except ValueError:
+                raise Http404('Invalid page.')
+
+            queryset = queryset.filter(seek_filter(ordering, values, reverse=direction == PREVIOUS))
+
+        if direction == PREVIOUS:
+            queryset = queryset.order_by(*_reverse_ordering(ordering))
+        else:
+            queryset = queryset.order_by(*ordering)
+
+        # Fetch one extra row to find out whether there is another page in the direction of travel.
+        object_list = list(queryset[:page_size + 1])
+        has_more = len(object_list) > page_size
+        object_list = object_list[:page_size]
+
+        if direction == PREVIOUS:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+
+        next_cursor = previous_cursor = None
+        if object_list:
+            if has_next:
+                next_cursor = encode_cursor(NEXT, self.get_keyset_values(object_list[-1]))
+            if has_previous:
+                previous_cursor = encode_cursor(PREVIOUS, self.get_keyset_values(object_list[0]))
+
+        page = KeysetPage(object_list, KeysetPaginator(page_size), next_cursor, previous_cursor)
+        return page.paginator, page, page.object_list, page.has_other_pages()
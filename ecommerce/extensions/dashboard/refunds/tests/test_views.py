@@ -1,5 +1,7 @@
 from django.urls import reverse
+from mock import patch
 
+from ecommerce.extensions.dashboard.refunds.views import RefundListView
 from ecommerce.extensions.refund.status import REFUND
 from ecommerce.extensions.refund.tests.factories import RefundFactory
 from ecommerce.tests.testcases import TestCase
@@ -103,6 +105,35 @@ class RefundListViewTests(RefundViewTestMixin, TestCase):
         response = self.client.get('{path}?sort=id&dir=desc'.format(path=self.path))
         self.assert_successful_response(response, list(reversed(refunds)))
 
+    def test_keyset_pagination(self):
+        """ The view should paginate through refunds with cursors when no sort order is given. """
+        refunds = [RefundFactory() for __ in range(5)]
+        self.client.login(username=self.user.username, password=self.password)
+
+        with patch.object(RefundListView, 'paginate_by', 2):
+            response = self.client.get(self.path)
+            self.assert_successful_response(response, refunds[:2])
+            page = response.context['page_obj']
+            self.assertFalse(page.has_previous())
+
+            response = self.client.get(self.path, {'cursor': page.next_cursor})
+            self.assert_successful_response(response, refunds[2:4])
+            page = response.context['page_obj']
+
+            response = self.client.get(self.path, {'cursor': page.next_cursor})
+            self.assert_successful_response(response, refunds[4:])
+            last_page = response.context['page_obj']
+            self.assertFalse(last_page.has_next())
+
+            response = self.client.get(self.path, {'cursor': last_page.previous_cursor})
+            self.assert_successful_response(response, refunds[2:4])
+
+    def test_invalid_cursor(self):
+        """ The view should return a 404 for malformed cursors. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(self.path, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
 
 class RefundDetailViewTests(RefundViewTestMixin, TestCase):
     def setUp(self):
@@ -1,14 +1,17 @@
+from django.db.models import Prefetch
 from django.views.generic import DetailView, ListView
 from oscar.core.loading import get_class, get_model
 from oscar.views import sort_queryset
 
+from ecommerce.extensions.dashboard.pagination import KeysetPaginationMixin
 from ecommerce.extensions.dashboard.views import FilterFieldsMixin
 
 Refund = get_model('refund', 'Refund')
+RefundLine = get_model('refund', 'RefundLine')
 RefundSearchForm = get_class('dashboard.refunds.forms', 'RefundSearchForm')
 
 
-class RefundListView(FilterFieldsMixin, ListView):
+class RefundListView(KeysetPaginationMixin, FilterFieldsMixin, ListView):
     """ Dashboard view to list refunds. """
     model = Refund
     context_object_name = 'refunds'
@@ -16,6 +19,13 @@ class RefundListView(FilterFieldsMixin, ListView):
     paginate_by = 25
     form_class = RefundSearchForm
     form = None
+    keyset_ordering = ('id',)
+
+    # Columns rendered by the refund list template.
+    list_fields = (
+        'id', 'total_credit_excl_tax', 'currency', 'status', 'created',
+        'user__id', 'user__username', 'user__email',
+    )
 
     def get_filter_fields(self):
         fields = super(RefundListView, self).get_filter_fields()
@@ -29,7 +39,10 @@ class RefundListView(FilterFieldsMixin, ListView):
 
     def get_queryset(self):
         queryset = super(RefundListView, self).get_queryset()
-        queryset = queryset.prefetch_related('lines')
+        queryset = queryset.select_related('user').only(*self.list_fields).prefetch_related(
+            # Refund.num_items only needs the quantity of each line.
+            Prefetch('lines', queryset=RefundLine.objects.only('id', 'refund', 'quantity'))
+        )
         queryset = sort_queryset(queryset, self.request, ['id', 'created'], 'id')
 
         self.form = self.form_class(self.request.GET)
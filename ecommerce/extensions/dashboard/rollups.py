@@ -0,0 +1,219 @@
+"""
+Incrementally maintained statistics for the store dashboard.
+
+Aggregating over the order table on every dashboard request gets slower as order volume grows. Instead, each
+placed order and each new user increments the counters of the HourlyStatsRollup row for its site and hour, once
+it is committed, and readers sum at most a day's worth of these rows. Activity without a site, such as new users,
+is counted by the rows of the default site, as the unique constraint on site and hour does not prevent concurrent
+increments from creating several rows without a site for the same hour. The compact_dashboard_stats management
+command recomputes the rows of completed hours from the source tables; it is used to backfill existing data and
+to correct any drift.
+"""
+from __future__ import unicode_literals
+
+from datetime import timedelta
+from decimal import Decimal as D
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.dashboard.models import HourlyStatsRollup
+
+Order = get_model('order', 'Order')
+User = get_user_model()
+
+
+def truncate_to_hour(value):
+    """ Return the given datetime truncated to the start of its hour. """
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def get_rollup_site_id(site_id):
+    """ Return the ID of the site whose rollups count activity of the given site, or without a site if None. """
+    return site_id or settings.DEFAULT_SITE_ID
+
+
+def increment_rollup(site, hour, **increments):
+    """
+    Atomically add the given increments to the counters of the rollup for the given site and hour.
+
+    Args:
+        site (Site): site the activity belongs to, or None.
+        hour (datetime): any time within the hour the activity took place.
+        **increments: amounts to add, keyed by counter field name.
+    """
+    site_id = get_rollup_site_id(site.id if site else None)
+    hour = truncate_to_hour(hour)
+    updates = {field: F(field) + value for field, value in increments.items()}
+    queryset = HourlyStatsRollup.objects.filter(site_id=site_id, hour=hour)
+
+    if queryset.update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            HourlyStatsRollup.objects.create(site_id=site_id, hour=hour, **increments)
+    except IntegrityError:
+        # Another process created the row after our update; add our increments to it instead.
+        queryset.update(**updates)
+
+
+def record_order(order):
+    """ Add the given order to the rollup for the hour in which it was placed. """
+    total = order.total_incl_tax or D('0.00')
+    paid = total > 0
+    increment_rollup(
+        order.site,
+        order.date_placed or now(),
+        order_count=1,
+        paid_order_count=1 if paid else 0,
+        revenue=total,
+        paid_revenue=total if paid else D('0.00'),
+    )
+
+
+def record_new_customer(user):
+    """ Add the given user to the rollup for the hour in which they joined. """
+    increment_rollup(None, user.date_joined or now(), new_customer_count=1)
+
+
+def compact_rollups(start, end, active_voucher_count=None):
+    """
+    Recompute the rollups for every completed hour in [start, end) from the order and user tables.
+
+    The current hour is never recomputed, as increments committed between its recount and the replacement of its
+    rollups would be lost.
+
+    Args:
+        start (datetime): beginning of the period to recompute.
+        end (datetime): end of the period to recompute.
+        active_voucher_count (int): if given, recorded as a snapshot on the rollup for the last hour of the period.
+
+    Returns:
+        int: number of rollup rows written.
+    """
+    start = truncate_to_hour(start)
+    end = min(truncate_to_hour(end), truncate_to_hour(now()))
+    if end <= start:
+        return 0
+
+    rollups = {}
+
+    def get_rollup(site_id, hour):
+        key = (get_rollup_site_id(site_id), truncate_to_hour(hour))
+        if key not in rollups:
+            rollups[key] = HourlyStatsRollup(site_id=key[0], hour=key[1])
+        return rollups[key]
+
+    orders = Order.objects.filter(date_placed__gte=start, date_placed__lt=end)
+    for site_id, date_placed, total in orders.values_list('site_id', 'date_placed', 'total_incl_tax').iterator():
+        rollup = get_rollup(site_id, date_placed)
+        total = total or D('0.00')
+        rollup.order_count += 1
+        rollup.revenue += total
+        if total > 0:
+            rollup.paid_order_count += 1
+            rollup.paid_revenue += total
+
+    users = User.objects.filter(date_joined__gte=start, date_joined__lt=end)
+    for date_joined in users.values_list('date_joined', flat=True).iterator():
+        get_rollup(None, date_joined).new_customer_count += 1
+
+    if active_voucher_count is not None:
+        get_rollup(None, end - timedelta(hours=1)).active_voucher_count = active_voucher_count
+
+    with transaction.atomic():
+        HourlyStatsRollup.objects.filter(hour__gte=start, hour__lt=end).delete()
+        HourlyStatsRollup.objects.bulk_create(rollups.values())
+
+    return len(rollups)
+
+
+def get_rollups(hours=24, site=None):
+    """
+    Return the rollups for the last given number of hours, including the current one.
+
+    Args:
+        hours (int): number of hours to include.
+        site (Site): if given, only include rollups for this site.
+
+    Returns:
+        QuerySet
+    """
+    start = truncate_to_hour(now()) - timedelta(hours=hours - 1)
+    queryset = HourlyStatsRollup.objects.filter(hour__gte=start)
+    if site:
+        queryset = queryset.filter(site=site)
+    return queryset
+
+
+def get_rollup_stats(hours=24, site=None):
+    """
+    Summarize the rollups for the last given number of hours.
+
+    Args:
+        hours (int): number of hours to include.
+        site (Site): if given, only include activity for this site, and for the default site activity without a
+            site. New customers and active vouchers are not associated with a site, and are always included.
+
+    Returns:
+        dict: totals and averages keyed by the names used by the dashboard index template. active_vouchers is
+            None if no snapshot has been recorded during the period.
+    """
+    rollups = get_rollups(hours=hours)
+    site_rollups = rollups.filter(site=site) if site else rollups
+
+    totals = site_rollups.aggregate(
+        orders=Sum('order_count'),
+        paid_orders=Sum('paid_order_count'),
+        revenue=Sum('revenue'),
+        paid_revenue=Sum('paid_revenue'),
+    )
+    new_customers = rollups.aggregate(count=Sum('new_customer_count'))['count'] or 0
+    snapshot = rollups.filter(active_voucher_count__isnull=False).order_by('-hour').first()
+
+    total_orders = totals['orders'] or 0
+    paid_orders = totals['paid_orders'] or 0
+    revenue = totals['revenue'] or D('0.00')
+    paid_revenue = totals['paid_revenue'] or D('0.00')
+
+    return {
+        'total_orders_last_day': total_orders,
+        'average_order_costs': revenue / total_orders if total_orders else D('0.00'),
+        'average_paid_order_costs': paid_revenue / paid_orders if paid_orders else D('0.00'),
+        'total_revenue_last_day': revenue,
+        'total_customers_last_day': new_customers,
+        'active_vouchers': snapshot.active_voucher_count if snapshot else None,
+    }
+
+
+def get_hourly_revenue(hours=24, interval=2, site=None):
+    """
+    Return the revenue for the last given number of hours, split up into intervals.
+
+    Returns:
+        list: dicts with the end_time and total_incl_tax of each interval, oldest first.
+    """
+    start_time = truncate_to_hour(now()) - timedelta(hours=hours - 1)
+    revenue_by_hour = dict(
+        get_rollups(hours=hours, site=site).values('hour').annotate(total=Sum('revenue')).values_list('hour', 'total')
+    )
+
+    order_total_hourly = []
+    for __ in range(0, hours, interval):
+        end_time = start_time + timedelta(hours=interval)
+        total = sum(
+            (revenue_by_hour.get(start_time + timedelta(hours=offset), D('0.00')) for offset in range(interval)),
+            D('0.00')
+        )
+        order_total_hourly.append({
+            'end_time': end_time,
+            'total_incl_tax': total,
+        })
+        start_time = end_time
+
+    return order_total_hourly
@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.analytics.utils import silence_exceptions
+from ecommerce.extensions.dashboard.rollups import record_new_customer, record_order
+
+Order = get_model('order', 'Order')
+User = get_user_model()
+
+
+# Rollups are incremented once the transaction creating the order or user is committed, so that the shared rollup
+# row for the hour is not locked for the rest of the request.
+_record_order = silence_exceptions('Failed to update dashboard statistics for new order.')(record_order)
+_record_new_customer = silence_exceptions('Failed to update dashboard statistics for new user.')(record_new_customer)
+
+
+@receiver(post_save, sender=Order, dispatch_uid='dashboard.rollups.record_order')
+def update_rollups_for_order(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Count newly-placed orders in the dashboard statistics. """
+    if created and not raw:
+        transaction.on_commit(lambda: _record_order(instance))
+
+
+@receiver(post_save, sender=User, dispatch_uid='dashboard.rollups.record_new_customer')
+def update_rollups_for_user(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Count newly-registered users in the dashboard statistics. """
+    if created and not raw:
+        transaction.on_commit(lambda: _record_new_customer(instance))
@@ -1,8 +1,26 @@
+from datetime import timedelta
+from decimal import Decimal as D
+from StringIO import StringIO
+
+import mock
+from django.core.management import call_command
+from django.db.models import QuerySet
 from django.urls import reverse
+from django.utils.timezone import now
+from oscar.core.loading import get_model
 from oscar.test.factories import OrderFactory, UserFactory
 
+from ecommerce.extensions.dashboard.models import HourlyStatsRollup
+from ecommerce.extensions.dashboard.rollups import (
+    compact_rollups,
+    get_rollup_stats,
+    record_new_customer,
+    truncate_to_hour
+)
 from ecommerce.tests.testcases import TestCase
 
+Order = get_model('order', 'Order')
+
 
 class DashboardViewTestMixin(object):
     def assert_message_equals(self, response, msg, level):  # pylint: disable=unused-argument
@@ -30,3 +48,78 @@ class ExtendedIndexViewTests(TestCase):
         order = OrderFactory()
         actual = response.context['average_paid_order_costs']
         self.assertEqual(actual, order.total_incl_tax)
+
+
+class HourlyStatsRollupTests(TestCase):
+    def setUp(self):
+        super(HourlyStatsRollupTests, self).setUp()
+        # Rollups are incremented once the transaction, which tests never commit, is committed.
+        patcher = mock.patch('django.db.transaction.on_commit', side_effect=lambda func: func())
+        self.mock_on_commit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_orders_update_rollups(self):
+        """ Verify placing orders increments the rollup counters for the hour in which they are placed. """
+        paid_order = OrderFactory(total_incl_tax=D('100.00'), total_excl_tax=D('100.00'))
+        OrderFactory(total_incl_tax=D('0.00'), total_excl_tax=D('0.00'), site=paid_order.site)
+
+        stats = get_rollup_stats(hours=24)
+        self.assertEqual(stats['total_orders_last_day'], 2)
+        self.assertEqual(stats['total_revenue_last_day'], D('100.00'))
+        self.assertEqual(stats['average_order_costs'], D('50.00'))
+        self.assertEqual(stats['average_paid_order_costs'], D('100.00'))
+
+    def test_new_users_update_rollups(self):
+        """ Verify creating users increments the new customer counter. """
+        expected = get_rollup_stats(hours=24)['total_customers_last_day'] + 2
+        UserFactory()
+        UserFactory()
+        self.assertEqual(get_rollup_stats(hours=24)['total_customers_last_day'], expected)
+
+    def test_concurrent_new_users(self):
+        """ Verify new users counted concurrently, before the rollup for their hour exists, share one rollup. """
+        user = UserFactory()
+        update = QuerySet.update
+        updates = []
+
+        def update_after_other_process(queryset, **kwargs):
+            updates.append(kwargs)
+            if len(updates) == 1:
+                # The rollup did not exist yet when this process tried to increment it.
+                return 0
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=update_after_other_process):
+            record_new_customer(user)
+
+        rollups = HourlyStatsRollup.objects.filter(hour=truncate_to_hour(user.date_joined))
+        self.assertEqual([rollup.new_customer_count for rollup in rollups], [2])
+
+    def test_rollups_updated_on_commit(self):
+        """ Verify the rollups are only incremented once the transaction placing the order is committed. """
+        self.mock_on_commit.side_effect = None
+        OrderFactory()
+        self.assertTrue(self.mock_on_commit.called)
+        self.assertEqual(get_rollup_stats(hours=24)['total_orders_last_day'], 0)
+
+    def test_compact_dashboard_stats(self):
+        """ Verify the command recomputes the rollups of completed hours from the order table. """
+        order = OrderFactory(total_incl_tax=D('25.00'), total_excl_tax=D('25.00'))
+        Order.objects.filter(pk=order.pk).update(date_placed=now() - timedelta(hours=1))
+        HourlyStatsRollup.objects.all().delete()
+        self.assertEqual(get_rollup_stats(hours=24)['total_orders_last_day'], 0)
+
+        call_command('compact_dashboard_stats', hours=2, stderr=StringIO())
+
+        stats = get_rollup_stats(hours=24)
+        self.assertEqual(stats['total_orders_last_day'], 1)
+        self.assertEqual(stats['total_revenue_last_day'], order.total_incl_tax)
+        self.assertIsNotNone(stats['active_vouchers'])
+
+    def test_compact_rollups_skips_current_hour(self):
+        """ Verify the rollups of the current hour, which are still being incremented, are not recomputed. """
+        OrderFactory(total_incl_tax=D('25.00'), total_excl_tax=D('25.00'))
+        current_hour = truncate_to_hour(now())
+
+        self.assertEqual(compact_rollups(current_hour, current_hour + timedelta(hours=1)), 0)
+        self.assertEqual(get_rollup_stats(hours=24)['total_orders_last_day'], 1)
@@ -70,7 +70,7 @@ class UserDetailViewTests(DashboardViewTestMixin, TestCase):
                      'Failed to retrieve enrollments for [{}]. Enrollment API returned status code [{}].'.format(
                          self.user.username, api_status)))
 
-    @mock.patch('requests.get', mock.Mock(side_effect=Timeout))
+    @mock.patch('requests.Session.get', mock.Mock(side_effect=Timeout))
     def test_enrollments_exception(self):
         """Verify a message is logged, and a separate message displayed to the user,
         if an exception is raised while retrieving enrollments."""
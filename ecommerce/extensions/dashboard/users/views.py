@@ -1,13 +1,11 @@
 import logging
 
-import requests
 import waffle
-from django.conf import settings
 from django.contrib import messages
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.dashboard.users.views import UserDetailView as CoreUserDetailView
 
-from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.extensions.fulfillment.gateway import get_enrollment_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +23,7 @@ class UserDetailView(CoreUserDetailView):
         """Retrieve the enrollments for the User being viewed."""
         username = self.object.username
         try:
-            url = '{}?user={}'.format(get_lms_enrollment_api_url(), username)
-            timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
-
-            headers = {
-                'Content-Type': 'application/json',
-                'X-Edx-Api-Key': settings.EDX_API_KEY
-            }
-
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = get_enrollment_gateway().get_enrollments(username)
 
             status_code = response.status_code
             if status_code == 200:
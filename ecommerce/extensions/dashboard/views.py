@@ -1,48 +1,61 @@
 from oscar.apps.dashboard.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
+from ecommerce.extensions.dashboard.rollups import get_hourly_revenue, get_rollup_stats
+
 
 class ExtendedIndexView(IndexView):
     def get_stats(self):
         """
         Statistics for the store dashboard.
 
-        To limit the impact this page can have on systems with millions of orders,
-        all queries against orders are limited to those placed in the last 24 hours;
-        Order's date_placed field is indexed for more efficient queries.
+        To limit the impact this page can have on systems with millions of orders, statistics are read from the
+        hourly rollups maintained as orders are placed (see ecommerce.extensions.dashboard.rollups), covering the
+        last 24 hours, rather than aggregated from the order table.
         """
-        datetime_24hrs_ago = now() - timedelta(hours=24)
-
-        orders = Order.objects.filter()
-        orders_last_day = orders.filter(date_placed__gt=datetime_24hrs_ago)
-        paid_orders_last_day = orders.filter(date_placed__gt=datetime_24hrs_ago, total_incl_tax__gt=0)
-
-        stats = {
-            'total_orders_last_day': orders_last_day.count(),
-
-            'average_order_costs': orders_last_day.aggregate(
-                Avg('total_incl_tax')
-            )['total_incl_tax__avg'] or D('0.00'),
+        stats = get_rollup_stats(hours=24)
+        active_vouchers = stats.pop('active_vouchers')
 
-            'average_paid_order_costs': paid_orders_last_day.aggregate(
-                Avg('total_incl_tax')
-            )['total_incl_tax__avg'] or D('0.00'),
+        stats.update({
+            'hourly_report_dict': self.get_hourly_report(hours=24),
+            'total_products': Product.objects.count(),
+            'total_vouchers': self.get_active_vouchers().count() if active_vouchers is None else active_vouchers,
+        })
 
-            'total_revenue_last_day': orders_last_day.aggregate(
-                Sum('total_incl_tax')
-            )['total_incl_tax__sum'] or D('0.00'),
+        return stats
 
-            'hourly_report_dict': self.get_hourly_report(hours=24),
-            'total_customers_last_day': User.objects.filter(
-                date_joined__gt=datetime_24hrs_ago,
-            ).count(),
+    def get_hourly_report(self, hours=24, segments=10):
+        """
+        Report of order revenue split up in two-hour chunks, read from the hourly rollups.
 
-            'total_products': Product.objects.count(),
+        The returned dict has the same structure as the report generated by Oscar's IndexView.
+        """
+        order_total_hourly = get_hourly_revenue(hours=hours, interval=2)
+
+        max_value = max([item['total_incl_tax'] for item in order_total_hourly])
+        divisor = 1
+        while divisor < max_value / 50:
+            divisor *= 10
+        max_value = (max_value / divisor).quantize(D('1')) * divisor
+
+        y_range = []
+        if max_value:
+            segment_size = max_value / D('100.0')
+            for item in order_total_hourly:
+                item['percentage'] = int(item['total_incl_tax'] / segment_size)
+
+            y_axis_steps = max_value / D(str(segments))
+            for idx in reversed(range(segments + 1)):
+                y_range.append(idx * y_axis_steps)
+        else:
+            for item in order_total_hourly:
+                item['percentage'] = 0
 
-            'total_vouchers': self.get_active_vouchers().count(),
+        return {
+            'order_total_hourly': order_total_hourly,
+            'max_revenue': max_value,
+            'y_range': y_range,
         }
 
-        return stats
-
 
 class FilterFieldsMixin(object):
     def get_filter_fields(self):
@@ -14,6 +14,7 @@ from django.utils.timezone import now
 from ecommerce.extensions.fulfillment import exceptions
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.refund.status import REFUND_LINE
+from ecommerce.programs.ownership import invalidate_ownership_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,8 @@ def fulfill_order(order, lines):
                 break
 
         order.set_status(order_status)
+        # The enrollments and entitlements of the user may have changed.
+        invalidate_ownership_snapshot(order.site, order.user)
 
         elapsed = now() - order.date_placed
         logger.info(
@@ -130,17 +133,23 @@ def revoke_fulfillment_for_refund(refund):
         for refund_line in refund.lines.all():
             refund_line.set_status(REFUND_LINE.COMPLETE)
     else:
-        # TODO (CCB): As our list of product types and fulfillment modules grows, this may become slow,
-        # and should be updated. Runtime is O(n^2).
-        for refund_line in refund.lines.all():
-            order_line = refund_line.order_line
-            modules = get_fulfillment_modules_for_line(order_line)
+        # Each module revokes all of the lines it supports at once, so that, for example, every enrollment
+        # revoked by a refund is revoked with one batch of Enrollment API requests.
+        refund_lines = list(refund.lines.select_related('order_line__order__user', 'order_line__product'))
+        for module_class in get_fulfillment_modules():
+            module = module_class()
+            supported_lines = [line for line in refund_lines if module.supports_line(line.order_line)]
+            if not supported_lines:
+                continue
 
-            for module in modules:
-                if module().revoke_line(order_line):
+            revoked = module.revoke_lines([line.order_line for line in supported_lines])
+            for refund_line, line_revoked in zip(supported_lines, revoked):
+                if line_revoked:
                     refund_line.set_status(REFUND_LINE.COMPLETE)
                 else:
                     succeeded = False
                     refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
 
+        invalidate_ownership_snapshot(refund.order.site, refund.user)
+
     return succeeded
@@ -0,0 +1,170 @@
+"""
+Gateway to the LMS Enrollment API.
+
+Fulfilling an order enrolls its purchaser in the course run of each seat, and revoking a refund unenrolls them,
+with one Enrollment API request per line. The gateway sends a batch of these operations at once, over a pool of
+persistent connections to the LMS, and returns the result of each, so that every line of a bulk order or refund
+is handled in about the time taken by the slowest request, rather than the sum of all of them.
+
+The Enrollment API accepts a single enrollment per request, so operations are sent concurrently rather than in
+one bulk request.
+"""
+from __future__ import unicode_literals
+
+import json
+import sys
+import threading
+from importlib import import_module
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter  # pylint: disable=ungrouped-imports
+
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.core.utils import run_in_thread
+from ecommerce.extensions.analytics.utils import parse_tracking_context
+
+_gateways = {}
+_lock = threading.Lock()
+
+
+class EnrollmentOperation(object):
+    """
+    Enrollment, or unenrollment, of a user in a course run.
+
+    Arguments:
+        data (dict): Body of the Enrollment API request, with the 'user', 'is_active', 'mode' and 'course_details'
+            of the enrollment.
+        user (User): User on whose behalf the request is sent, whose tracking context is sent with it.
+    """
+
+    def __init__(self, data, user=None):
+        self.data = data
+        self.headers = {}
+
+        if user:
+            __, client_id, ip = parse_tracking_context(user)
+
+            if client_id:
+                self.headers['X-Edx-Ga-Client-Id'] = client_id
+
+            if ip:
+                self.headers['X-Forwarded-For'] = ip
+
+    @property
+    def course_id(self):
+        return self.data['course_details']['course_id']
+
+
+class EnrollmentResult(object):
+    """
+    Result of an enrollment operation.
+
+    Arguments:
+        operation (EnrollmentOperation): The operation.
+        status_code (int): Status code of the Enrollment API response, or None if no response was received.
+        message (str): Message included in the response, if any.
+        exc_info (tuple): Information about the exception raised while sending the operation, if any.
+    """
+
+    def __init__(self, operation, status_code=None, message=None, exc_info=None):
+        self.operation = operation
+        self.status_code = status_code
+        self.message = message
+        self.exc_info = exc_info
+
+    @property
+    def succeeded(self):
+        return self.status_code == 200
+
+    @property
+    def exception(self):
+        return self.exc_info[1] if self.exc_info else None
+
+
+class EnrollmentGateway(object):
+    """ Sends enrollment operations to the LMS, sharing a pool of connections between threads. """
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.ENROLLMENT_API_POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _get_headers(self, extra_headers=None):
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Edx-Api-Key': settings.EDX_API_KEY
+        }
+        headers.update(extra_headers or {})
+        return headers
+
+    def _post(self, url, operation):
+        try:
+            response = self.session.post(
+                url,
+                data=json.dumps(operation.data),
+                headers=self._get_headers(operation.headers),
+                timeout=settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+            )
+        except Exception:  # pylint: disable=broad-except
+            return EnrollmentResult(operation, exc_info=sys.exc_info())
+
+        try:
+            message = response.json().get('message')
+        except Exception:  # pylint: disable=broad-except
+            message = None
+
+        return EnrollmentResult(operation, response.status_code, message)
+
+    def send(self, operations):
+        """ Send a batch of operations, at most ENROLLMENT_API_POOL_SIZE at a time.
+
+        Arguments:
+            operations (list of EnrollmentOperation): The operations.
+
+        Returns:
+            list of EnrollmentResult: The result of each operation, in the order of the operations.
+        """
+        if not operations:
+            return []
+
+        # The LMS URL is that of the current site, which is only known to the thread serving the request.
+        url = get_lms_enrollment_api_url()
+        if len(operations) == 1:
+            return [self._post(url, operations[0])]
+
+        results = []
+        size = settings.ENROLLMENT_API_POOL_SIZE
+        for start in range(0, len(operations), size):
+            waits = [run_in_thread(self._post, url, operation) for operation in operations[start:start + size]]
+            results.extend(wait() for wait in waits)
+
+        return results
+
+    def get_enrollments(self, username):
+        """ Retrieve the enrollments of a user.
+
+        Returns:
+            requests.Response: The Enrollment API response.
+        """
+        return self.session.get(
+            get_lms_enrollment_api_url(),
+            params={'user': username},
+            headers=self._get_headers(),
+            timeout=settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+        )
+
+
+def get_enrollment_gateway():
+    """ Returns the gateway of the class at the path in the ENROLLMENT_GATEWAY setting, shared by the process. """
+    path = settings.ENROLLMENT_GATEWAY
+    gateway = _gateways.get(path)
+    if gateway is None:
+        with _lock:
+            gateway = _gateways.get(path)
+            if gateway is None:
+                module_path, _, class_name = path.rpartition('.')
+                gateway = getattr(import_module(module_path), class_name)()
+                _gateways[path] = gateway
+    return gateway
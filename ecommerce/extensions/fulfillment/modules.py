@@ -5,28 +5,26 @@ in an Order.
 """
 import abc
 import datetime
-import json
 import logging
 
-import requests
 from django.conf import settings
 from django.urls import reverse
 from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=ungrouped-imports
-from rest_framework import status
 
 from ecommerce.core.constants import (
     DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 )
-from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
+from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.enterprise.utils import get_or_create_enterprise_customer_user
-from ecommerce.extensions.analytics.utils import audit_log, parse_tracking_context
+from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.api.v2.views.coupons import CouponViewSet
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.fulfillment.gateway import EnrollmentOperation, get_enrollment_gateway
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.voucher.models import OrderLineVouchers
 from ecommerce.extensions.voucher.utils import create_vouchers
@@ -107,6 +105,19 @@ class BaseFulfillmentModule(object):  # pragma: no cover
         """
         raise NotImplementedError("Revoke method not implemented!")
 
+    def revoke_lines(self, lines):
+        """ Revokes the specified lines.
+
+        Modules able to revoke several lines at once override this method, to do so.
+
+        Args:
+            lines (List of Lines): Order Lines to be revoked.
+
+        Returns:
+            A list containing, for each line, True if the product is revoked; otherwise, False.
+        """
+        return [self.revoke_line(line) for line in lines]
+
 
 class DonationsFromCheckoutTestFulfillmentModule(BaseFulfillmentModule):
     """
@@ -166,24 +177,6 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     Allows the enrollment of a student via purchase of a 'seat'.
     """
 
-    def _post_to_enrollment_api(self, data, user):
-        enrollment_api_url = get_lms_enrollment_api_url()
-        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
-        headers = {
-            'Content-Type': 'application/json',
-            'X-Edx-Api-Key': settings.EDX_API_KEY
-        }
-
-        __, client_id, ip = parse_tracking_context(user)
-
-        if client_id:
-            headers['X-Edx-Ga-Client-Id'] = client_id
-
-        if ip:
-            headers['X-Forwarded-For'] = ip
-
-        return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
-
     def _add_enterprise_data_to_enrollment_api_post(self, data, order):
         """ Augment enrollment api POST data with enterprise specific data.
 
@@ -236,6 +229,43 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         """
         return [line for line in lines if self.supports_line(line)]
 
+    def _set_enrollment_status(self, order, line, mode, provider, operation, result):
+        """ Sets the status of a line from the result of the Enrollment API request enrolling its purchaser. """
+        if result.succeeded:
+            line.set_status(LINE.COMPLETE)
+
+            audit_log(
+                'line_fulfilled',
+                order_line_id=line.id,
+                order_number=order.number,
+                product_class=line.product.get_product_class().name,
+                course_id=operation.course_id,
+                mode=mode,
+                user_id=order.user.id,
+                credit_provider=provider,
+            )
+        elif isinstance(result.exception, ConnectionError):
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+        elif isinstance(result.exception, Timeout):
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+        elif result.exc_info:
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s].", line.id, order.number, exc_info=result.exc_info
+            )
+            line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+        else:
+            logger.error(
+                "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
+                line.id, order.number, result.status_code, result.message or '(No detail provided.)'
+            )
+            line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+
     def fulfill_product(self, order, lines):
         """ Fulfills the purchase of a 'seat' by enrolling the associated student.
 
@@ -247,7 +277,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
             order (Order): The Order associated with the lines to be fulfilled. The user associated with the order
                 is presumed to be the student to enroll in a course.
             lines (List of Lines): Order Lines, associated with purchased products in an Order. These should only
-                be "Seat" products.
+                be "Seat" products. The enrollments for all of them are sent to the Enrollment API in one batch.
 
         Returns:
             The original set of lines, with new statuses set based on the success or failure of fulfillment.
@@ -265,6 +295,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
 
             return order, lines
 
+        enrollments = []
         for line in lines:
             try:
                 mode = mode_for_product(line.product)
@@ -302,95 +333,90 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
                         'value': provider
                     }
                 )
+
             try:
                 self._add_enterprise_data_to_enrollment_api_post(data, order)
-
-                # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
-                # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
-                response = self._post_to_enrollment_api(data, user=order.user)
-
-                if response.status_code == status.HTTP_200_OK:
-                    line.set_status(LINE.COMPLETE)
-
-                    audit_log(
-                        'line_fulfilled',
-                        order_line_id=line.id,
-                        order_number=order.number,
-                        product_class=line.product.get_product_class().name,
-                        course_id=course_key,
-                        mode=mode,
-                        user_id=order.user.id,
-                        credit_provider=provider,
-                    )
-                else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:  # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
-                    logger.error(
-                        "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
-                        line.id, order.number, response.status_code, reason
-                    )
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
             except ConnectionError:
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
                 )
                 line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+                continue
             except Timeout:
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
                 )
                 line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+                continue
+
+            enrollments.append((line, mode, provider, EnrollmentOperation(data, user=order.user)))
+
+        # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
+        # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
+        results = get_enrollment_gateway().send([operation for __, __, __, operation in enrollments])
+
+        for (line, mode, provider, operation), result in zip(enrollments, results):
+            self._set_enrollment_status(order, line, mode, provider, operation, result)
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
 
     def revoke_line(self, line):
-        try:
-            logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
+        return self.revoke_lines([line])[0]
 
-            mode = mode_for_product(line.product)
-            course_key = line.product.attr.course_key
-            data = {
-                'user': line.order.user.username,
-                'is_active': False,
-                'mode': mode,
-                'course_details': {
-                    'course_id': course_key,
-                },
-            }
+    def revoke_lines(self, lines):
+        """ Unenrolls the purchasers of the specified lines, sending the Enrollment API requests in one batch. """
+        revocations = []
+        revoked = [False] * len(lines)
+        for index, line in enumerate(lines):
+            try:
+                logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
 
-            response = self._post_to_enrollment_api(data, user=line.order.user)
+                mode = mode_for_product(line.product)
+                course_key = line.product.attr.course_key
+                data = {
+                    'user': line.order.user.username,
+                    'is_active': False,
+                    'mode': mode,
+                    'course_details': {
+                        'course_id': course_key,
+                    },
+                }
+                revocations.append((index, line, EnrollmentOperation(data, user=line.order.user)))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
 
-            if response.status_code == status.HTTP_200_OK:
+        try:
+            results = get_enrollment_gateway().send([operation for __, __, operation in revocations])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to revoke fulfillment of Lines [%s].', ', '.join(str(line.id) for line in lines))
+            return revoked
+
+        for (index, line, operation), result in zip(revocations, results):
+            if result.succeeded:
                 audit_log(
                     'line_revoked',
                     order_line_id=line.id,
                     order_number=line.order.number,
                     product_class=line.product.get_product_class().name,
-                    course_id=course_key,
+                    course_id=operation.course_id,
                     certificate_type=getattr(line.product.attr, 'certificate_type', ''),
                     user_id=line.order.user.id
                 )
-
-                return True
+                revoked[index] = True
+            elif result.exc_info:
+                logger.error('Failed to revoke fulfillment of Line [%d].', line.id, exc_info=result.exc_info)
             else:
                 # check if the error / message are something we can recover from.
-                data = response.json()
-                detail = data.get('message', '(No details provided.)')
-                if response.status_code == 400 and "Enrollment mode mismatch" in detail:
+                detail = result.message or '(No details provided.)'
+                if result.status_code == 400 and "Enrollment mode mismatch" in detail:
                     # The user is currently enrolled in different mode than the one
                     # we are refunding an order for.  Don't revoke that enrollment.
                     logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
-                    return True
+                    revoked[index] = True
                 else:
                     logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
-        except Exception:  # pylint: disable=broad-except
-            logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
 
-        return False
+        return revoked
 
 
 class CouponFulfillmentModule(BaseFulfillmentModule):
@@ -0,0 +1,50 @@
+from ecommerce.extensions.fulfillment.gateway import EnrollmentResult
+
+FAKE_GATEWAY_PATH = 'ecommerce.extensions.fulfillment.tests.gateway.FakeEnrollmentGateway'
+
+
+class FakeEnrollmentGateway(object):
+    """ Enrollment gateway keeping enrollments in memory, rather than sending them to the LMS.
+
+    Like the LMS, it refuses to unenroll a user from a course run in which they are enrolled in another mode.
+    """
+
+    def __init__(self):
+        self.enrollments = {}
+        self.batches = []
+        self.failures = {}
+
+    def reset(self):
+        """ Forget all enrollments, batches and failures. """
+        self.enrollments.clear()
+        self.failures.clear()
+        del self.batches[:]
+
+    def fail(self, course_id, status_code=500, message='Failed.'):
+        """ Respond to every operation in the given course run with the given error. """
+        self.failures[course_id] = (status_code, message)
+
+    def is_enrolled(self, username, course_id, mode=None):
+        enrollment = self.enrollments.get((username, course_id))
+        return bool(enrollment and enrollment['is_active'] and (mode is None or enrollment['mode'] == mode))
+
+    def send(self, operations):
+        self.batches.append(list(operations))
+        return [self._apply(operation) for operation in operations]
+
+    def _apply(self, operation):
+        if operation.course_id in self.failures:
+            status_code, message = self.failures[operation.course_id]
+            return EnrollmentResult(operation, status_code, message)
+
+        data = operation.data
+        key = (data['user'], operation.course_id)
+        enrollment = self.enrollments.get(key)
+        if not data['is_active'] and enrollment and enrollment['mode'] != data['mode']:
+            message = 'Enrollment mode mismatch: active mode={}, requested mode={}. Won\'t deactivate.'.format(
+                enrollment['mode'], data['mode']
+            )
+            return EnrollmentResult(operation, 400, message)
+
+        self.enrollments[key] = {'mode': data['mode'], 'is_active': data['is_active']}
+        return EnrollmentResult(operation, 200)
@@ -110,6 +110,21 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
         self.assertEqual(refund.status, REFUND.PAYMENT_REFUNDED)
         self.assertEqual(set([line.status for line in refund.lines.all()]), {REFUND_LINE.COMPLETE})
 
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
+    def test_revoke_fulfillment_for_refund_batch(self):
+        """
+        Verify each module revokes all of the lines it supports at once.
+        """
+        refund = RefundFactory(status=REFUND.PAYMENT_REFUNDED)
+        with patch.object(FakeFulfillmentModule, 'revoke_lines', autospec=True,
+                          side_effect=lambda module, lines: [True] * len(lines)) as mock_revoke_lines:
+            self.assertTrue(revoke_fulfillment_for_refund(refund))
+
+        self.assertEqual(mock_revoke_lines.call_count, 1)
+        self.assertEqual(
+            set(mock_revoke_lines.call_args[0][1]), set(line.order_line for line in refund.lines.all())
+        )
+
     @override_settings(FULFILLMENT_MODULES=[])
     def test_suppress_revocation_for_zero_dollar_refund(self):
         """
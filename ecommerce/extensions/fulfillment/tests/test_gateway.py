@@ -0,0 +1,72 @@
+import json
+
+import mock
+from django.test import override_settings
+from requests.exceptions import Timeout
+
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.extensions.fulfillment.gateway import EnrollmentGateway, EnrollmentOperation, get_enrollment_gateway
+from ecommerce.extensions.fulfillment.tests.gateway import FAKE_GATEWAY_PATH, FakeEnrollmentGateway
+from ecommerce.tests.testcases import TestCase
+
+
+def enrollment_data(course_id, is_active=True):
+    return {'user': 'test', 'is_active': is_active, 'mode': 'verified', 'course_details': {'course_id': course_id}}
+
+
+@override_settings(EDX_API_KEY='foo', ENROLLMENT_API_POOL_SIZE=2)
+class EnrollmentGatewayTests(TestCase):
+    def setUp(self):
+        super(EnrollmentGatewayTests, self).setUp()
+        self.gateway = EnrollmentGateway()
+
+    def test_send(self):
+        """ Verify every operation is sent, with its tracking headers, and its result returned in order. """
+        # httpretty is not thread-safe, so responses to the concurrent requests are mocked instead.
+        def post(_url, data, headers, timeout):  # pylint: disable=unused-argument
+            response = mock.Mock(status_code=200)
+            response.json.return_value = {}
+            if json.loads(data)['course_details']['course_id'] == 'failed':
+                response.status_code = 400
+                response.json.return_value = {'message': 'Oops!'}
+            return response
+
+        user = self.create_user(tracking_context={'ga_client_id': 'test-client-id', 'lms_ip': '127.0.0.1'})
+        course_ids = ['a', 'failed', 'b', 'c', 'd']
+
+        operations = [EnrollmentOperation(enrollment_data(course_id), user) for course_id in course_ids]
+        with mock.patch('requests.Session.post', side_effect=post) as mock_post:
+            results = self.gateway.send(operations)
+
+        self.assertEqual([result.operation.course_id for result in results], course_ids)
+        self.assertEqual([result.succeeded for result in results], [True, False, True, True, True])
+        self.assertEqual((results[1].status_code, results[1].message), (400, 'Oops!'))
+        self.assertEqual(mock_post.call_count, len(course_ids))
+
+        for call in mock_post.call_args_list:
+            self.assertEqual(call[0][0], get_lms_enrollment_api_url())
+            self.assertEqual(call[1]['headers']['X-Edx-Api-Key'], 'foo')
+            self.assertEqual(call[1]['headers']['X-Edx-Ga-Client-Id'], 'test-client-id')
+            self.assertEqual(call[1]['headers']['X-Forwarded-For'], '127.0.0.1')
+
+    def test_send_exception(self):
+        """ Verify exceptions raised while sending an operation are returned as its result. """
+        with mock.patch('requests.Session.post', side_effect=Timeout):
+            result = self.gateway.send([EnrollmentOperation(enrollment_data('a'))])[0]
+
+        self.assertFalse(result.succeeded)
+        self.assertIsNone(result.status_code)
+        self.assertIsInstance(result.exception, Timeout)
+
+    def test_send_nothing(self):
+        """ Verify no request is sent for an empty batch. """
+        self.assertEqual(self.gateway.send([]), [])
+
+    def test_get_enrollment_gateway(self):
+        """ Verify the gateway of the configured class is shared. """
+        gateway = get_enrollment_gateway()
+        self.assertIsInstance(gateway, EnrollmentGateway)
+        self.assertIs(get_enrollment_gateway(), gateway)
+
+        with override_settings(ENROLLMENT_GATEWAY=FAKE_GATEWAY_PATH):
+            self.assertIsInstance(get_enrollment_gateway(), FakeEnrollmentGateway)
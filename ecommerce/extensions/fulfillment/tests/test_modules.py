@@ -1,6 +1,7 @@
 """Tests of the Fulfillment API's fulfillment modules."""
 import datetime
 import json
+import logging
 import uuid
 
 import ddt
@@ -25,6 +26,7 @@ from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.fulfillment.gateway import EnrollmentOperation, get_enrollment_gateway
 from ecommerce.extensions.fulfillment.modules import (
     CouponFulfillmentModule,
     CourseEntitlementFulfillmentModule,
@@ -33,6 +35,7 @@ from ecommerce.extensions.fulfillment.modules import (
     EnrollmentFulfillmentModule
 )
 from ecommerce.extensions.fulfillment.status import LINE
+from ecommerce.extensions.fulfillment.tests.gateway import FAKE_GATEWAY_PATH
 from ecommerce.extensions.fulfillment.tests.mixins import FulfillmentTestMixin
 from ecommerce.extensions.test.factories import create_order
 from ecommerce.extensions.voucher.models import OrderLineVouchers
@@ -211,13 +214,13 @@ class EnrollmentFulfillmentModuleTests(ProgramTestMixin, DiscoveryTestMixin, Ful
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_CONFIGURATION_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=ConnectionError))
+    @mock.patch('requests.Session.post', mock.Mock(side_effect=ConnectionError))
     def test_enrollment_module_network_error(self):
         """Test that lines receive a network error status if a fulfillment request experiences a network error."""
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_NETWORK_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=Timeout))
+    @mock.patch('requests.Session.post', mock.Mock(side_effect=Timeout))
     def test_enrollment_module_request_timeout(self):
         """Test that lines receive a timeout error status if a fulfillment request times out."""
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
@@ -406,17 +409,73 @@ class EnrollmentFulfillmentModuleTests(ProgramTestMixin, DiscoveryTestMixin, Ful
         # Now call the enrollment api to send POST request to LMS and verify
         # that the header of the request being sent contains the analytics
         # header 'x-edx-ga-client-id'.
-        # This will raise the exception 'ConnectionError' because the LMS is
+        # This will fail with the exception 'ConnectionError' because the LMS is
         # not available for ecommerce tests.
-        try:
-            # pylint: disable=protected-access
-            EnrollmentFulfillmentModule()._post_to_enrollment_api(data=data, user=self.user)
-        except ConnectionError as exp:
+        result = get_enrollment_gateway().send([EnrollmentOperation(data, user=self.user)])[0]
+        exp = result.exception
+        if isinstance(exp, ConnectionError):
             # Check that the enrollment request object has the analytics header
             # 'x-edx-ga-client-id' and 'x-forwarded-for'.
             self.assertEqual(exp.request.headers.get('x-edx-ga-client-id'), self.user.tracking_context['ga_client_id'])
             self.assertEqual(exp.request.headers.get('x-forwarded-for'), self.user.tracking_context['lms_ip'])
 
+    @override_settings(ENROLLMENT_GATEWAY=FAKE_GATEWAY_PATH)
+    def test_enrollment_module_fulfill_batch(self):
+        """ Verify the enrollments of all lines are sent in one batch, and each line's status set from its result. """
+        gateway = get_enrollment_gateway()
+        gateway.reset()
+        other_course = CourseFactory(id='edX/DemoX/Other_Course', site=self.site)
+        other_seat = other_course.create_or_update_seat(self.certificate_type, False, 100, self.partner)
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        basket.add_product(self.seat, 1)
+        basket.add_product(other_seat, 1)
+        order = create_order(number=2, basket=basket, user=self.user)
+        gateway.fail(other_course.id)
+
+        __, lines = EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.order_by('id')))
+
+        self.assertEqual(len(gateway.batches), 1)
+        self.assertEqual([operation.course_id for operation in gateway.batches[0]], [self.course_id, other_course.id])
+        self.assertEqual([line.status for line in lines], [LINE.COMPLETE, LINE.FULFILLMENT_SERVER_ERROR])
+        self.assertTrue(gateway.is_enrolled(self.user.username, self.course_id, self.certificate_type))
+
+    @override_settings(ENROLLMENT_GATEWAY=FAKE_GATEWAY_PATH)
+    def test_revoke_lines(self):
+        """ Verify lines are revoked in one batch, skipping enrollments in another mode. """
+        gateway = get_enrollment_gateway()
+        gateway.reset()
+        other_course = CourseFactory(id='edX/DemoX/Other_Course', site=self.site)
+        other_seat = other_course.create_or_update_seat(self.certificate_type, False, 100, self.partner)
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        basket.add_product(self.seat, 1)
+        basket.add_product(other_seat, 1)
+        order = create_order(number=2, basket=basket, user=self.user)
+        lines = list(order.lines.order_by('id'))
+        EnrollmentFulfillmentModule().fulfill_product(order, lines)
+
+        gateway.enrollments[(self.user.username, other_course.id)]['mode'] = 'honor'
+        self.assertEqual(EnrollmentFulfillmentModule().revoke_lines(lines), [True, True])
+        self.assertEqual(len(gateway.batches), 2)
+        self.assertFalse(gateway.is_enrolled(self.user.username, self.course_id))
+        self.assertTrue(gateway.is_enrolled(self.user.username, other_course.id, 'honor'))
+
+        gateway.fail(self.course_id)
+        self.assertEqual(EnrollmentFulfillmentModule().revoke_lines(lines), [False, True])
+
+    def test_revoke_lines_gateway_error(self):
+        """ Verify no line is revoked, and the error is logged, if the enrollment gateway raises an exception. """
+        lines = list(self.order.lines.all())
+        logger_name = 'ecommerce.extensions.fulfillment.modules'
+        with mock.patch('ecommerce.extensions.fulfillment.modules.get_enrollment_gateway') as mock_gateway:
+            mock_gateway.return_value.send.side_effect = Exception
+            with LogCapture(logger_name, level=logging.ERROR) as l:
+                self.assertEqual(EnrollmentFulfillmentModule().revoke_lines(lines), [False] * len(lines))
+                l.check(
+                    (logger_name, 'ERROR', 'Failed to revoke fulfillment of Lines [{}].'.format(
+                        ', '.join(str(line.id) for line in lines)
+                    ))
+                )
+
     def test_voucher_usage(self):
         """
         Test that using a voucher applies offer discount to reduce order price
@@ -0,0 +1,10 @@
+"""
+Exceptions used by the Offer app.
+"""
+
+
+class OfferApplicationLimitReached(Exception):
+    """
+    Exception raised when recording the application of an offer would exceed its max_global_applications.
+    """
+    pass
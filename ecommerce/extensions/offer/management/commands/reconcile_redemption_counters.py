@@ -0,0 +1,21 @@
+"""
+Management command that adds the redemptions counted by the stripes of offers and vouchers to the offers and
+vouchers. It should be run periodically, for instance by cron.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand
+
+from ecommerce.extensions.offer.redemptions import reconcile_redemption_counters
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Reconcile the redemption counters of offers and vouchers.'
+
+    def handle(self, *args, **options):
+        num_offers, num_vouchers = reconcile_redemption_counters()
+        logger.info('Reconciled the redemption counters of [%d] offers and [%d] vouchers.', num_offers, num_vouchers)
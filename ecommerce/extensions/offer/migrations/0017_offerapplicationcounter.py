@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0016_auto_20180124_1131'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferApplicationCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe', models.PositiveSmallIntegerField()),
+                ('num_applications', models.PositiveIntegerField(default=0)),
+                ('num_orders', models.PositiveIntegerField(default=0)),
+                ('total_discount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('allowance', models.PositiveIntegerField(null=True)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_counters', to='offer.ConditionalOffer')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='offerapplicationcounter',
+            unique_together=set([('offer', 'stripe')]),
+        ),
+    ]
@@ -27,6 +27,27 @@ logger = logging.getLogger(__name__)
 
 Voucher = get_model('voucher', 'Voucher')
 
+# Subdomain labels which may precede an allowed email domain.
+SUBDOMAIN_LABEL_PATTERN = re.compile(r'^\w+$')
+
+# Sets of allowed domains, keyed by the ConditionalOffer.email_domains value they were built from.
+_email_domain_sets = {}
+EMAIL_DOMAIN_SETS_MAX_SIZE = 1000
+
+
+def get_email_domain_set(email_domains):
+    """ Returns the set of domains listed in a comma-separated email_domains value.
+
+    The sets are cached per value, so they are built once per distinct list of domains rather than on every check.
+    Changing an offer's email_domains changes the key, so offers never use a stale set.
+    """
+    domain_set = _email_domain_sets.get(email_domains)
+    if domain_set is None:
+        if len(_email_domain_sets) >= EMAIL_DOMAIN_SETS_MAX_SIZE:
+            _email_domain_sets.clear()
+        domain_set = _email_domain_sets[email_domains] = frozenset(email_domains.split(','))
+    return domain_set
+
 
 class Benefit(AbstractBenefit):
     def save(self, *args, **kwargs):
@@ -119,7 +140,10 @@ class Benefit(AbstractBenefit):
                     cache.set(metadata['cache_key'], in_range, settings.COURSES_API_CACHE_TIMEOUT)
                     if not in_range:
                         applicable_lines.remove(metadata['line'])
-            return [(line.product.stockrecords.first().price_excl_tax, line) for line in applicable_lines]
+            return [
+                ((line.stockrecord or line.product.stockrecords.first()).price_excl_tax, line)
+                for line in applicable_lines
+            ]
         else:
             return super(Benefit, self).get_applicable_lines(offer, basket, range=range)  # pylint: disable=bad-super-call
 
@@ -131,9 +155,27 @@ class ConditionalOffer(AbstractConditionalOffer):
         'sites.Site', verbose_name=_('Site'), null=True, blank=True, default=None
     )
 
+    def __init__(self, *args, **kwargs):
+        super(ConditionalOffer, self).__init__(*args, **kwargs)  # pylint: disable=bad-super-call
+        # Read from __dict__ so that loading an offer with the field deferred does not query it.
+        self._saved_max_global_applications = self.__dict__.get('max_global_applications')
+
     def save(self, *args, **kwargs):
+        """
+        Save the offer.
+
+        If the max_global_applications of an offer whose applications are counted by stripes changed, the
+        applications remaining are shared between its stripes again.
+        """
+        from ecommerce.extensions.offer.redemptions import OFFER_COUNTS, reconcile_offers
         self.clean()
+        limit_changed = self.pk and self.max_global_applications != self._saved_max_global_applications
         super(ConditionalOffer, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
+        self._saved_max_global_applications = self.max_global_applications
+        if limit_changed:
+            reconcile_offers([self.pk])
+            # Reconciliation adds the counts of the stripes to the offer's row.
+            self.refresh_from_db(fields=OFFER_COUNTS)
 
     def clean(self):
         self.clean_email_domains()
@@ -221,14 +263,23 @@ class ConditionalOffer(AbstractConditionalOffer):
             True if the email is valid or when there are no valid email domains set,
             False otherwise.
         """
-        if self.email_domains:
-            for domain in self.email_domains.split(','):
-                pattern = r'(?P<username>.+)@(?P<subdomain>\w+\.)*{domain}'.format(domain=domain)
-                match = re.match(pattern, email)
-                if match and match.group(0) == email:
-                    return True
+        if not self.email_domains:
+            return True
+
+        username, __, email_domain = email.rpartition('@')
+        if not username:
             return False
-        return True
+
+        # Compare the email's domain, and each parent domain reached by removing subdomain labels, to the
+        # allowed domains. This costs one set lookup per label, regardless of the number of allowed domains.
+        domains = get_email_domain_set(self.email_domains)
+        labels = email_domain.split('.')
+        for index, label in enumerate(labels):
+            if '.'.join(labels[index:]) in domains:
+                return True
+            if not SUBDOMAIN_LABEL_PATTERN.match(label):
+                return False
+        return False
 
     def is_condition_satisfied(self, basket):
         """
@@ -247,6 +298,54 @@ class ConditionalOffer(AbstractConditionalOffer):
 
         return super(ConditionalOffer, self).is_condition_satisfied(basket)  # pylint: disable=bad-super-call
 
+    def get_num_applications(self):
+        """ Returns the number of times the offer has been applied, including applications not yet reconciled. """
+        from ecommerce.extensions.offer.redemptions import get_pending_offer_usage
+        return self.num_applications + get_pending_offer_usage(self)['num_applications']
+
+    def get_max_applications(self, user=None):
+        """ Returns the number of times the offer may still be applied, counting unreconciled applications. """
+        max_applications = super(ConditionalOffer, self).get_max_applications(  # pylint: disable=bad-super-call
+            user=user
+        )
+        if self.max_global_applications:
+            max_applications = min(
+                max_applications, max(0, self.max_global_applications - self.get_num_applications())
+            )
+        return max_applications
+
+    def record_usage(self, discount):
+        """
+        Record the application of the offer to an order.
+
+        Rather than updating the offer, which would lock its row until the order is committed, the application
+        is counted by one of the offer's OfferApplicationCounters. Offers limited by max_global_applications
+        reserve the applications atomically, raising OfferApplicationLimitReached if they would exceed the limit.
+        """
+        from ecommerce.extensions.offer.redemptions import record_offer_usage
+        record_offer_usage(self, discount['freq'], discount['discount'])
+
+
+class OfferApplicationCounter(models.Model):
+    """
+    One of the stripes across which the usage of an offer is counted until it is reconciled.
+
+    Order placement increments a random stripe, so that concurrent orders redeeming the same offer rarely wait
+    for each other. The counts are added to the offer, and reset, by reconcile_offer_usage. Stripes of offers
+    limited by max_global_applications hold an allowance, a share of the applications remaining, from which
+    applications are reserved.
+    """
+    offer = models.ForeignKey(ConditionalOffer, related_name='application_counters', on_delete=models.CASCADE)
+    stripe = models.PositiveSmallIntegerField()
+    num_applications = models.PositiveIntegerField(default=0)
+    num_orders = models.PositiveIntegerField(default=0)
+    total_discount = models.DecimalField(decimal_places=2, max_digits=12, default=0)
+    # Applications which may still be reserved from this stripe, or None if the offer is not limited.
+    allowance = models.PositiveIntegerField(null=True)
+
+    class Meta(object):
+        unique_together = ('offer', 'stripe')
+
 
 def validate_credit_seat_type(course_seat_types):
     if not isinstance(course_seat_types, basestring):
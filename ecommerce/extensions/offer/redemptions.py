@@ -0,0 +1,209 @@
+"""
+Accounting of offer and voucher redemptions.
+
+Oscar records a redemption by incrementing counters of the redeemed offer and voucher and saving them. During
+order placement their rows then stay locked until the order is committed, so every checkout redeeming a popular
+voucher waits for the previous one. Redemptions are instead counted by stripes, OfferApplicationCounter and
+VoucherUsageCounter rows, one of which is chosen at random for each redemption. The counts are added to the
+offers and vouchers by reconcile_redemption_counters, which should be run periodically.
+
+The applications of offers limited by max_global_applications are reserved from allowances held by the stripes.
+A reservation decrements a stripe's allowance, only if it covers the applications, in the statement counting
+them, so that the limit is never exceeded. When a stripe's allowance is exhausted, the applications remaining
+are recounted with all of the offer's stripes locked, and shared between the stripes again.
+"""
+from __future__ import unicode_literals
+
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
+
+logger = logging.getLogger(__name__)
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OfferApplicationCounter = get_model('offer', 'OfferApplicationCounter')
+Voucher = get_model('voucher', 'Voucher')
+VoucherUsageCounter = get_model('voucher', 'VoucherUsageCounter')
+
+OFFER_COUNTS = ('num_applications', 'num_orders', 'total_discount')
+VOUCHER_COUNTS = ('num_orders', 'total_discount')
+
+
+def _increments(counts):
+    return {name: F(name) + value for name, value in counts.items()}
+
+
+def _create_counters(owner, counter_model, owner_field):
+    """ Create the stripes missing for an offer or voucher. """
+    with transaction.atomic():
+        # Locking the owner prevents concurrent redemptions from creating the same stripes.
+        list(type(owner).objects.select_for_update().filter(pk=owner.pk).values_list('pk', flat=True))
+        existing = set(counter_model.objects.filter(**{owner_field: owner}).values_list('stripe', flat=True))
+        counter_model.objects.bulk_create([
+            counter_model(stripe=stripe, **{owner_field: owner})
+            for stripe in range(settings.REDEMPTION_COUNTER_STRIPES) if stripe not in existing
+        ])
+
+
+def _increment(owner, counter_model, owner_field, counts):
+    stripe = random.randrange(settings.REDEMPTION_COUNTER_STRIPES)
+    counters = counter_model.objects.filter(stripe=stripe, **{owner_field: owner})
+    if not counters.update(**_increments(counts)):
+        _create_counters(owner, counter_model, owner_field)
+        counters.update(**_increments(counts))
+
+
+def _share_allowance(counters, remaining):
+    """ Share the applications remaining for an offer, or None if it is not limited, between its stripes. """
+    if remaining is None:
+        for counter in counters:
+            counter.allowance = None
+        return
+
+    share, extra = divmod(remaining, len(counters))
+    for index, counter in enumerate(counters):
+        counter.allowance = share + 1 if index < extra else share
+
+
+def _reserve(offer, stripe, counts):
+    """ Reserve applications of an offer when the allowance of the chosen stripe does not cover them. """
+    _create_counters(offer, OfferApplicationCounter, 'offer')
+
+    with transaction.atomic():
+        # The offer is locked before its stripes, as by reconcile_offer_usage, and read with a locking read
+        # so that the counts reconciled into it are never missed.
+        num_applications, max_global_applications = ConditionalOffer.objects.select_for_update().filter(
+            id=offer.id
+        ).values_list('num_applications', 'max_global_applications')[0]
+        counters = list(OfferApplicationCounter.objects.select_for_update().filter(offer=offer).order_by('stripe'))
+
+        remaining = None
+        if max_global_applications is not None:
+            remaining = max_global_applications - num_applications - sum(c.num_applications for c in counters)
+            if remaining < counts['num_applications']:
+                logger.info(
+                    'Offer [%d] cannot be applied [%d] more times, as it has [%d] applications remaining.',
+                    offer.id, counts['num_applications'], max(remaining, 0)
+                )
+                raise OfferApplicationLimitReached(
+                    'Offer [{}] has reached its maximum number of applications.'.format(offer.id)
+                )
+            remaining -= counts['num_applications']
+
+        _share_allowance(counters, remaining)
+        for counter in counters:
+            if counter.stripe == stripe:
+                for name, value in counts.items():
+                    setattr(counter, name, getattr(counter, name) + value)
+            counter.save()
+
+
+def record_offer_usage(offer, num_applications, discount):
+    """ Count the application of an offer to an order, reserving the applications if the offer is limited.
+
+    Arguments:
+        offer (ConditionalOffer): The offer.
+        num_applications (int): Number of times the offer was applied to the order.
+        discount (Decimal): Discount given by the offer.
+
+    Raises:
+        OfferApplicationLimitReached: If the applications would exceed the offer's max_global_applications.
+    """
+    counts = {'num_applications': num_applications, 'num_orders': 1, 'total_discount': discount}
+    if offer.max_global_applications is None:
+        _increment(offer, OfferApplicationCounter, 'offer', counts)
+        return
+
+    stripe = random.randrange(settings.REDEMPTION_COUNTER_STRIPES)
+    updates = _increments(counts)
+    updates['allowance'] = F('allowance') - num_applications
+    reserved = OfferApplicationCounter.objects.filter(
+        offer=offer, stripe=stripe, allowance__gte=num_applications
+    ).update(**updates)
+    if not reserved:
+        _reserve(offer, stripe, counts)
+
+
+def record_voucher_usage(voucher, num_orders=0, total_discount=0):
+    """ Count the redemption of a voucher by an order, or the discount it gave. """
+    _increment(voucher, VoucherUsageCounter, 'voucher', {'num_orders': num_orders, 'total_discount': total_discount})
+
+
+def get_pending_offer_usage(offer):
+    """ Returns a dict of the usage counts of an offer which have not been reconciled yet. """
+    pending = OfferApplicationCounter.objects.filter(offer=offer).aggregate(*[Sum(name) for name in OFFER_COUNTS])
+    return {name: pending['{}__sum'.format(name)] or 0 for name in OFFER_COUNTS}
+
+
+def _fold(counters, names):
+    """ Returns the totals of the given counts of the stripes, resetting the counts of the stripe instances. """
+    totals = {name: 0 for name in names}
+    for counter in counters:
+        for name in names:
+            totals[name] += getattr(counter, name)
+            setattr(counter, name, 0)
+    return totals
+
+
+def reconcile_offer_usage(offer_id):
+    """ Add the counts of an offer's stripes to the offer, and share its remaining applications between them. """
+    with transaction.atomic():
+        offer = ConditionalOffer.objects.select_for_update().get(id=offer_id)
+        counters = list(OfferApplicationCounter.objects.select_for_update().filter(offer=offer).order_by('stripe'))
+        if not counters:
+            return
+
+        totals = _fold(counters, OFFER_COUNTS)
+        ConditionalOffer.objects.filter(id=offer_id).update(**_increments(totals))
+
+        remaining = None
+        if offer.max_global_applications is not None:
+            remaining = max(offer.max_global_applications - offer.num_applications - totals['num_applications'], 0)
+        _share_allowance(counters, remaining)
+        for counter in counters:
+            counter.save()
+
+
+def reconcile_voucher_usage(voucher_id):
+    """ Add the counts of a voucher's stripes to the voucher. """
+    with transaction.atomic():
+        counters = VoucherUsageCounter.objects.select_for_update().filter(voucher_id=voucher_id).order_by('stripe')
+        totals = _fold(counters, VOUCHER_COUNTS)
+        Voucher.objects.filter(id=voucher_id).update(**_increments(totals))
+        counters.update(num_orders=0, total_discount=0)
+
+
+def reconcile_offers(offer_ids):
+    """ Reconcile those of the given offers which have stripes, after their max_global_applications changed. """
+    counted_offer_ids = OfferApplicationCounter.objects.filter(
+        offer_id__in=offer_ids
+    ).values_list('offer_id', flat=True).distinct()
+    for offer_id in list(counted_offer_ids):
+        reconcile_offer_usage(offer_id)
+
+
+def reconcile_redemption_counters():
+    """ Reconcile every offer and voucher with counts not yet reconciled.
+
+    Returns:
+        tuple: The number of offers and of vouchers reconciled.
+    """
+    offer_ids = list(OfferApplicationCounter.objects.exclude(
+        num_applications=0, num_orders=0, total_discount=0
+    ).values_list('offer_id', flat=True).distinct())
+    for offer_id in offer_ids:
+        reconcile_offer_usage(offer_id)
+
+    voucher_ids = list(VoucherUsageCounter.objects.exclude(
+        num_orders=0, total_discount=0
+    ).values_list('voucher_id', flat=True).distinct())
+    for voucher_id in voucher_ids:
+        reconcile_voucher_usage(voucher_id)
+
+    return len(offer_ids), len(voucher_ids)
@@ -424,6 +424,35 @@ class ConditionalOfferTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         valid_email_2 = 'test@sub2.{domain}'.format(domain=self.valid_domain)
         self.assertTrue(self.offer.is_email_valid(valid_email_2))
 
+    @ddt.data(
+        ('test@example.com', True),
+        ('test@sub.example.com', True),
+        ('test@sub1.sub2.example.com', True),
+        ('te@st@example.com', True),
+        ('@example.com', False),
+        ('test@other.com', False),
+        ('test@notexample.com', False),
+        ('test@example.com.other', False),
+        ('test@exampleXcom', False),
+        ('test@sub-1.example.com', False),
+        ('test', False),
+    )
+    @ddt.unpack
+    def test_is_email_valid_subdomains(self, email, is_valid):
+        """Verify emails are valid for a listed domain and any of its subdomains."""
+        offer = factories.ConditionalOfferFactory(email_domains='other.org,example.com')
+        self.assertEqual(offer.is_email_valid(email), is_valid)
+
+    def test_is_email_valid_after_email_domains_change(self):
+        """Verify checks reflect changes to the offer's email domains."""
+        email = 'test@{domain}'.format(domain=self.valid_domain)
+        self.assertTrue(self.offer.is_email_valid(email))
+
+        self.offer.email_domains = 'other.org'
+        self.offer.save()
+        self.assertFalse(self.offer.is_email_valid(email))
+        self.assertTrue(self.offer.is_email_valid('test@other.org'))
+
     @ddt.data(
         '', 'domain.com', 'multi.it,domain.hr', 'sub.domain.net', '例如.com', 'val-id.例如', 'valid1.co例如',
         'valid-domain.com', 'çççç.рф', 'çç-ççç32.中国', 'ççç.ççç.இலங்கை'
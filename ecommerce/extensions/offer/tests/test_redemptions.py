@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import override_settings
+from oscar.core.loading import get_model
+from oscar.test.factories import BasketFactory
+
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
+from ecommerce.extensions.offer.redemptions import reconcile_offers, reconcile_redemption_counters, record_offer_usage
+from ecommerce.extensions.test.factories import ConditionalOfferFactory, create_order, prepare_voucher
+from ecommerce.tests.testcases import TestCase
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OfferApplicationCounter = get_model('offer', 'OfferApplicationCounter')
+Voucher = get_model('voucher', 'Voucher')
+
+
+@override_settings(REDEMPTION_COUNTER_STRIPES=4)
+class OfferRedemptionTests(TestCase):
+    def record(self, offer, num_applications=1, discount=Decimal(10)):
+        offer.record_usage({'freq': num_applications, 'discount': discount})
+
+    def test_unlimited_offer(self):
+        """ Verify the applications of an offer are counted by its stripes until they are reconciled. """
+        offer = ConditionalOfferFactory()
+        self.record(offer)
+        self.record(offer, num_applications=2)
+
+        offer.refresh_from_db()
+        self.assertEqual(offer.num_applications, 0)
+        self.assertEqual(offer.get_num_applications(), 3)
+        self.assertEqual(OfferApplicationCounter.objects.filter(offer=offer).count(), 4)
+
+        self.assertEqual(reconcile_redemption_counters(), (1, 0))
+        offer.refresh_from_db()
+        self.assertEqual(offer.num_applications, 3)
+        self.assertEqual(offer.num_orders, 2)
+        self.assertEqual(offer.total_discount, Decimal(20))
+        self.assertEqual(offer.get_num_applications(), 3)
+
+    def test_limited_offer(self):
+        """ Verify applications are reserved against max_global_applications, whichever stripes count them. """
+        offer = ConditionalOfferFactory(max_global_applications=5)
+        for __ in range(4):
+            self.record(offer)
+        self.assertTrue(offer.is_available())
+        self.assertEqual(offer.get_max_applications(), 1)
+
+        with self.assertRaises(OfferApplicationLimitReached):
+            self.record(offer, num_applications=2)
+        self.record(offer)
+
+        self.assertFalse(offer.is_available())
+        self.assertEqual(offer.get_max_applications(), 0)
+        with self.assertRaises(OfferApplicationLimitReached):
+            self.record(offer)
+
+        allowance = OfferApplicationCounter.objects.filter(offer=offer).values_list('allowance', flat=True)
+        self.assertEqual(sum(allowance), 0)
+
+    def test_limit_changed(self):
+        """ Verify the allowances of the stripes are shared again when an offer's limit changes. """
+        offer = ConditionalOfferFactory(max_global_applications=1)
+        record_offer_usage(offer, 1, Decimal(10))
+
+        ConditionalOffer.objects.filter(id=offer.id).update(max_global_applications=3)
+        reconcile_offers([offer.id])
+
+        offer.refresh_from_db()
+        self.assertEqual(offer.num_applications, 1)
+        allowance = OfferApplicationCounter.objects.filter(offer=offer).values_list('allowance', flat=True)
+        self.assertEqual(sorted(allowance), [0, 0, 1, 1])
+        record_offer_usage(offer, 2, Decimal(20))
+
+    def test_limit_changed_on_save(self):
+        """ Verify saving an offer with a new limit shares the applications remaining between its stripes. """
+        offer = ConditionalOfferFactory(max_global_applications=1)
+        record_offer_usage(offer, 1, Decimal(10))
+        self.assertFalse(offer.is_available())
+
+        offer.max_global_applications = 3
+        offer.save()
+
+        self.assertEqual(offer.num_applications, 1)
+        self.assertTrue(offer.is_available())
+        allowance = OfferApplicationCounter.objects.filter(offer=offer).values_list('allowance', flat=True)
+        self.assertEqual(sorted(allowance), [0, 0, 1, 1])
+        record_offer_usage(offer, 2, Decimal(20))
+
+        offer.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.num_applications, 1)
+
+    def test_voucher_usage(self):
+        """ Verify the redemptions of vouchers which may be redeemed more than once are counted by stripes. """
+        voucher, product = prepare_voucher(usage=Voucher.MULTI_USE)
+        basket = BasketFactory(owner=self.create_user(), site=self.site)
+        basket.add_product(product)
+        order = create_order(basket=basket, user=basket.owner)
+        voucher.record_usage(order, order.user)
+        voucher.record_discount({'discount': Decimal(10)})
+
+        voucher.refresh_from_db()
+        self.assertEqual(voucher.num_orders, 0)
+        self.assertEqual(voucher.applications.count(), 1)
+
+        call_command('reconcile_redemption_counters')
+        voucher.refresh_from_db()
+        self.assertEqual(voucher.num_orders, 1)
+        self.assertEqual(voucher.total_discount, Decimal(10))
@@ -3,3 +3,10 @@ from oscar.apps.order import config
 
 class OrderConfig(config.OrderConfig):
     name = 'ecommerce.extensions.order'
+
+    def ready(self):
+        super(OrderConfig, self).ready()
+
+        # The receivers are not in a signals module, which would take the place of Oscar's order.signals.
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.order.receivers  # pylint: disable=unused-variable
@@ -0,0 +1,28 @@
+"""
+Versions of users' order histories, used to revalidate cached order lists.
+
+These are kept apart from ecommerce.extensions.order.utils, which imports Oscar's order models, so that the
+order signal receivers can use them while those models are being loaded.
+"""
+from __future__ import unicode_literals
+
+from django.conf import settings
+
+from ecommerce.core.utils import get_cache_key, get_version, update_version
+
+
+def _order_history_version_cache_key(user_id):
+    return get_cache_key(resource='order_history_version', user_id=user_id)
+
+
+def get_order_history_version(user_id):
+    """ Returns the time at which the user's orders last changed, as a POSIX timestamp.
+
+    The time is recorded when the user's orders or order lines are saved.
+    """
+    return get_version(_order_history_version_cache_key(user_id), settings.ORDER_HISTORY_VERSION_CACHE_TIMEOUT)
+
+
+def update_order_history_version(user_id):
+    """ Record that the user's orders changed. """
+    update_version(_order_history_version_cache_key(user_id), settings.ORDER_HISTORY_VERSION_CACHE_TIMEOUT)
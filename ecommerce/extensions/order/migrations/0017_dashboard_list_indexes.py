@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('order', '0016_auto_20180119_0903'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='order',
+            index_together=set([('status', 'date_placed'), ('user', 'date_placed')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='line',
+            index_together=set([('partner_sku', 'order')]),
+        ),
+    ]
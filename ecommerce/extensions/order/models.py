@@ -1,12 +1,19 @@
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
-from oscar.apps.order.abstract_models import AbstractOrder, AbstractPaymentEvent
+from oscar.apps.order.abstract_models import AbstractLine, AbstractOrder, AbstractPaymentEvent
 
 from ecommerce.extensions.fulfillment.status import ORDER
 
 
 class Order(AbstractOrder):
 
+    class Meta(AbstractOrder.Meta):
+        # Support the filters of the dashboard order list, which is ordered by date_placed.
+        index_together = (
+            ('status', 'date_placed'),
+            ('user', 'date_placed'),
+        )
+
     @property
     def is_fulfillable(self):
         """Returns a boolean indicating if order can be fulfilled."""
@@ -18,6 +25,13 @@ class Order(AbstractOrder):
         return any(line.product.is_coupon_product for line in self.basket.all_lines())
 
 
+class Line(AbstractLine):
+
+    class Meta(AbstractLine.Meta):
+        # Support filtering orders by SKU on the dashboard order list.
+        index_together = ('partner_sku', 'order')
+
+
 class PaymentEvent(AbstractPaymentEvent):
     processor_name = models.CharField(_('Payment Processor'), max_length=32, blank=True, null=True)
 
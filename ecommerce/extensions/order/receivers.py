@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.order.history import update_order_history_version
+
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+
+
+@receiver(post_save, sender=Order, dispatch_uid='order.history.update_for_order')
+def update_history_version_for_order(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Record that the orders of the order's user changed, so that cached order histories are revalidated. """
+    if instance.user_id and not raw:
+        update_order_history_version(instance.user_id)
+
+
+@receiver(post_save, sender=Line, dispatch_uid='order.history.update_for_line')
+def update_history_version_for_line(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Record that the orders of the line's user changed, such as when the line is fulfilled or refunded. """
+    if not raw and instance.order.user_id:
+        update_order_history_version(instance.order.user_id)
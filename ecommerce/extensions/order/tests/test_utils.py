@@ -5,6 +5,7 @@ import logging
 import ddt
 import httpretty
 import mock
+from django.db.models.query import QuerySet
 from django.test.client import RequestFactory
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import BasketFactory
@@ -13,10 +14,11 @@ from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.offer.redemptions import record_voucher_usage
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.refund.tests.factories import RefundFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
-from ecommerce.extensions.test.factories import create_basket, create_order
+from ecommerce.extensions.test.factories import create_basket, create_order, prepare_voucher
 from ecommerce.referrals.models import Referral
 from ecommerce.tests.factories import PartnerFactory, SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
@@ -32,6 +34,7 @@ OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 OrderLine = get_model('order', 'Line')
 RefundLine = get_model('refund', 'RefundLine')
 ShippingAddress = get_class('order.models', 'ShippingAddress')
+Voucher = get_model('voucher', 'Voucher')
 
 
 class OrderNumberGeneratorTests(TestCase):
@@ -75,6 +78,7 @@ class OrderNumberGeneratorTests(TestCase):
         self.assertEqual(self.generator.basket_id('ACME-101001'), 1001)
 
 
+@ddt.ddt
 class OrderCreatorTests(TestCase):
     order_creator = OrderCreator()
 
@@ -174,13 +178,49 @@ class OrderCreatorTests(TestCase):
         basket = self.create_basket(site)
 
         with LogCapture(LOGGER_NAME, level=logging.ERROR) as l:
-            Referral.objects.get = mock.Mock()
-            Referral.objects.get.side_effect = Exception
+            with mock.patch.object(Referral.objects, 'filter', side_effect=Exception):
+                order = self.create_order_model(basket)
 
-            order = self.create_order_model(basket)
             message = 'Referral for Order [{order_id}] failed to save.'.format(order_id=order.id)
             l.check((LOGGER_NAME, 'ERROR', message))
 
+    def place_orders_locking_vouchers(self, voucher, product, num_orders):
+        """ Place orders redeeming the voucher, returning the codes of the vouchers locked while doing so. """
+        # Create the voucher's usage counters, whose creation locks it once, before the orders are placed.
+        record_voucher_usage(voucher)
+        locked_codes = []
+        select_for_update = QuerySet.select_for_update
+
+        def lock(queryset, *args, **kwargs):
+            locked = select_for_update(queryset, *args, **kwargs)
+            if locked.model is Voucher:
+                locked_codes.extend(locked.values_list('code', flat=True))
+            return locked
+
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=lock):
+            for __ in range(num_orders):
+                basket = BasketFactory(owner=self.create_user(), site=self.site)
+                basket.add_product(product)
+                basket.vouchers.add(voucher)
+                create_order(basket=basket, user=basket.owner)
+
+        return locked_codes
+
+    def test_place_order_multi_use_voucher_not_locked(self):
+        """ Verify orders redeeming the same multi-use voucher do not lock it, and so do not wait for each other. """
+        voucher, product = prepare_voucher(usage=Voucher.MULTI_USE)
+
+        self.assertEqual(self.place_orders_locking_vouchers(voucher, product, 2), [])
+        self.assertEqual(voucher.applications.count(), 2)
+
+    @ddt.data(Voucher.SINGLE_USE, Voucher.ONCE_PER_CUSTOMER)
+    def test_place_order_voucher_locked(self, usage):
+        """ Verify orders lock the single-use and once per customer vouchers they redeem. """
+        voucher, product = prepare_voucher(usage=usage)
+
+        self.assertEqual(self.place_orders_locking_vouchers(voucher, product, 1), [voucher.code])
+        self.assertEqual(voucher.applications.count(), 1)
+
 
 @ddt.ddt
 class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
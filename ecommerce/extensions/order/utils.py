@@ -2,14 +2,18 @@
 from __future__ import unicode_literals
 
 import logging
+from decimal import Decimal as D
 
 import waffle
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+from django.utils.translation import ugettext as _
 from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import HttpNotFoundError
 from oscar.apps.order.utils import OrderCreator as OscarOrderCreator
-from oscar.core.loading import get_model
+from oscar.core.loading import get_class, get_model
 from requests.exceptions import ConnectionError, ConnectTimeout  # pylint: disable=ungrouped-imports
 from threadlocals.threadlocals import get_current_request
 
@@ -24,6 +28,9 @@ Option = get_model('catalogue', 'Option')
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
 RefundLine = get_model('refund', 'RefundLine')
+Voucher = get_model('voucher', 'Voucher')
+
+order_placed = get_class('order.signals', 'order_placed')
 
 
 class OrderNumberGenerator(object):
@@ -76,6 +83,74 @@ class OrderNumberGenerator(object):
 
 
 class OrderCreator(OscarOrderCreator):
+    def place_order(self, basket, total, shipping_method, shipping_charge, user=None, shipping_address=None,
+                    billing_address=None, order_number=None, status=None, request=None, **kwargs):
+        """
+        Placing an order involves creating all the relevant models based on the basket and session data.
+
+        This override differs from Oscar's only in checking the basket's vouchers with check_vouchers, which
+        does not lock multi-use vouchers.
+        """
+        if basket.is_empty:
+            raise ValueError(_('Empty baskets cannot be submitted'))
+        if not order_number:
+            order_number = OrderNumberGenerator().order_number(basket)
+        if not status and hasattr(settings, 'OSCAR_INITIAL_ORDER_STATUS'):
+            status = getattr(settings, 'OSCAR_INITIAL_ORDER_STATUS')
+
+        if Order._default_manager.filter(number=order_number).exists():  # pylint: disable=protected-access
+            raise ValueError(_('There is already an order with number %s') % order_number)
+
+        with transaction.atomic():
+            order = self.create_order_model(
+                user, basket, shipping_address, shipping_method, shipping_charge,
+                billing_address, total, order_number, status, request, **kwargs)
+            for line in basket.all_lines():
+                self.create_line_models(order, line)
+                self.update_stock_records(line)
+
+            self.check_vouchers(basket, user)
+
+            # Record any discounts associated with this order
+            for application in basket.offer_applications:
+                # Trigger any deferred benefits from offers and capture the resulting message
+                application['message'] = application['offer'].apply_deferred_benefit(basket, order, application)
+                # Record offer application results
+                if application['result'].affects_shipping:
+                    # Skip zero shipping discounts
+                    shipping_discount = shipping_method.discount(basket)
+                    if shipping_discount <= D('0.00'):
+                        continue
+                    # If a shipping offer, we need to grab the actual discount off the shipping method instance,
+                    # which should be wrapped in an OfferDiscount instance.
+                    application['discount'] = shipping_discount
+                self.create_discount_model(order, application)
+                self.record_discount(application)
+
+            for voucher in basket.vouchers.all():
+                self.record_voucher_usage(order, voucher, user)
+
+        # Send signal for analytics to pick up
+        order_placed.send(sender=self, order=order, user=user)
+
+        return order
+
+    def check_vouchers(self, basket, user):
+        """
+        Raise a ValueError if any of the basket's vouchers may no longer be redeemed by the user.
+
+        Oscar locks every voucher until the order is committed, so that the usage of single-use and once per
+        customer vouchers is checked and recorded by one order at a time. The redemptions of multi-use vouchers
+        are limited by their offers, whose applications are reserved as they are recorded, so these vouchers are
+        checked without being locked, and concurrent orders redeeming the same code do not wait for each other.
+        """
+        vouchers = list(basket.vouchers.filter(usage=Voucher.MULTI_USE))
+        vouchers += list(basket.vouchers.exclude(usage=Voucher.MULTI_USE).select_for_update())
+        for voucher in vouchers:
+            available_to_user, msg = voucher.is_available_to_user(user=user)
+            if not voucher.is_active() or not available_to_user:
+                raise ValueError(msg)
+
     def create_order_model(self, user, basket, shipping_address, shipping_method, shipping_charge, billing_address,
                            total, order_number, status, request=None, **extra_order_fields):
         """
@@ -116,11 +191,9 @@ class OrderCreator(OscarOrderCreator):
         order.save()
 
         try:
-            referral = Referral.objects.get(basket=basket)
-            referral.order = order
-            referral.save()
-        except Referral.DoesNotExist:
-            logger.debug('Order [%d] has no referral associated with its basket.', order.id)
+            # Associate the referral in a single UPDATE, rather than fetching and saving it.
+            if not Referral.objects.filter(basket=basket).update(order=order, modified=now()):
+                logger.debug('Order [%d] has no referral associated with its basket.', order.id)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Referral for Order [%d] failed to save.', order.id)
 
@@ -3,3 +3,9 @@ from oscar.apps.partner import config
 
 class PartnerConfig(config.PartnerConfig):
     name = 'ecommerce.extensions.partner'
+
+    def ready(self):
+        super(PartnerConfig, self).ready()
+
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.partner.signals  # pylint: disable=unused-variable
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.partner.sku_index import invalidate_skus
+from ecommerce.extensions.partner.strategy import get_purchase_info_cache_key
+
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+def _invalidate(partner_skus):
+    """ Invalidate the SKUs now, and again once the transaction commits.
+
+    Invalidating after commit prevents a concurrent request from re-indexing the data as it was before the change.
+    """
+    partner_skus = list(partner_skus)
+    invalidate_skus(partner_skus)
+    transaction.on_commit(lambda: invalidate_skus(partner_skus))
+
+
+def _invalidate_purchase_info(product_ids):
+    """ Invalidate the cached purchase info of products now, and again once the transaction commits. """
+    cache_keys = [get_purchase_info_cache_key(product_id) for product_id in product_ids]
+    cache.delete_many(cache_keys)
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+@receiver(pre_save, sender=StockRecord, dispatch_uid='partner.sku_index.track_previous_sku')
+def track_previous_sku(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Remember the SKU a stock record had before it was saved, so that a renamed SKU is invalidated. """
+    if instance.pk and not raw:
+        instance._previous_partner_sku = StockRecord.objects.filter(  # pylint: disable=protected-access
+            pk=instance.pk
+        ).values_list('partner_id', 'partner_sku').first()
+
+
+@receiver(post_save, sender=StockRecord, dispatch_uid='partner.sku_index.invalidate_stock_record')
+@receiver(post_delete, sender=StockRecord, dispatch_uid='partner.sku_index.invalidate_deleted_stock_record')
+def invalidate_stock_record(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    partner_skus = [(instance.partner_id, instance.partner_sku)]
+    previous = getattr(instance, '_previous_partner_sku', None)
+    if previous:
+        partner_skus.append(previous)
+    _invalidate(partner_skus)
+    _invalidate_purchase_info([instance.product_id])
+
+
+@receiver(post_save, sender=Product, dispatch_uid='partner.sku_index.invalidate_product')
+def invalidate_product(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidate the SKUs of a product's stock records, which include its class, course and expiration date.
+
+    The cached purchase info of the product, and of its children which inherit its class, is also invalidated.
+    """
+    if not created and not raw:
+        _invalidate(instance.stockrecords.values_list('partner_id', 'partner_sku'))
+        _invalidate_purchase_info([instance.id] + list(instance.children.values_list('id', flat=True)))
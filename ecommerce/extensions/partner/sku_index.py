@@ -0,0 +1,140 @@
+"""
+Index of stock record SKUs.
+
+Resolving a SKU normally joins products to their stock records. The index maps each SKU to the data
+needed to add it to a basket and price it, and is held in process memory and in the cache so that
+most lookups do not touch the database. Entries are invalidated by the receivers in
+ecommerce.extensions.partner.signals whenever a stock record or product is saved or deleted.
+"""
+from __future__ import unicode_literals
+
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Coalesce
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import get_cache_key
+
+StockRecord = get_model('partner', 'StockRecord')
+
+SkuRecord = namedtuple('SkuRecord', [
+    'partner_sku', 'partner_id', 'stockrecord_id', 'product_id', 'price_excl_tax', 'price_currency',
+    'product_class', 'course_id', 'expires',
+])
+
+# Maps (partner ID, SKU) to a tuple of the time the entry expires and its SkuRecord.
+_local_index = {}
+LOCAL_INDEX_MAX_SIZE = 10000
+
+
+def _cache_key(partner_id, sku):
+    return get_cache_key(resource='sku_index', partner_id=partner_id, sku=sku)
+
+
+def _get_local(keys):
+    if not settings.SKU_INDEX_LOCAL_TIMEOUT:
+        return {}
+
+    now = time.time()
+    found = {}
+    for key in keys:
+        entry = _local_index.get(key)
+        if entry and entry[0] > now:
+            found[key] = entry[1]
+    return found
+
+
+def _set_local(records):
+    if not settings.SKU_INDEX_LOCAL_TIMEOUT:
+        return
+
+    if len(_local_index) + len(records) > LOCAL_INDEX_MAX_SIZE:
+        _local_index.clear()
+
+    expires = time.time() + settings.SKU_INDEX_LOCAL_TIMEOUT
+    for key, record in records.items():
+        _local_index[key] = (expires, record)
+
+
+def clear_local_index():
+    """ Empty this process's copy of the index. """
+    _local_index.clear()
+
+
+def resolve_skus(skus, partner=None):
+    """ Look up the stock records for the given SKUs.
+
+    Arguments:
+        skus (iterable): SKUs to resolve.
+        partner (Partner): Partner owning the stock records. If None, stock records of any partner
+            match, and the oldest is used when several partners share a SKU.
+
+    Returns:
+        dict: Mapping each SKU that exists to its SkuRecord. Unknown SKUs are omitted.
+    """
+    partner_id = partner.id if partner else None
+    keys = [(partner_id, sku) for sku in set(skus)]
+
+    records = _get_local(keys)
+
+    missing = [key for key in keys if key not in records]
+    if missing:
+        cache_keys = {_cache_key(*key): key for key in missing}
+        cached = {cache_keys[cache_key]: record for cache_key, record in cache.get_many(cache_keys.keys()).items()}
+        _set_local(cached)
+        records.update(cached)
+        missing = [key for key in missing if key not in cached]
+
+    if missing:
+        loaded = _load([sku for __, sku in missing], partner_id)
+        cache.set_many(
+            {_cache_key(*key): record for key, record in loaded.items()}, settings.SKU_INDEX_CACHE_TIMEOUT
+        )
+        _set_local(loaded)
+        records.update(loaded)
+
+    return {sku: record for (__, sku), record in records.items()}
+
+
+def resolve_sku(sku, partner=None):
+    """ Returns the SkuRecord for a single SKU, or None if it does not exist. """
+    return resolve_skus([sku], partner).get(sku)
+
+
+def _load(skus, partner_id):
+    stock_records = StockRecord.objects.filter(partner_sku__in=skus).order_by('-id')
+    if partner_id:
+        stock_records = stock_records.filter(partner_id=partner_id)
+
+    # Child products, such as course seats, have the class of their parent.
+    stock_records = stock_records.annotate(
+        product_class_name=Coalesce('product__product_class__name', 'product__parent__product_class__name')
+    )
+
+    # Records are ordered newest first, so the oldest stock record wins when several share a SKU.
+    return {
+        (partner_id, row[0]): SkuRecord(*row)
+        for row in stock_records.values_list(
+            'partner_sku', 'partner_id', 'id', 'product_id', 'price_excl_tax', 'price_currency',
+            'product_class_name', 'product__course_id', 'product__expires',
+        )
+    }
+
+
+def invalidate_skus(partner_skus):
+    """ Remove entries from the index.
+
+    Arguments:
+        partner_skus (iterable): (partner ID, SKU) tuples identifying the stock records which changed.
+    """
+    keys = set()
+    for partner_id, sku in partner_skus:
+        # Lookups which are not scoped to a partner are indexed separately, and also need to be removed.
+        keys.update([(partner_id, sku), (None, sku)])
+
+    for key in keys:
+        _local_index.pop(key, None)
+    cache.delete_many([_cache_key(*key) for key in keys])
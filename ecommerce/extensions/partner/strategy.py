@@ -1,8 +1,32 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
+from django.utils.functional import cached_property
 from oscar.apps.partner import availability, strategy
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import get_cache_key
+
+
+def get_purchase_info_cache_key(product_id):
+    return get_cache_key(resource='purchase_info', product_id=product_id)
+
+
+def _detach(stockrecord):
+    """ Returns a copy of the stock record without the related objects cached on it, which may not be picklable. """
+    if stockrecord is None:
+        return None
+
+    fields = {
+        field.attname: getattr(stockrecord, field.attname)
+        for field in stockrecord._meta.concrete_fields  # pylint: disable=protected-access
+    }
+    detached = type(stockrecord)(**fields)
+    detached._state.adding = False  # pylint: disable=protected-access
+    detached._state.db = stockrecord._state.db  # pylint: disable=protected-access
+    return detached
 
 
 class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
@@ -13,11 +37,15 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
     Parent seats are never available.
     """
 
-    @property
+    @cached_property
     def seat_class(self):
         ProductClass = get_model('catalogue', 'ProductClass')
         return ProductClass.objects.get(name=SEAT_PRODUCT_CLASS_NAME)
 
+    def tracks_stock(self, product):
+        """ Returns True if stock levels are tracked for the product's class. """
+        return product.get_product_class().track_stock
+
     def availability_policy(self, product, stockrecord):
         """ A product is unavailable for non-admin users if the current date is
         beyond the product's expiration date. Products are always available for admin users.
@@ -26,12 +54,101 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
         is_staff = getattr(self.user, 'is_staff', False)
         is_available = product.expires is None or (product.expires >= timezone.now())
         if is_staff or is_available:
-            return super(CourseSeatAvailabilityPolicyMixin, self).availability_policy(product, stockrecord)
+            if not stockrecord:
+                return availability.Unavailable()
+            if not self.tracks_stock(product):
+                return availability.Available()
+            return availability.StockRequired(stockrecord.net_stock_level)
         else:
             return availability.Unavailable()
 
 
-class DefaultStrategy(strategy.UseFirstStockRecord, CourseSeatAvailabilityPolicyMixin,
+class CachedPurchaseInfoMixin(object):
+    """
+    Memoizes the purchase info of products for the lifetime of the strategy, which is a single request.
+
+    The stock record of a product, and whether its class tracks stock, do not depend on the user. For
+    products whose class does not track stock they are also cached across requests, until
+    PURCHASE_INFO_CACHE_TIMEOUT elapses or the product expires, whichever is sooner. Cached entries are
+    invalidated by the receivers in ecommerce.extensions.partner.signals.
+    """
+
+    def __init__(self, request=None):
+        super(CachedPurchaseInfoMixin, self).__init__(request)
+        self._purchase_info = {}
+        # Maps product IDs to a tuple of the selected stock record and whether the product's class tracks stock.
+        self._stock_data = {}
+
+    def fetch_for_product(self, product, stockrecord=None):
+        if stockrecord is not None:
+            return super(CachedPurchaseInfoMixin, self).fetch_for_product(product, stockrecord)
+
+        info = self._purchase_info.get(product.id)
+        if info is None:
+            info = self._purchase_info[product.id] = super(CachedPurchaseInfoMixin, self).fetch_for_product(product)
+        return info
+
+    def fetch_for_products(self, products):
+        """ Fetch the purchase info of several products, loading their stock records in bulk.
+
+        Arguments:
+            products (iterable): Products to fetch purchase info for.
+
+        Returns:
+            dict: Mapping product IDs to PurchaseInfo.
+        """
+        products = list(products)
+        self._load_stock_data([product for product in products if product.id not in self._purchase_info])
+        return {product.id: self.fetch_for_product(product) for product in products}
+
+    def select_stockrecord(self, product):
+        return self._get_stock_data(product)[0]
+
+    def tracks_stock(self, product):
+        stock_data = self._stock_data.get(product.id)
+        if stock_data is None:
+            return super(CachedPurchaseInfoMixin, self).tracks_stock(product)
+        return stock_data[1]
+
+    def _get_stock_data(self, product):
+        if product.id not in self._stock_data:
+            self._load_stock_data([product])
+        return self._stock_data[product.id]
+
+    def _load_stock_data(self, products):
+        products = [product for product in products if product.id not in self._stock_data]
+        if not products:
+            return
+
+        cache_keys = {get_purchase_info_cache_key(product.id): product.id for product in products}
+        for cache_key, stock_data in cache.get_many(cache_keys.keys()).items():
+            self._stock_data[cache_keys[cache_key]] = stock_data
+
+        missing = [product for product in products if product.id not in self._stock_data]
+        if len(missing) > 1:
+            # Child products have no class of their own, so only their parents' classes are fetched.
+            prefetch_related_objects(missing, 'stockrecords')
+            prefetch_related_objects([product for product in missing if product.product_class_id], 'product_class')
+            prefetch_related_objects([product for product in missing if product.parent_id], 'parent__product_class')
+
+        for product in missing:
+            stockrecord = super(CachedPurchaseInfoMixin, self).select_stockrecord(product)
+            tracks_stock = product.get_product_class().track_stock
+            stock_data = self._stock_data[product.id] = (stockrecord, tracks_stock)
+
+            # Stock levels change with every purchase, so stock records of products tracking stock are not cached.
+            timeout = self._get_cache_timeout(product)
+            if not tracks_stock and timeout > 0:
+                cache.set(get_purchase_info_cache_key(product.id), (_detach(stockrecord), tracks_stock), timeout)
+
+    def _get_cache_timeout(self, product):
+        timeout = settings.PURCHASE_INFO_CACHE_TIMEOUT
+        if product.expires:
+            timeout = min(timeout, int((product.expires - timezone.now()).total_seconds()))
+        return timeout
+
+
+class DefaultStrategy(CachedPurchaseInfoMixin, strategy.UseFirstStockRecord, CourseSeatAvailabilityPolicyMixin,
                       strategy.NoTax, strategy.Structured):
     pass
 
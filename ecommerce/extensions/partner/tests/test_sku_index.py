@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.partner import sku_index
+from ecommerce.tests.factories import PartnerFactory
+from ecommerce.tests.testcases import TestCase
+
+
+class SkuIndexTests(DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(SkuIndexTests, self).setUp()
+        self.course = CourseFactory(id='a/b/c', name='Demo Course', site=self.site)
+        self.seat = self.course.create_or_update_seat('verified', True, 50, self.partner)
+        self.stock_record = self.seat.stockrecords.first()
+        self.sku = self.stock_record.partner_sku
+
+    def test_resolve_skus(self):
+        """ Verify SKUs resolve to the data of their stock records, and unknown SKUs are omitted. """
+        records = sku_index.resolve_skus([self.sku, 'unknown'], self.partner)
+
+        self.assertEqual(records.keys(), [self.sku])
+        record = records[self.sku]
+        self.assertEqual(record.product_id, self.seat.id)
+        self.assertEqual(record.stockrecord_id, self.stock_record.id)
+        self.assertEqual(record.price_excl_tax, Decimal('50.00'))
+        self.assertEqual(record.price_currency, self.stock_record.price_currency)
+        self.assertEqual(record.product_class, self.seat.get_product_class().name)
+        self.assertEqual(record.course_id, self.course.id)
+
+    def test_resolve_skus_partner_scope(self):
+        """ Verify lookups scoped to a partner do not return other partners' stock records. """
+        self.assertEqual(sku_index.resolve_skus([self.sku], PartnerFactory()), {})
+        self.assertIsNotNone(sku_index.resolve_sku(self.sku))
+
+    def test_resolve_skus_cached(self):
+        """ Verify resolved SKUs are served from the cache. """
+        sku_index.resolve_skus([self.sku], self.partner)
+
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(sku_index.resolve_sku(self.sku, self.partner))
+
+    @override_settings(SKU_INDEX_LOCAL_TIMEOUT=60)
+    def test_resolve_skus_local(self):
+        """ Verify resolved SKUs are held in process memory. """
+        self.addCleanup(sku_index.clear_local_index)
+        sku_index.resolve_skus([self.sku], self.partner)
+
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(sku_index.resolve_sku(self.sku, self.partner))
+
+    @override_settings(SKU_INDEX_LOCAL_TIMEOUT=60)
+    def test_stock_record_changes(self):
+        """ Verify saving or deleting a stock record invalidates its SKU, including a SKU it was renamed from. """
+        self.addCleanup(sku_index.clear_local_index)
+        sku_index.resolve_sku(self.sku, self.partner)
+
+        self.stock_record.price_excl_tax = Decimal('75.00')
+        self.stock_record.save()
+        self.assertEqual(sku_index.resolve_sku(self.sku, self.partner).price_excl_tax, Decimal('75.00'))
+
+        self.stock_record.partner_sku = 'renamed'
+        self.stock_record.save()
+        self.assertIsNone(sku_index.resolve_sku(self.sku, self.partner))
+        self.assertIsNotNone(sku_index.resolve_sku('renamed', self.partner))
+
+        self.stock_record.delete()
+        self.assertIsNone(sku_index.resolve_sku('renamed', self.partner))
+
+    def test_product_changes(self):
+        """ Verify saving a product invalidates the SKUs of its stock records. """
+        sku_index.resolve_sku(self.sku)
+
+        other_course = CourseFactory(id='d/e/f', name='Other Course', site=self.site)
+        self.seat.course = other_course
+        self.seat.save()
+        self.assertEqual(sku_index.resolve_sku(self.sku).course_id, other_course.id)
@@ -1,15 +1,20 @@
 import datetime
+from decimal import Decimal
 
 import ddt
 import pytz
+from django.core.cache import cache
 from django.test import RequestFactory
 from oscar.apps.partner import availability
+from oscar.core.loading import get_model
 
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
-from ecommerce.extensions.partner.strategy import DefaultStrategy, Selector
+from ecommerce.extensions.partner.strategy import DefaultStrategy, Selector, get_purchase_info_cache_key
 from ecommerce.tests.testcases import TestCase
 
+Product = get_model('catalogue', 'Product')
+
 
 @ddt.ddt
 class DefaultStrategyTests(DiscoveryTestMixin, TestCase):
@@ -65,6 +70,62 @@ class DefaultStrategyTests(DiscoveryTestMixin, TestCase):
         actual = strategy.availability_policy(product, stock_record)
         self.assertIsInstance(actual, available)
 
+    def test_fetch_for_product_memoized(self):
+        """ Verify purchase info is computed once per strategy. """
+        info = self.strategy.fetch_for_product(self.honor_seat)
+
+        with self.assertNumQueries(0):
+            self.assertIs(self.strategy.fetch_for_product(self.honor_seat), info)
+
+    def test_fetch_for_product_cached(self):
+        """ Verify the stock records of products which do not track stock are cached across strategies. """
+        self.strategy.fetch_for_product(self.honor_seat)
+        product = Product.objects.get(id=self.honor_seat.id)
+
+        with self.assertNumQueries(0):
+            info = DefaultStrategy().fetch_for_product(product)
+
+        self.assertEqual(info.stockrecord, self.honor_seat.stockrecords.first())
+        self.assertTrue(info.availability.is_available_to_buy)
+
+    def test_fetch_for_products(self):
+        """ Verify purchase info is fetched for each of the given products. """
+        verified_seat = self.honor_seat.course.create_or_update_seat('verified', True, 50, self.partner)
+        products = list(Product.objects.filter(id__in=[self.honor_seat.id, verified_seat.id]))
+
+        infos = self.strategy.fetch_for_products(products)
+
+        self.assertEqual(infos[self.honor_seat.id].price.excl_tax, Decimal('0.00'))
+        self.assertEqual(infos[verified_seat.id].price.excl_tax, Decimal('50.00'))
+        with self.assertNumQueries(0):
+            self.strategy.fetch_for_product(verified_seat)
+
+    def test_stock_record_changes(self):
+        """ Verify saving a stock record invalidates the cached purchase info of its product. """
+        self.strategy.fetch_for_product(self.honor_seat)
+
+        stock_record = self.honor_seat.stockrecords.first()
+        stock_record.price_excl_tax = Decimal('10.00')
+        stock_record.save()
+
+        self.assertEqual(DefaultStrategy().fetch_for_product(self.honor_seat).price.excl_tax, Decimal('10.00'))
+
+    def test_not_cached(self):
+        """ Verify the purchase info of expired products, and of products tracking stock, is not cached. """
+        self.honor_seat.expires = pytz.utc.localize(datetime.datetime.min)
+        self.honor_seat.save()
+        self.strategy.fetch_for_product(self.honor_seat)
+        self.assertIsNone(cache.get(get_purchase_info_cache_key(self.honor_seat.id)))
+
+        seat_product_class = self.seat_product_class
+        seat_product_class.track_stock = True
+        seat_product_class.save()
+        product = Product.objects.get(id=self.honor_seat.id)
+        product.expires = None
+        info = DefaultStrategy().fetch_for_product(product)
+        self.assertIsInstance(info.availability, availability.StockRequired)
+        self.assertIsNone(cache.get(get_purchase_info_cache_key(product.id)))
+
 
 class SelectorTests(TestCase):
     def test_strategy(self):
@@ -8,6 +8,9 @@ from django.conf import settings
 
 from ecommerce.extensions.payment import exceptions
 
+# Paths of the processor classes found so far, by PAYMENT_PROCESSORS setting and processor name.
+_processor_paths = {}
+
 
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
@@ -56,8 +59,18 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
+    # Processor modules are only imported until the processor is found, and once found, only its own module
+    # is looked up again. The class is looked up on every call, so that patched processor classes are used.
+    paths = _processor_paths.setdefault(tuple(settings.PAYMENT_PROCESSORS), {})
+    if name in paths:
+        return get_processor_class(paths[name])
+
     for path in settings.PAYMENT_PROCESSORS:
+        if path in paths.values():
+            continue
+
         processor_class = get_processor_class(path)
+        paths[processor_class.NAME] = path
 
         if name == processor_class.NAME:
             return processor_class
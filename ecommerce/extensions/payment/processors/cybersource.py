@@ -12,12 +12,10 @@ from django.conf import settings
 from django.urls import reverse
 from oscar.apps.payment.exceptions import GatewayError, TransactionDeclined, UserCancelled
 from oscar.core.loading import get_class
-from zeep import Client
-from zeep.helpers import serialize_object
-from zeep.wsse import UsernameToken
 
 from ecommerce.core.constants import ISO_8601_FORMAT
 from ecommerce.core.url_utils import get_ecommerce_url
+from ecommerce.core.utils import lazy_import
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.payment.constants import APPLE_PAY_CYBERSOURCE_CARD_TYPE_MAP, CYBERSOURCE_CARD_TYPE_MAP
 from ecommerce.extensions.payment.exceptions import (
@@ -34,9 +32,11 @@ from ecommerce.extensions.payment.processors import (
     BaseClientSidePaymentProcessor,
     HandledProcessorResponse
 )
+from ecommerce.extensions.payment.soap import get_soap_client
 from ecommerce.extensions.payment.utils import clean_field_value
 
 logger = logging.getLogger(__name__)
+zeep_helpers = lazy_import('zeep.helpers')
 
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 
@@ -103,6 +103,11 @@ class Cybersource(ApplePayMixin, BaseClientSidePaymentProcessor):
     def client_side_payment_url(self):
         return self.sop_payment_page_url
 
+    @property
+    def soap_client(self):
+        """ SOAP client for the Simple Order API, shared by all instances using the same merchant credentials. """
+        return get_soap_client(self.soap_api_url, self.merchant_id, self.transaction_key)
+
     def get_transaction_parameters(self, basket, request=None, use_client_side_checkout=False, **kwargs):
         """
         Generate a dictionary of signed parameters CyberSource requires to complete a transaction.
@@ -340,7 +345,7 @@ class Cybersource(ApplePayMixin, BaseClientSidePaymentProcessor):
 
     def issue_credit(self, order_number, basket, reference_number, amount, currency):
         try:
-            client = Client(self.soap_api_url, wsse=UsernameToken(self.merchant_id, self.transaction_key))
+            client = self.soap_client
 
             credit_service = {
                 'captureRequestID': reference_number,
@@ -360,7 +365,7 @@ class Cybersource(ApplePayMixin, BaseClientSidePaymentProcessor):
             )
 
             request_id = response.requestID
-            ppr = self.record_processor_response(serialize_object(response), transaction_id=request_id,
+            ppr = self.record_processor_response(zeep_helpers.serialize_object(response), transaction_id=request_id,
                                                  basket=basket)
         except:
             msg = 'An error occurred while attempting to issue a credit (via CyberSource) for order [{}].'.format(
@@ -395,7 +400,7 @@ class Cybersource(ApplePayMixin, BaseClientSidePaymentProcessor):
             GatewayError
         """
         try:
-            client = Client(self.soap_api_url, wsse=UsernameToken(self.merchant_id, self.transaction_key))
+            client = self.soap_client
             card_type = APPLE_PAY_CYBERSOURCE_CARD_TYPE_MAP[payment_token['paymentMethod']['network'].lower()]
             bill_to = {
                 'firstName': billing_address.first_name,
@@ -461,7 +466,9 @@ class Cybersource(ApplePayMixin, BaseClientSidePaymentProcessor):
             raise GatewayError(msg)
 
         request_id = response.requestID
-        ppr = self.record_processor_response(serialize_object(response), transaction_id=request_id, basket=basket)
+        ppr = self.record_processor_response(
+            zeep_helpers.serialize_object(response), transaction_id=request_id, basket=basket
+        )
 
         if response.decision == 'ACCEPT':
             currency = basket.currency
@@ -3,6 +3,7 @@ from oscar.core.loading import get_model
 
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.processors import BasePaymentProcessor
+from ecommerce.extensions.payment.utils import get_payment_type
 from ecommerce.invoice.models import Invoice
 
 PaymentEvent = get_model('order', 'PaymentEvent')
@@ -25,11 +26,10 @@ class InvoicePayment(BasePaymentProcessor):
         Create a new invoice record and return the source and event.
         """
 
-        source_type, __ = SourceType.objects.get_or_create(name=self.NAME)
+        source_type = get_payment_type(SourceType, self.NAME)
         source = Source(source_type=source_type, label='Invoice')
 
-        event_type, __ = PaymentEventType.objects.get_or_create(
-            name=PaymentEventTypeName.PAID)
+        event_type = get_payment_type(PaymentEventType, PaymentEventTypeName.PAID)
         event = PaymentEvent(event_type=event_type, processor_name=self.NAME)
 
         invoice = Invoice.objects.create(order=order, business_client=business_client)
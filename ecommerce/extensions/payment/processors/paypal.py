@@ -7,7 +7,6 @@ import uuid
 from decimal import Decimal
 from urlparse import urljoin
 
-import paypalrestsdk
 import waffle
 from django.conf import settings
 from django.urls import reverse
@@ -16,12 +15,14 @@ from django.utils.translation import get_language
 from oscar.apps.payment.exceptions import GatewayError
 
 from ecommerce.core.url_utils import get_ecommerce_url
+from ecommerce.core.utils import lazy_import
 from ecommerce.extensions.payment.constants import PAYPAL_LOCALES
 from ecommerce.extensions.payment.models import PaypalProcessorConfiguration, PaypalWebProfile
 from ecommerce.extensions.payment.processors import BasePaymentProcessor, HandledProcessorResponse
 from ecommerce.extensions.payment.utils import middle_truncate
 
 logger = logging.getLogger(__name__)
+paypalrestsdk = lazy_import('paypalrestsdk')
 
 
 class Paypal(BasePaymentProcessor):
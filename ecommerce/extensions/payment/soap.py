@@ -0,0 +1,78 @@
+"""
+Long-lived SOAP clients.
+
+Building a zeep client downloads and parses the service's WSDL and XSD documents, which for CyberSource takes
+longer than the transaction itself. Clients are therefore built once per process for each WSDL and set of
+credentials, and shared by all threads. The documents are persisted to a local file cache, so that new
+processes do not download them either, and every client sends its requests through one pooled session.
+
+zeep is imported when the first client is built, rather than by every process importing the payment processors.
+"""
+from __future__ import unicode_literals
+
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter  # pylint: disable=ungrouped-imports
+
+_clients = {}
+_transport = None
+_lock = threading.Lock()
+
+
+def _get_transport():
+    global _transport  # pylint: disable=global-statement
+    if _transport is None:
+        from zeep.cache import SqliteCache
+        from zeep.transports import Transport
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.SOAP_CLIENT_POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        kwargs = {'timeout': settings.SOAP_WSDL_CACHE_TIMEOUT}
+        if settings.SOAP_WSDL_CACHE_PATH:
+            kwargs['path'] = settings.SOAP_WSDL_CACHE_PATH
+
+        _transport = Transport(
+            cache=SqliteCache(**kwargs),
+            session=session,
+            operation_timeout=settings.SOAP_OPERATION_TIMEOUT
+        )
+    return _transport
+
+
+def get_soap_client(wsdl_url, username, password):
+    """ Returns a SOAP client for a WSDL, authenticating with a WS-Security username token.
+
+    Arguments:
+        wsdl_url (str): URL of the service's WSDL.
+        username (str): WS-Security username, such as a CyberSource merchant ID.
+        password (str): WS-Security password, such as a CyberSource transaction key.
+
+    Returns:
+        zeep.Client
+    """
+    key = (wsdl_url, username, password)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            # Another thread may have built the client while this one waited for the lock.
+            client = _clients.get(key)
+            if client is None:
+                from zeep import Client
+                from zeep.wsse import UsernameToken
+
+                client = Client(wsdl_url, wsse=UsernameToken(username, password), transport=_get_transport())
+                _clients[key] = client
+    return client
+
+
+def clear_soap_clients():
+    """ Discard the clients, and their transport, so that they are built again when next requested. """
+    global _transport  # pylint: disable=global-statement
+    with _lock:
+        _clients.clear()
+        _transport = None
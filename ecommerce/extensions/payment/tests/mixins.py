@@ -25,6 +25,7 @@ from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.payment.constants import CARD_TYPES
 from ecommerce.extensions.payment.helpers import sign
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.soap import clear_soap_clients
 from ecommerce.extensions.test.factories import create_basket
 
 CURRENCY = 'USD'
@@ -212,6 +213,9 @@ class CybersourceMixin(PaymentEventsMixin):
         return notification
 
     def mock_cybersource_wsdl(self):
+        # Clients built by earlier tests would not request the mocked documents.
+        clear_soap_clients()
+        self.addCleanup(clear_soap_clients)
         files = ('CyberSourceTransaction_1.115.wsdl', 'CyberSourceTransaction_1.115.xsd')
 
         for filename in files:
@@ -1,4 +1,5 @@
 import ddt
+import mock
 from django.test import override_settings
 
 from ecommerce.extensions.payment import helpers
@@ -34,6 +35,15 @@ class HelperTests(TestCase):
         """
         self.assertRaises(ProcessorNotFoundError, helpers.get_processor_class_by_name, 'foo')
 
+    def test_get_processor_class_by_name_lazy(self):
+        """ Verify processors after the one requested are not imported, and only its own class is looked up again. """
+        with mock.patch.object(helpers, 'get_processor_class', wraps=helpers.get_processor_class) as lookup:
+            self.assertIs(helpers.get_processor_class_by_name(DummyProcessor.NAME), DummyProcessor)
+            self.assertIs(helpers.get_processor_class_by_name(DummyProcessor.NAME), DummyProcessor)
+
+        self.assertEqual(lookup.call_count, 2)
+        lookup.assert_called_with('ecommerce.extensions.payment.tests.processors.DummyProcessor')
+
     def test_sign(self):
         """ Verify the function returns a valid HMAC SHA-256 signature. """
         message = "This is a super-secret message!"
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+import responses
+from django.conf import settings
+from django.test import override_settings
+
+from ecommerce.extensions.payment.soap import clear_soap_clients, get_soap_client
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
+from ecommerce.tests.testcases import TestCase
+
+WSDL_URL = settings.PAYMENT_PROCESSOR_CONFIG['edx']['cybersource']['soap_api_url']
+
+
+class SoapClientTests(CybersourceMixin, TestCase):
+    def setUp(self):
+        super(SoapClientTests, self).setUp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        override = override_settings(SOAP_WSDL_CACHE_PATH=os.path.join(cache_dir, 'wsdl.db'))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    @responses.activate
+    def test_client_reused(self):
+        """ Verify one client is built for each set of credentials. """
+        self.mock_cybersource_wsdl()
+
+        client = get_soap_client(WSDL_URL, 'merchant', 'key')
+        self.assertIs(get_soap_client(WSDL_URL, 'merchant', 'key'), client)
+        self.assertIsNot(get_soap_client(WSDL_URL, 'other-merchant', 'key'), client)
+
+    @responses.activate
+    def test_documents_cached(self):
+        """ Verify the WSDL and XSD documents are only downloaded once, even by new clients. """
+        self.mock_cybersource_wsdl()
+
+        get_soap_client(WSDL_URL, 'merchant', 'key')
+        downloads = len(responses.calls)
+        self.assertGreater(downloads, 0)
+
+        clear_soap_clients()
+        get_soap_client(WSDL_URL, 'merchant', 'key')
+        self.assertEqual(len(responses.calls), downloads)
@@ -7,14 +7,23 @@ import httpretty
 import mock
 from django.conf import settings
 from django.test import override_settings
+from oscar.core.loading import get_model
 from oscar.test import factories
 from requests.exceptions import HTTPError, Timeout
 
 from ecommerce.core.models import User
 from ecommerce.extensions.payment.models import SDNCheckFailure
-from ecommerce.extensions.payment.utils import SDNClient, clean_field_value, middle_truncate
+from ecommerce.extensions.payment.utils import (
+    SDNClient,
+    clean_field_value,
+    clear_payment_types,
+    get_payment_type,
+    middle_truncate
+)
 from ecommerce.tests.testcases import TestCase
 
+SourceType = get_model('payment', 'SourceType')
+
 
 class UtilsTests(TestCase):
     def test_truncation(self):
@@ -37,6 +46,16 @@ class UtilsTests(TestCase):
         value = 'Some^text:\'test-value'
         self.assertEqual(clean_field_value(value), 'Sometexttest-value')
 
+    @override_settings(PAYMENT_TYPE_LOCAL_CACHE=True)
+    def test_get_payment_type(self):
+        """ Verify existing payment types are read from the database once, and then from the per-process cache. """
+        self.addCleanup(clear_payment_types)
+        source_type = SourceType.objects.create(name='dummy')
+        self.assertEqual(get_payment_type(SourceType, 'dummy'), source_type)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_payment_type(SourceType, 'dummy'), source_type)
+
 
 class SDNCheckTests(TestCase):
     """ Tests for the SDN check function. """
@@ -123,6 +142,25 @@ class SDNCheckTests(TestCase):
         response = self.sdn_validator.search(self.name, self.city, self.country)
         self.assertEqual(response, sdn_response)
 
+    @httpretty.activate
+    def test_sdn_check_cached(self):
+        """ Verify results are cached by normalized name, city and country. """
+        sdn_response = {'total': 0}
+        self.mock_sdn_response(json.dumps(sdn_response))
+
+        self.assertEqual(self.sdn_validator.search(self.name, self.city, self.country), sdn_response)
+        self.assertEqual(
+            self.sdn_validator.search(' {} '.format(self.name.upper()), self.city.lower(), self.country), sdn_response
+        )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+    @httpretty.activate
+    def test_sdn_check_async(self):
+        """ Verify searches started in another thread return their results when awaited. """
+        sdn_response = {'total': 1}
+        self.mock_sdn_response(json.dumps(sdn_response))
+        self.assertEqual(self.sdn_validator.search_async(self.name, self.city, self.country)(), sdn_response)
+
     def test_deactivate_user(self):
         """ Verify an SDN failure is logged. """
         response = {'description': 'Bad dude.'}
@@ -18,6 +18,7 @@ from ecommerce.core.tests import toggle_switch
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.payment.tests.mixins import PaymentEventsMixin, PaypalMixin
 from ecommerce.extensions.payment.views.paypal import PaypalPaymentExecutionView
@@ -273,6 +274,18 @@ class PaypalPaymentExecutionViewTests(PaypalMixin, PaymentEventsMixin, TestCase)
             self._assert_order_placement_failure(error_message)
             self.assertTrue(fake_handle_order_placement.called)
 
+    def test_offer_application_limit_reached(self):
+        """ Verify the payment is refunded, and the user redirected to the error page, if an offer applied to the
+        basket has reached its maximum number of applications. """
+        with mock.patch.object(PaypalPaymentExecutionView, 'place_order', side_effect=OfferApplicationLimitReached):
+            with mock.patch.object(Paypal, 'issue_credit') as fake_issue_credit:
+                self._assert_execution_redirect(url_redirect=self.processor.error_url)
+
+        fake_issue_credit.assert_called_once_with(
+            self.basket.order_number, mock.ANY, self.PAYMENT_ID, self.basket.total_incl_tax, self.basket.currency
+        )
+        self.assertFalse(Order.objects.filter(number=self.basket.order_number).exists())
+
     @responses.activate
     def test_payment_error_with_duplicate_payment_id(self):
         """
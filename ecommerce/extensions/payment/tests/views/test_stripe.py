@@ -1,10 +1,12 @@
 import json
+from decimal import Decimal
 
 import stripe
 from django.conf import settings
 from django.urls import reverse
 from mock import mock
 from oscar.core.loading import get_class, get_model
+from oscar.test import factories
 from oscar.test.factories import BillingAddressFactory
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, ENROLLMENT_CODE_SWITCH
@@ -13,6 +15,7 @@ from ecommerce.core.tests import toggle_switch
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.offer.redemptions import record_offer_usage
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.constants import STRIPE_CARD_TYPE_MAP
 from ecommerce.extensions.payment.processors.stripe import Stripe
@@ -21,6 +24,8 @@ from ecommerce.extensions.test.factories import create_basket
 from ecommerce.invoice.models import Invoice
 from ecommerce.tests.testcases import TestCase
 
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Country = get_model('address', 'Country')
 Order = get_model('order', 'Order')
 PaymentEvent = get_model('order', 'PaymentEvent')
@@ -142,6 +147,40 @@ class StripeSubmitViewTests(PaymentEventsMixin, TestCase):
         self.assert_successful_order_response(response, basket.order_number)
         self.assert_order_created(basket, billing_address, card_type, label)
 
+    def test_offer_application_limit_reached(self):
+        """ Verify the payment is refunded, and no order placed, if an offer applied to the basket has reached its
+        maximum number of applications since the basket was priced. """
+        _range = factories.RangeFactory(includes_all_products=True)
+        offer = factories.ConditionalOfferFactory(
+            offer_type=ConditionalOffer.SITE,
+            benefit=factories.BenefitFactory(range=_range),
+            condition=factories.ConditionFactory(type=Condition.COVERAGE, value=1, range=_range),
+            max_global_applications=1
+        )
+        basket = self.create_basket()
+        charge = stripe.Charge.construct_from({
+            'id': '2404',
+            'source': {
+                'brand': 'American Express',
+                'last4': '1986',
+            },
+        }, 'fake-key')
+
+        def create_charge(**kwargs):  # pylint: disable=unused-argument
+            # Another order takes the offer's last application while the card is charged.
+            record_offer_usage(offer, 1, Decimal(1))
+            return charge
+
+        with mock.patch.object(Stripe, 'get_address_from_token', mock.Mock(return_value=BillingAddressFactory())):
+            with mock.patch.object(stripe.Charge, 'create', mock.Mock(side_effect=create_charge)):
+                with mock.patch.object(stripe.Refund, 'create') as refund_mock:
+                    refund_mock.return_value = stripe.Refund.construct_from({'id': '946'}, 'fake-key')
+                    response = self.client.post(self.path, self.generate_form_data(basket.id))
+
+        assert response.status_code == 400
+        refund_mock.assert_called_once_with(charge=charge.id)
+        assert not Order.objects.filter(number=basket.order_number).exists()
+
     def test_successful_payment_for_bulk_purchase(self):
         """
         Verify that when a Order has been successfully placed for bulk
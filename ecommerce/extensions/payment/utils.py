@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 import re
@@ -5,16 +6,24 @@ from urllib import urlencode
 
 import requests
 from django.conf import settings
+from django.db import transaction
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_model
+from requests.adapters import HTTPAdapter  # pylint: disable=ungrouped-imports
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import call_collapsed, get_cache_key, run_in_thread
 from ecommerce.extensions.analytics.utils import parse_tracking_context
 from ecommerce.extensions.payment.models import SDNCheckFailure
 
 logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
 
+_sdn_session = None
+
+# Rows of lookup models, such as SourceType, by model and name. See get_payment_type.
+_payment_types = {}
+
 
 def middle_truncate(string, chars):
     """Truncate the provided string, if necessary.
@@ -68,6 +77,34 @@ def clean_field_value(value):
     return re.sub(r'[\^:"\']', '', value)
 
 
+def get_payment_type(model, name):
+    """ Returns the row of a lookup model, such as SourceType or PaymentEventType, with the given name.
+
+    The row is created if it does not exist. Rows are kept by the process, when PAYMENT_TYPE_LOCAL_CACHE is
+    enabled, so that placing an order does not query for them. Rows created by a transaction are only kept
+    once it is committed.
+
+    Arguments:
+        model (Model): Lookup model, whose rows are identified by their name.
+        name (str): Name of the row.
+    """
+    key = (model, name)
+    payment_type = _payment_types.get(key) if settings.PAYMENT_TYPE_LOCAL_CACHE else None
+    if payment_type is None:
+        payment_type, created = model.objects.get_or_create(name=name)
+        if settings.PAYMENT_TYPE_LOCAL_CACHE:
+            if created:
+                transaction.on_commit(lambda: _payment_types.__setitem__(key, payment_type))
+            else:
+                _payment_types[key] = payment_type
+    return payment_type
+
+
+def clear_payment_types():
+    """ Forget the lookup rows kept by this process. """
+    _payment_types.clear()
+
+
 def embargo_check(user, site, products):
     """ Checks if the user has access to purchase products by calling the LMS embargo API.
 
@@ -92,10 +129,22 @@ def embargo_check(user, site, products):
             'ip_address': ip,
             'course_ids': courses
         }
+        # Results are cached briefly, so that reloading the basket does not call the API again.
+        cache_key = get_cache_key(
+            site_domain=site.domain,
+            resource='embargo_check',
+            user=user.username,
+            ip_address=ip,
+            course_ids=','.join(sorted(courses))
+        )
 
         try:
-            response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
-            return response.get('access', True)
+            return call_collapsed(
+                cache_key,
+                lambda: site.siteconfiguration.embargo_api_client.course_access.get(**params).get('access', True),
+                settings.EMBARGO_CHECK_CACHE_TIMEOUT,
+                settings.EMBARGO_CHECK_COLLAPSE_TIMEOUT
+            )
         except:  # pylint: disable=bare-except
             # We are going to allow purchase if the API is un-reachable.
             pass
@@ -103,6 +152,18 @@ def embargo_check(user, site, products):
     return True
 
 
+def _get_sdn_session():
+    """ Returns the session through which SDN checks are sent, shared by all threads of the process. """
+    global _sdn_session  # pylint: disable=global-statement
+    if _sdn_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.SDN_CHECK_POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _sdn_session = session
+    return _sdn_session
+
+
 class SDNClient(object):
     """A utility class that handles SDN related operations."""
     def __init__(self, api_url, api_key, sdn_list):
@@ -118,6 +179,9 @@ class SDNClient(object):
             * SDN API returns a non-200 status code response
             * user is not found on the SDN list
 
+        Results are cached for SDN_CHECK_CACHE_TIMEOUT seconds, by normalized name, city and country, so that
+        payment form retries do not search again.
+
         Args:
             name (str): Individual's full name.
             city (str): Individual's city.
@@ -125,6 +189,30 @@ class SDNClient(object):
         Returns:
             dict: SDN API response.
         """
+        # The name and city are hashed, as they may contain non-ASCII characters.
+        query = '|'.join(' '.join(unicode(value).lower().split()) for value in (name, city, country))
+        cache_key = get_cache_key(
+            resource='sdn_check',
+            api_url=self.api_url,
+            sdn_list=self.sdn_list,
+            query=hashlib.md5(query.encode('utf-8')).hexdigest()
+        )
+        return call_collapsed(
+            cache_key,
+            lambda: self._search(name, city, country),
+            settings.SDN_CHECK_CACHE_TIMEOUT,
+            settings.SDN_CHECK_REQUEST_TIMEOUT
+        )
+
+    def search_async(self, name, city, country):
+        """ Start a search in a new thread.
+
+        Returns:
+            callable: Waits for the search to complete, and returns its results or raises its exception.
+        """
+        return run_in_thread(self.search, name, city, country)
+
+    def _search(self, name, city, country):
         params = urlencode({
             'sources': self.sdn_list,
             'api_key': self.api_key,
@@ -141,7 +229,7 @@ class SDNClient(object):
         )
 
         try:
-            response = requests.get(sdn_check_url, timeout=settings.SDN_CHECK_REQUEST_TIMEOUT)
+            response = _get_sdn_session().get(sdn_check_url, timeout=settings.SDN_CHECK_REQUEST_TIMEOUT)
         except requests.exceptions.Timeout:
             logger.warning('Connection to US Treasury SDN API timed out for [%s].', name)
             raise
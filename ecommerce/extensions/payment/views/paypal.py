@@ -19,6 +19,7 @@ from oscar.core.loading import get_class, get_model
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
 from ecommerce.extensions.payment.processors.paypal import Paypal
 
 logger = logging.getLogger(__name__)
@@ -129,6 +130,9 @@ class PaypalPaymentExecutionView(EdxOrderPlacementMixin, View):
             self.handle_post_order(order)
 
             return redirect(receipt_url)
+        except OfferApplicationLimitReached:
+            # The payment has been refunded.
+            return redirect(self.payment_processor.error_url)
         except:  # pylint: disable=bare-except
             logger.exception(self.order_placement_failure_msg, basket.id)
             return redirect(receipt_url)
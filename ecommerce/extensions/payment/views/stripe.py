@@ -6,6 +6,7 @@ from oscar.core.loading import get_class, get_model
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.offer.exceptions import OfferApplicationLimitReached
 from ecommerce.extensions.payment.forms import StripeSubmitForm
 from ecommerce.extensions.payment.processors.stripe import Stripe
 from ecommerce.extensions.payment.views import BasePaymentSubmitView
@@ -59,17 +60,22 @@ class StripeSubmitView(EdxOrderPlacementMixin, BasePaymentSubmitView):
         shipping_charge = shipping_method.calculate(basket)
         order_total = OrderTotalCalculator().calculate(basket, shipping_charge)
 
-        order = self.handle_order_placement(
-            order_number=order_number,
-            user=basket.owner,
-            basket=basket,
-            shipping_address=None,
-            shipping_method=shipping_method,
-            shipping_charge=shipping_charge,
-            billing_address=billing_address,
-            order_total=order_total,
-            request=self.request
-        )
+        try:
+            order = self.handle_order_placement(
+                order_number=order_number,
+                user=basket.owner,
+                basket=basket,
+                shipping_address=None,
+                shipping_method=shipping_method,
+                shipping_charge=shipping_charge,
+                billing_address=billing_address,
+                order_total=order_total,
+                request=self.request
+            )
+        except OfferApplicationLimitReached:
+            # The payment has been refunded.
+            return JsonResponse({}, status=400)
+
         self.handle_post_order(order)
 
         receipt_url = get_receipt_page_url(
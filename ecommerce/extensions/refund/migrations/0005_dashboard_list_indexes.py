@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('refund', '0004_auto_20180403_1120'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='refund',
+            index_together=set([('status', 'id'), ('status', 'created')]),
+        ),
+    ]
@@ -83,6 +83,13 @@ class Refund(StatusMixin, TimeStampedModel):
 
     pipeline_setting = 'OSCAR_REFUND_STATUS_PIPELINE'
 
+    class Meta(TimeStampedModel.Meta):
+        # Support the status filter of the dashboard refund list, which is ordered by ID or creation date.
+        index_together = (
+            ('status', 'id'),
+            ('status', 'created'),
+        )
+
     @classmethod
     def all_statuses(cls):
         """Returns all possible statuses for a refund."""
@@ -0,0 +1,255 @@
+"""
+Set-based updates of the vouchers and offers of a coupon.
+
+Coupons can have tens of thousands of vouchers, and multi-use coupons have one offer per voucher. Rather
+than updating the offers of each voucher in turn, CouponBulkUpdate computes the distinct offers of a coupon
+once and applies changes to them with a number of queries that grows with the batch size, not the voucher
+count.
+"""
+from __future__ import unicode_literals
+
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.functional import cached_property
+from oscar.core.loading import get_model
+from oscar.core.utils import slugify
+
+from ecommerce.core.utils import get_cache_key
+from ecommerce.extensions.offer.redemptions import reconcile_offers
+from ecommerce.extensions.voucher.utils import get_coupon_offer_name, get_or_create_benefit
+
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Voucher = get_model('voucher', 'Voucher')
+VoucherOffers = Voucher.offers.through
+
+BATCH_SIZE = 500
+OFFER_NUMBER_PATTERN = re.compile(r' \[(\d+)\]$')
+# Fields copied from an offer to the offer replacing it.
+REPLACEMENT_FIELDS = (
+    'offer_type', 'condition_id', 'max_global_applications', 'email_domains', 'site_id', 'priority',
+)
+SLUG_MAX_LENGTH = ConditionalOffer._meta.get_field('slug').max_length  # pylint: disable=protected-access
+
+
+def _batches(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _progress_cache_key(coupon_id):
+    return get_cache_key(resource='coupon_update_progress', coupon_id=coupon_id)
+
+
+def get_update_progress(coupon_id):
+    """ Returns the progress of the latest background update of a coupon, or None if there is none.
+
+    Progress is a dict with the keys state (one of pending, running, complete or failed),
+    completed and total, the last two counting the offers of the coupon.
+    """
+    return cache.get(_progress_cache_key(coupon_id))
+
+
+def set_update_progress(coupon_id, state, completed=0, total=0):
+    cache.set(
+        _progress_cache_key(coupon_id),
+        {'state': state, 'completed': completed, 'total': total},
+        settings.COUPON_UPDATE_PROGRESS_TIMEOUT
+    )
+
+
+class CouponBulkUpdate(object):
+    """
+    Applies changes to all vouchers and offers of a coupon in bulk.
+
+    Arguments:
+        coupon (Product): The coupon to update.
+        progress (callable): Optional. Called with the number of offers updated so far and the total
+            number of offers, after each batch of offers is updated.
+    """
+
+    def __init__(self, coupon, progress=None):
+        self.coupon = coupon
+        self.progress = progress
+
+    @property
+    def vouchers(self):
+        return Voucher.objects.filter(coupon_vouchers__coupon=self.coupon)
+
+    @cached_property
+    def offer_ids(self):
+        """ IDs of the distinct offers of the coupon's vouchers. """
+        return sorted(set(
+            VoucherOffers.objects.filter(
+                voucher__coupon_vouchers__coupon=self.coupon
+            ).values_list('conditionaloffer_id', flat=True)
+        ))
+
+    @cached_property
+    def first_offer(self):
+        return ConditionalOffer.objects.select_related('benefit', 'condition').get(id=self.offer_ids[0])
+
+    def _report(self, completed):
+        if self.progress:
+            self.progress(completed, len(self.offer_ids))
+
+    def update_vouchers(self, **fields):
+        """ Update fields of all of the coupon's vouchers. """
+        if fields:
+            self.vouchers.update(**fields)
+
+    def update_offers(self, **fields):
+        """ Update fields of all of the coupon's offers. """
+        if not fields:
+            return
+
+        completed = 0
+        for offer_ids in _batches(self.offer_ids):
+            ConditionalOffer.objects.filter(id__in=offer_ids).update(**fields)
+            if 'max_global_applications' in fields:
+                # The allowances of the offers' redemption counters are derived from the limit.
+                reconcile_offers(offer_ids)
+            completed += len(offer_ids)
+            self._report(completed)
+
+    @transaction.atomic
+    def replace_benefit(self, benefit_value=None, program_uuid=None):
+        """ Point all of the coupon's vouchers at offers with a new benefit.
+
+        Offers which have been applied to orders keep their benefit, so each distinct offer of the coupon is
+        replaced by an offer with the same condition, limits and number, and the new benefit.
+
+        Arguments:
+            benefit_value (Decimal): New benefit value. Defaults to the current value.
+            program_uuid (str): New program UUID, for program coupons.
+        """
+        if not self.offer_ids:
+            return
+
+        first_offer = self.first_offer
+        benefit = first_offer.benefit
+
+        if program_uuid:
+            Condition.objects.filter(program_uuid=first_offer.condition.program_uuid).update(program_uuid=program_uuid)
+
+        # The program uuid (if program coupon) is required for the benefit and condition update logic
+        program_uuid = program_uuid or first_offer.condition.program_uuid
+        new_benefit = get_or_create_benefit(
+            benefit.range,
+            benefit.type or getattr(benefit.proxy(), 'benefit_class_type', None),
+            benefit_value or benefit.value,
+            program_uuid=program_uuid
+        )
+
+        completed = 0
+        for offer_ids in _batches(self.offer_ids):
+            offers = ConditionalOffer.objects.filter(id__in=offer_ids)
+            replacement_ids = self._get_or_create_replacements(offers, new_benefit, program_uuid)
+
+            changed = {
+                offer_id: replacement_id for offer_id, replacement_id in replacement_ids.items()
+                if offer_id != replacement_id
+            }
+            if changed:
+                VoucherOffers.objects.filter(
+                    conditionaloffer_id__in=changed.keys(),
+                    voucher__coupon_vouchers__coupon=self.coupon
+                ).update(conditionaloffer_id=Case(
+                    *[When(conditionaloffer_id=old_id, then=Value(new_id)) for old_id, new_id in changed.items()],
+                    output_field=IntegerField()
+                ))
+
+            completed += len(offer_ids)
+            self._report(completed)
+
+        # The coupon's offers have changed.
+        del self.offer_ids
+        del self.first_offer
+
+    def _get_or_create_replacements(self, offers, benefit, program_uuid):
+        """ Returns a dict mapping the IDs of the given offers to the IDs of offers with the given benefit.
+
+        Offers with the given benefit may already exist, if the benefit was changed back to an earlier value. These
+        are given the same limits, and other settings, as the offers they replace.
+        """
+        names = {}
+        for offer in offers:
+            match = OFFER_NUMBER_PATTERN.search(offer.name)
+            names[offer.id] = get_coupon_offer_name(
+                self.coupon.id, benefit, program_uuid=program_uuid, offer_number=match and match.group(1)
+            )
+
+        existing = {
+            values['name']: values
+            for values in ConditionalOffer.objects.filter(name__in=set(names.values())).values(
+                'id', 'name', *REPLACEMENT_FIELDS
+            )
+        }
+
+        replacements = {}
+        stale = {}
+        for offer in offers:
+            name = names[offer.id]
+            fields = {field: getattr(offer, field) for field in REPLACEMENT_FIELDS}
+            if name in existing:
+                values = existing[name]
+                if values['id'] != offer.id and any(values[field] != value for field, value in fields.items()):
+                    stale[values['id']] = fields
+            elif name not in replacements:
+                replacements[name] = ConditionalOffer(name=name, benefit=benefit, **fields)
+
+        if stale:
+            self._update_stale_offers(stale)
+
+        if replacements:
+            # Setting the slugs prevents a query per offer to find an unused slug.
+            for name, slug in _get_unique_slugs(replacements).items():
+                replacements[name].slug = slug
+            ConditionalOffer.objects.bulk_create(replacements.values())
+            # Primary keys are not set by bulk_create on every database, so the new offers are looked up by name.
+            existing.update(
+                (name, {'id': offer_id})
+                for name, offer_id in ConditionalOffer.objects.filter(
+                    name__in=replacements.keys()
+                ).values_list('name', 'id')
+            )
+
+        return {offer.id: existing[names[offer.id]]['id'] for offer in offers}
+
+    def _update_stale_offers(self, stale):
+        """ Apply the given fields, keyed by offer ID, to existing offers, grouping offers with the same fields. """
+        groups = {}
+        for offer_id, fields in stale.items():
+            groups.setdefault(tuple(sorted(fields.items())), []).append(offer_id)
+
+        for fields, offer_ids in groups.items():
+            ConditionalOffer.objects.filter(id__in=offer_ids).update(**dict(fields))
+
+        # The allowances of the offers' redemption counters are derived from their limits.
+        reconcile_offers(stale.keys())
+
+
+def _get_unique_slugs(names):
+    """ Returns a dict mapping offer names to slugs used by no other offer, suffixed as AutoSlugField would. """
+    slugs = {name: slugify(name) for name in names}
+    taken = set(ConditionalOffer.objects.filter(slug__in=slugs.values()).values_list('slug', flat=True))
+
+    unique_slugs = {}
+    for name, slug in sorted(slugs.items()):
+        candidate = slug
+        index = 2
+        while candidate in taken:
+            suffix = '-{}'.format(index)
+            candidate = slug[:SLUG_MAX_LENGTH - len(suffix)] + suffix
+            index += 1
+            if candidate not in taken and ConditionalOffer.objects.filter(slug=candidate).exists():
+                taken.add(candidate)
+        taken.add(candidate)
+        unique_slugs[name] = candidate
+
+    return unique_slugs
@@ -9,3 +9,6 @@ class VoucherConfig(config.VoucherConfig):
     def ready(self):  # pragma: no cover
         if settings.VOUCHER_CODE_LENGTH < 1:
             raise ImproperlyConfigured("VOUCHER_CODE_LENGTH must be a positive number.")
+
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.voucher.signals  # pylint: disable=unused-variable
@@ -0,0 +1,62 @@
+"""
+Management command that rebuilds the denormalized summaries listed by the coupon administration tool.
+"""
+from __future__ import unicode_literals
+
+import logging
+import time
+
+from django.core.management import BaseCommand
+from oscar.core.loading import get_model
+
+from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.extensions.voucher.summary import update_coupon_summaries
+
+logger = logging.getLogger(__name__)
+Product = get_model('catalogue', 'Product')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the summaries of coupons.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Number of coupons to update in each batch.')
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=0,
+                            type=float,
+                            help='Seconds to sleep between batches.')
+        parser.add_argument('--missing',
+                            action='store_true',
+                            dest='missing',
+                            default=False,
+                            help='Only build the summaries of coupons without one.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Product.objects.filter(product_class__name=COUPON_PRODUCT_CLASS_NAME).order_by('id')
+        if options['missing']:
+            queryset = queryset.filter(coupon_summary__isnull=True)
+
+        updated = 0
+        last_id = 0
+
+        while True:
+            coupons = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not coupons:
+                break
+
+            update_coupon_summaries(coupons)
+
+            updated += len(coupons)
+            last_id = coupons[-1].id
+            logger.info('Rebuilt summaries for [%d] coupons.', updated)
+            time.sleep(options['sleep_seconds'])
+
+        logger.info('Finished rebuilding summaries for [%d] coupons.', updated)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0031_catalog_stock_records_fingerprint'),
+        ('partner', '0012_auto_20180119_0903'),
+        ('voucher', '0005_auto_20180124_1131'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponSummary',
+            fields=[
+                ('coupon', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='coupon_summary', serialize=False, to='catalogue.Product')),
+                ('title', models.CharField(max_length=255)),
+                ('date_created', models.DateTimeField(null=True)),
+                ('client', models.CharField(blank=True, max_length=255)),
+                ('code', models.CharField(blank=True, max_length=128)),
+                ('benefit_type', models.CharField(blank=True, max_length=128)),
+                ('benefit_value', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+                ('voucher_type', models.CharField(blank=True, max_length=128)),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('max_uses', models.PositiveIntegerField(null=True)),
+                ('num_uses', models.PositiveIntegerField(default=0)),
+                ('start_date', models.DateTimeField(null=True)),
+                ('end_date', models.DateTimeField(null=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalogue.Category')),
+                ('partner', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='partner.Partner')),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='couponsummary',
+            index_together=set([('partner', 'date_created')]),
+        ),
+    ]
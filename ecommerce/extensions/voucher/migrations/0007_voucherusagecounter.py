@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voucher', '0006_couponsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoucherUsageCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe', models.PositiveSmallIntegerField()),
+                ('num_orders', models.PositiveIntegerField(default=0)),
+                ('total_discount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('voucher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_counters', to='voucher.Voucher')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='voucherusagecounter',
+            unique_together=set([('voucher', 'stripe')]),
+        ),
+    ]
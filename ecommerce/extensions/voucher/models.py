@@ -24,6 +24,54 @@ class OrderLineVouchers(models.Model):
     vouchers = models.ManyToManyField('voucher.Voucher', related_name='order_line_vouchers')
 
 
+class CouponSummary(models.Model):
+    """
+    Denormalized summary of a coupon, listed by the coupon administration tool.
+
+    Summaries are updated when coupons are created or updated, when their invoices or categories are saved,
+    and when orders redeem their vouchers. They can be rebuilt with the rebuild_coupon_summaries command.
+    """
+    coupon = models.OneToOneField(
+        'catalogue.Product', primary_key=True, related_name='coupon_summary', on_delete=models.CASCADE
+    )
+    partner = models.ForeignKey('partner.Partner', null=True, related_name='+', on_delete=models.SET_NULL)
+    title = models.CharField(max_length=255)
+    date_created = models.DateTimeField(null=True)
+    category = models.ForeignKey('catalogue.Category', null=True, related_name='+', on_delete=models.SET_NULL)
+    client = models.CharField(max_length=255, blank=True)
+    # The code of coupons with a single, non-enrollment, voucher.
+    code = models.CharField(max_length=128, blank=True)
+    benefit_type = models.CharField(max_length=128, blank=True)
+    benefit_value = models.DecimalField(decimal_places=2, max_digits=12, null=True)
+    voucher_type = models.CharField(max_length=128, blank=True)
+    quantity = models.PositiveIntegerField(default=0)
+    max_uses = models.PositiveIntegerField(null=True)
+    # Number of applications of all of the coupon's offers.
+    num_uses = models.PositiveIntegerField(default=0)
+    start_date = models.DateTimeField(null=True)
+    end_date = models.DateTimeField(null=True)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta(object):
+        ordering = ('-date_created',)
+        index_together = ('partner', 'date_created')
+
+
+class VoucherUsageCounter(models.Model):
+    """
+    One of the stripes across which the redemptions of a voucher are counted until they are reconciled.
+
+    See OfferApplicationCounter.
+    """
+    voucher = models.ForeignKey('voucher.Voucher', related_name='usage_counters', on_delete=models.CASCADE)
+    stripe = models.PositiveSmallIntegerField()
+    num_orders = models.PositiveIntegerField(default=0)
+    total_discount = models.DecimalField(decimal_places=2, max_digits=12, default=0)
+
+    class Meta(object):
+        unique_together = ('voucher', 'stripe')
+
+
 class Voucher(AbstractVoucher):
     def save(self, *args, **kwargs):
         self.clean()
@@ -54,6 +102,30 @@ class Voucher(AbstractVoucher):
                 'Failed to create Voucher. Voucher start and end datetime fields must be type datetime.'
             )
 
+    def record_usage(self, order, user):
+        """
+        Record the redemption of the voucher by an order.
+
+        The redemptions of vouchers which may be redeemed more than once are counted by one of the voucher's
+        VoucherUsageCounters, rather than by updating the voucher, which would lock its row until the order is
+        committed.
+        """
+        if self.usage == self.SINGLE_USE:
+            super(Voucher, self).record_usage(order, user)  # pylint: disable=bad-super-call
+            return
+
+        from ecommerce.extensions.offer.redemptions import record_voucher_usage
+        self.applications.create(voucher=self, order=order, user=user if user.is_authenticated() else None)
+        record_voucher_usage(self, num_orders=1)
+
+    def record_discount(self, discount):
+        if self.usage == self.SINGLE_USE:
+            super(Voucher, self).record_discount(discount)  # pylint: disable=bad-super-call
+            return
+
+        from ecommerce.extensions.offer.redemptions import record_voucher_usage
+        record_voucher_usage(self, total_discount=discount['discount'])
+
     @classmethod
     def does_exist(cls, code):
         try:
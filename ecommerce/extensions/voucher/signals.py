@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.extensions.analytics.utils import silence_exceptions
+from ecommerce.extensions.voucher.summary import get_coupons_for_vouchers, update_coupon_summaries
+from ecommerce.invoice.models import Invoice
+
+Line = get_model('order', 'Line')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+order_placed = get_class('order.signals', 'order_placed')
+
+
+@silence_exceptions('Failed to update coupon summaries for new order.')
+def _update_summaries_for_vouchers(voucher_ids):
+    update_coupon_summaries(get_coupons_for_vouchers(voucher_ids))
+
+
+@receiver(order_placed, dispatch_uid='voucher.summary.update_for_order')
+def update_summaries_for_order(sender, order, **kwargs):  # pylint: disable=unused-argument
+    """ Update the summaries of the coupons whose vouchers were redeemed by an order.
+
+    The summaries are updated once the order is committed, so that they count the redemptions of concurrent
+    orders, and so that placing the order does not wait for the summaries to be locked and recomputed.
+    """
+    voucher_ids = list(order.discounts.exclude(voucher_id=None).values_list('voucher_id', flat=True))
+    if voucher_ids:
+        transaction.on_commit(lambda: _update_summaries_for_vouchers(voucher_ids))
+
+
+@receiver(post_save, sender=Invoice, dispatch_uid='voucher.summary.update_for_invoice')
+def update_summaries_for_invoice(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Update the summaries of the coupons purchased by an invoiced order, whose client may have changed. """
+    if instance.order_id and not raw:
+        update_coupon_summaries(Product.objects.filter(
+            id__in=Line.objects.filter(order_id=instance.order_id).values('product_id'),
+            coupon_vouchers__isnull=False
+        ).distinct())
+
+
+@receiver(post_save, sender=ProductCategory, dispatch_uid='voucher.summary.update_for_category')
+def update_summary_for_category(sender, instance, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """ Update the summary of a coupon whose category changed. """
+    if not raw:
+        update_coupon_summaries(
+            Product.objects.filter(id=instance.product_id, coupon_vouchers__isnull=False).distinct()
+        )
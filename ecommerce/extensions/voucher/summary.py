@@ -0,0 +1,84 @@
+"""
+Maintenance of the denormalized coupon summaries listed by the coupon administration tool.
+
+Computing the fields of the coupon list requires several queries per coupon, so they are computed when a coupon
+changes and stored in a CouponSummary, which the list reads with a single query.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.db.models import Sum
+from oscar.core.loading import get_model
+
+from ecommerce.invoice.models import Invoice
+
+logger = logging.getLogger(__name__)
+
+Benefit = get_model('offer', 'Benefit')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OfferApplicationCounter = get_model('offer', 'OfferApplicationCounter')
+CouponSummary = get_model('voucher', 'CouponSummary')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+VoucherOffers = Voucher.offers.through
+
+
+def update_coupon_summary(coupon):
+    """ Compute and save the summary of a coupon.
+
+    Arguments:
+        coupon (Product): The coupon.
+
+    Returns:
+        CouponSummary
+    """
+    summary = CouponSummary(coupon=coupon, title=coupon.title, date_created=coupon.date_created)
+    summary.partner_id = StockRecord.objects.filter(product=coupon).values_list('partner_id', flat=True).first()
+    summary.category_id = ProductCategory.objects.filter(
+        product=coupon
+    ).values_list('category_id', flat=True).first()
+    summary.client = Invoice.objects.filter(
+        order__lines__product=coupon, business_client__isnull=False
+    ).values_list('business_client__name', flat=True).first() or ''
+
+    vouchers = Voucher.objects.filter(coupon_vouchers__coupon=coupon)
+    voucher = vouchers.order_by('id').first()
+    offer = voucher and voucher.offers.select_related('benefit').first()
+    if offer:
+        benefit = offer.benefit
+        summary.benefit_type = benefit.type or getattr(benefit.proxy(), 'benefit_class_type', None) or ''
+        summary.benefit_value = benefit.value
+        summary.voucher_type = voucher.usage
+        summary.quantity = vouchers.count()
+        summary.max_uses = offer.max_global_applications
+        offer_ids = VoucherOffers.objects.filter(voucher__coupon_vouchers__coupon=coupon).values('conditionaloffer_id')
+        summary.num_uses = (
+            (ConditionalOffer.objects.filter(id__in=offer_ids).aggregate(
+                num_uses=Sum('num_applications'))['num_uses'] or 0) +
+            # Applications not yet reconciled into the offers.
+            (OfferApplicationCounter.objects.filter(offer_id__in=offer_ids).aggregate(
+                num_uses=Sum('num_applications'))['num_uses'] or 0)
+        )
+        summary.start_date = voucher.start_datetime
+        summary.end_date = voucher.end_datetime
+
+        is_enrollment_code = benefit.type == Benefit.PERCENTAGE and benefit.value == 100
+        if summary.quantity == 1 and not is_enrollment_code:
+            summary.code = voucher.code
+
+    summary.save()
+    return summary
+
+
+def update_coupon_summaries(coupons):
+    """ Compute and save the summaries of the given coupons. """
+    for coupon in coupons:
+        update_coupon_summary(coupon)
+
+
+def get_coupons_for_vouchers(voucher_ids):
+    """ Returns the coupons to which the given vouchers belong. """
+    return Product.objects.filter(coupon_vouchers__vouchers__id__in=voucher_ids).distinct()
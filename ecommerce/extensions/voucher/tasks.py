@@ -0,0 +1,46 @@
+"""
+Background tasks for updating coupons too large to update within a request.
+"""
+import logging
+
+from django.db import transaction
+from oscar.core.loading import get_model
+
+from ecommerce.celery_app import app
+from ecommerce.extensions.voucher.bulk import CouponBulkUpdate, set_update_progress
+from ecommerce.extensions.voucher.summary import update_coupon_summary
+
+logger = logging.getLogger(__name__)
+Product = get_model('catalogue', 'Product')
+
+
+@app.task(ignore_result=True)
+def update_coupon_offers(coupon_id, benefit_value=None, program_uuid=None, offer_data=None):
+    """ Replace the benefit of a coupon's offers and update their fields, recording the progress of the update.
+
+    Arguments:
+        coupon_id (int): ID of the coupon to update.
+        benefit_value (Decimal): New benefit value, if the benefit changed.
+        program_uuid (str): New program UUID, if the program changed.
+        offer_data (dict): Offer fields to update.
+    """
+    def report(completed, total):
+        set_update_progress(coupon_id, 'running', completed, total)
+
+    coupon = Product.objects.get(id=coupon_id)
+    update = CouponBulkUpdate(coupon, progress=report)
+    try:
+        with transaction.atomic():
+            # Replacement offers copy the fields of the offers they replace, so those are updated first.
+            update.update_offers(**(offer_data or {}))
+            if benefit_value or program_uuid:
+                update.replace_benefit(benefit_value=benefit_value, program_uuid=program_uuid)
+            update_coupon_summary(coupon)
+    except Exception:
+        logger.exception('Failed to update the offers of coupon [%d].', coupon_id)
+        set_update_progress(coupon_id, 'failed')
+        raise
+
+    total = len(update.offer_ids)
+    set_update_progress(coupon_id, 'complete', total, total)
+    logger.info('Updated the offers of coupon [%d].', coupon_id)
@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from oscar.core.loading import get_model
+from oscar.test.factories import ConditionalOfferFactory
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.extensions.voucher.bulk import CouponBulkUpdate, _get_unique_slugs, get_update_progress
+from ecommerce.extensions.voucher.tasks import update_coupon_offers
+from ecommerce.tests.testcases import TestCase
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class CouponBulkUpdateTests(CouponMixin, TestCase):
+    def setUp(self):
+        super(CouponBulkUpdateTests, self).setUp()
+        self.coupon = self.create_coupon(
+            benefit_value=10, max_uses=3, quantity=4, voucher_type=Voucher.MULTI_USE, email_domains='example.com'
+        )
+
+    def get_offers(self):
+        vouchers = self.coupon.attr.coupon_vouchers.vouchers.all()
+        return [voucher.offers.get() for voucher in vouchers]
+
+    def test_update_offers(self):
+        """ Verify all of the coupon's offers are updated. """
+        CouponBulkUpdate(self.coupon).update_offers(max_global_applications=5)
+
+        for offer in self.get_offers():
+            self.assertEqual(offer.max_global_applications, 5)
+
+    def test_replace_benefit(self):
+        """ Verify each distinct offer is replaced by an offer with the new benefit and the same limits. """
+        original_offers = self.get_offers()
+        progress = []
+
+        CouponBulkUpdate(self.coupon, progress=lambda *args: progress.append(args)).replace_benefit(benefit_value=25)
+
+        offers = self.get_offers()
+        self.assertEqual(len(set(offers)), len(set(original_offers)))
+        for offer in offers:
+            self.assertNotIn(offer, original_offers)
+            self.assertEqual(offer.benefit.value, Decimal(25))
+            self.assertEqual(offer.max_global_applications, 3)
+            self.assertEqual(offer.email_domains, 'example.com')
+        self.assertEqual(progress[-1], (len(original_offers), len(original_offers)))
+
+        # The replaced offers keep their benefit.
+        for offer in ConditionalOffer.objects.filter(id__in=[original.id for original in original_offers]):
+            self.assertEqual(offer.benefit.value, Decimal(10))
+
+    def test_replace_benefit_reuses_offers(self):
+        """ Verify offers reused when the benefit is changed back are given the limits of the offers they replace. """
+        # Offer names include the benefit value as read from the database.
+        CouponBulkUpdate(self.coupon).replace_benefit(benefit_value=Decimal('25.00'))
+        earlier_offers = self.get_offers()
+        CouponBulkUpdate(self.coupon).replace_benefit(benefit_value=50)
+
+        bulk_update = CouponBulkUpdate(self.coupon)
+        bulk_update.update_offers(max_global_applications=5, email_domains='example.org')
+        bulk_update.replace_benefit(benefit_value=Decimal('25.00'))
+
+        offers = self.get_offers()
+        self.assertEqual(set(offers), set(earlier_offers))
+        for offer in offers:
+            self.assertEqual(offer.max_global_applications, 5)
+            self.assertEqual(offer.email_domains, 'example.org')
+
+    def test_unique_slugs(self):
+        """ Verify slugs already used by other offers, including suffixed ones, are not reused. """
+        ConditionalOfferFactory(name='Offer')
+        ConditionalOfferFactory(name='Offer!')
+        self.assertEqual(ConditionalOffer.objects.get(name='Offer!').slug, 'offer-2')
+
+        self.assertEqual(_get_unique_slugs(['Offer?', 'New offer']), {'Offer?': 'offer-3', 'New offer': 'new-offer'})
+
+    def test_replace_benefit_queries(self):
+        """ Verify the number of queries does not grow with the number of vouchers. """
+        with CaptureQueriesContext(connection) as queries:
+            CouponBulkUpdate(self.coupon).replace_benefit(benefit_value=25)
+
+        coupon = self.create_coupon(
+            benefit_value=10, max_uses=3, quantity=8, title='Larger coupon', voucher_type=Voucher.MULTI_USE
+        )
+        with self.assertNumQueries(len(queries)):
+            CouponBulkUpdate(coupon).replace_benefit(benefit_value=25)
+
+    def test_update_coupon_offers_task(self):
+        """ Verify the background task updates the offers and records its progress. """
+        update_coupon_offers(self.coupon.id, benefit_value=50, offer_data={'max_global_applications': 7})
+
+        for offer in self.get_offers():
+            self.assertEqual(offer.benefit.value, Decimal(50))
+            self.assertEqual(offer.max_global_applications, 7)
+
+        total = len(self.get_offers())
+        self.assertEqual(get_update_progress(self.coupon.id), {'state': 'complete', 'completed': total, 'total': total})
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import mock
+from django.core.management import call_command
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.tests.testcases import TestCase
+
+CouponSummary = get_model('voucher', 'CouponSummary')
+Voucher = get_model('voucher', 'Voucher')
+order_placed = get_class('order.signals', 'order_placed')
+
+
+class CouponSummaryTests(CouponMixin, TestCase):
+    def setUp(self):
+        super(CouponSummaryTests, self).setUp()
+        self.coupon = self.create_coupon(
+            benefit_value=10, max_uses=3, partner=self.partner, quantity=4, voucher_type=Voucher.MULTI_USE
+        )
+
+    def test_summary_created(self):
+        """ Verify a summary is built when a coupon is created, and updated when its invoice is created. """
+        summary = CouponSummary.objects.get(coupon=self.coupon)
+        voucher = self.coupon.attr.coupon_vouchers.vouchers.order_by('id').first()
+
+        self.assertEqual(summary.title, self.coupon.title)
+        self.assertEqual(summary.partner, self.partner)
+        self.assertEqual(summary.category, self.category)
+        self.assertEqual(summary.client, 'Test Client')
+        self.assertEqual(summary.code, '')
+        self.assertEqual(summary.benefit_value, Decimal(10))
+        self.assertEqual(summary.voucher_type, Voucher.MULTI_USE)
+        self.assertEqual(summary.quantity, 4)
+        self.assertEqual(summary.max_uses, 3)
+        self.assertEqual(summary.num_uses, 0)
+        self.assertEqual(summary.start_date, voucher.start_datetime)
+        self.assertEqual(summary.end_date, voucher.end_datetime)
+
+    def test_custom_code(self):
+        """ Verify the code of coupons with a single voucher is summarized. """
+        coupon = self.create_coupon(benefit_value=10, code='CUSTOMCODE', title='Custom code coupon')
+        self.assertEqual(CouponSummary.objects.get(coupon=coupon).code, 'CUSTOMCODE')
+
+    def test_order_placed(self):
+        """ Verify the summaries of the coupons whose vouchers an order redeemed are updated. """
+        voucher = self.coupon.attr.coupon_vouchers.vouchers.first()
+        offer = voucher.offers.first()
+        offer.num_applications = 1
+        offer.save()
+
+        order = create_order(site=self.site)
+        order.discounts.create(amount=10, offer_id=offer.id, voucher_id=voucher.id)
+        with mock.patch('django.db.transaction.on_commit') as mock_on_commit:
+            order_placed.send(sender=self, order=order, user=order.user)
+
+        # The summary is only updated once the order is committed.
+        self.assertEqual(CouponSummary.objects.get(coupon=self.coupon).num_uses, 0)
+        mock_on_commit.call_args[0][0]()
+        self.assertEqual(CouponSummary.objects.get(coupon=self.coupon).num_uses, 1)
+
+    def test_rebuild_command(self):
+        """ Verify the command rebuilds missing and outdated summaries. """
+        other_coupon = self.create_coupon(title='Other coupon')
+        CouponSummary.objects.filter(coupon=self.coupon).delete()
+        CouponSummary.objects.filter(coupon=other_coupon).update(title='Outdated')
+
+        call_command('rebuild_coupon_summaries', batch_size=1)
+
+        self.assertEqual(CouponSummary.objects.get(coupon=self.coupon).quantity, 4)
+        self.assertEqual(CouponSummary.objects.get(coupon=other_coupon).title, 'Other coupon')
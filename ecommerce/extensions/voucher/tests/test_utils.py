@@ -26,8 +26,7 @@ from ecommerce.extensions.voucher.utils import (
     create_vouchers,
     generate_coupon_report,
     get_voucher_and_products_from_code,
-    get_voucher_discount_info,
-    update_voucher_offer
+    get_voucher_discount_info
 )
 from ecommerce.tests.mixins import LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
@@ -620,27 +619,6 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         self.assertIn('Redeemed For Course ID', field_names)
         self.assertIn('Redeemed For Course IDs', field_names)
 
-    def test_update_voucher_offer(self):
-        """Test updating a voucher."""
-        self.data['email_domains'] = 'example.com'
-        vouchers = create_vouchers(**self.data)
-
-        voucher = vouchers[0]
-        voucher_offer = voucher.offers.first()
-        self.assertEqual(voucher_offer.benefit.type, Benefit.PERCENTAGE)
-        self.assertEqual(voucher_offer.benefit.value, 100.00)
-        self.assertEqual(voucher_offer.benefit.range.catalog, self.catalog)
-
-        new_email_domains = 'example.org'
-        new_offer = update_voucher_offer(
-            voucher_offer, 50.00, Benefit.PERCENTAGE,
-            self.coupon, email_domains=new_email_domains
-        )
-        self.assertEqual(new_offer.benefit.type, Benefit.PERCENTAGE)
-        self.assertEqual(new_offer.benefit.value, 50.00)
-        self.assertEqual(new_offer.benefit.range.catalog, self.catalog)
-        self.assertEqual(new_offer.email_domains, new_email_domains)
-
     def test_get_voucher_and_products_from_code(self):
         """ Verify that get_voucher_and_products_from_code() returns products and voucher. """
         original_voucher, original_product = prepare_voucher(code=VOUCHER_CODE)
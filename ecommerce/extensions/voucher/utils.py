@@ -177,7 +177,7 @@ def _get_voucher_info_for_coupon_report(voucher):
     # which don't have the max global applications limit set,
     # set the max_uses_count to 10000 which is the arbitrary limit Oscar sets:
     # https://github.com/django-oscar/django-oscar/blob/master/src/oscar/apps/offer/abstract_models.py#L253
-    redemption_count = offer.num_applications
+    redemption_count = offer.get_num_applications()
     if voucher.usage == Voucher.SINGLE_USE:
         max_uses_count = 1
         redemption_count = voucher.num_orders
@@ -296,6 +296,74 @@ def generate_coupon_report(coupon_vouchers):
     return field_names, rows
 
 
+def get_or_create_benefit(product_range, benefit_type, benefit_value, program_uuid=None):
+    """
+    Return a benefit for a catalog or program.
+
+    Args:
+        product_range (Range): Range of products associated with the benefit. Unused for program benefits.
+        benefit_type (str): Type of the benefit
+        benefit_value (Decimal): Value of the benefit
+    Kwargs:
+        program_uuid (str): the Program UUID
+
+    Returns:
+        Benefit
+
+    Raises:
+        ValidationError: If the benefit value is not a number.
+    """
+    try:
+        if program_uuid:
+            proxy_class = class_path(BENEFIT_MAP[benefit_type])
+            offer_benefit = Benefit.objects.filter(proxy_class=proxy_class, value=benefit_value).first()
+
+            if not offer_benefit:
+                offer_benefit = Benefit()
+                offer_benefit.proxy_class = proxy_class
+                offer_benefit.value = benefit_value
+                offer_benefit.save()
+        else:
+            offer_benefit, __ = Benefit.objects.get_or_create(
+                range=product_range,
+                type=benefit_type,
+                value=Decimal(benefit_value),
+                max_affected_items=1,
+            )
+    except (TypeError, DecimalException):  # If the benefit_value parameter is not sent TypeError will be raised
+        log_message_and_raise_validation_error(
+            'Failed to create Benefit. Benefit value must be a positive number or 0.'
+        )
+
+    return offer_benefit
+
+
+def get_coupon_offer_name(coupon_id, benefit, program_uuid=None, offer_number=None):
+    """
+    Return the name of a coupon offer.
+
+    Args:
+        coupon_id (int): ID of the coupon
+        benefit (Benefit): Benefit of the offer
+    Kwargs:
+        program_uuid (str): the Program UUID
+        offer_number (int): number of the consecutive offer - used in case of a multiple
+                            multi-use coupon
+
+    Returns:
+        str
+    """
+    if program_uuid:
+        offer_name = "Coupon [{}]-{}".format(coupon_id, benefit.name)
+    else:
+        offer_name = "Coupon [{}]-{}-{}".format(coupon_id, benefit.type, benefit.value)
+
+    if offer_number:
+        offer_name = "{} [{}]".format(offer_name, offer_number)
+
+    return offer_name
+
+
 def _get_or_create_offer(
         product_range, benefit_type, benefit_value, coupon_id=None,
         max_uses=None, offer_number=None, email_domains=None, program_uuid=None, site=None
@@ -335,34 +403,9 @@ def _get_or_create_offer(
             type=Condition.COUNT,
             value=1,
         )
-    try:
-        if program_uuid:
-            proxy_class = class_path(BENEFIT_MAP[benefit_type])
-            offer_benefit = Benefit.objects.filter(proxy_class=proxy_class, value=benefit_value).first()
-
-            if not offer_benefit:
-                offer_benefit = Benefit()
-                offer_benefit.proxy_class = proxy_class
-                offer_benefit.value = benefit_value
-                offer_benefit.save()
 
-            offer_name = "Coupon [{}]-{}".format(coupon_id, offer_benefit.name)
-        else:
-            offer_benefit, __ = Benefit.objects.get_or_create(
-                range=product_range,
-                type=benefit_type,
-                value=Decimal(benefit_value),
-                max_affected_items=1,
-            )
-            offer_name = "Coupon [{}]-{}-{}".format(coupon_id, offer_benefit.type, offer_benefit.value)
-
-    except (TypeError, DecimalException):  # If the benefit_value parameter is not sent TypeError will be raised
-        log_message_and_raise_validation_error(
-            'Failed to create Benefit. Benefit value must be a positive number or 0.'
-        )
-
-    if offer_number:
-        offer_name = "{} [{}]".format(offer_name, offer_number)
+    offer_benefit = get_or_create_benefit(product_range, benefit_type, benefit_value, program_uuid=program_uuid)
+    offer_name = get_coupon_offer_name(coupon_id, offer_benefit, program_uuid=program_uuid, offer_number=offer_number)
 
     offer, __ = ConditionalOffer.objects.get_or_create(
         name=offer_name,
@@ -627,37 +670,6 @@ def get_voucher_discount_info(benefit, price):
         }
 
 
-def update_voucher_offer(offer, benefit_value, benefit_type, coupon, max_uses=None,
-                         email_domains=None, program_uuid=None):
-    """
-    Update voucher offer with new benefit value.
-
-    Args:
-        offer (Offer): Offer associated with a voucher.
-        benefit_value (Decimal): Value of benefit associated with vouchers.
-        benefit_type (str): Type of benefit associated with vouchers.
-        coupon (Product): The coupon whos offer(s) is updated.
-
-    Kwargs:
-        max_uses (int): number of maximum global application number an offer can have.
-        email_domains (str): a comma-separated string of email domains allowed to apply
-                            this offer.
-        program_uuid (str): Program UUID
-
-    Returns:
-        Offer
-    """
-    return _get_or_create_offer(
-        product_range=offer.benefit.range,
-        benefit_value=benefit_value,
-        benefit_type=benefit_type,
-        coupon_id=coupon.id,
-        max_uses=max_uses,
-        email_domains=email_domains,
-        program_uuid=program_uuid
-    )
-
-
 def get_cached_voucher(code):
     """
     Returns a voucher from cache if one is stored to cache, if not the voucher
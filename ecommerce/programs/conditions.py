@@ -3,16 +3,14 @@ from __future__ import unicode_literals
 import logging
 import operator
 
-from django.conf import settings
-from django.core.cache import cache
 from oscar.apps.offer import utils as oscar_utils
 from oscar.core.loading import get_model
-from requests.exceptions import ConnectionError, Timeout
+from requests.exceptions import Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
-from ecommerce.core.utils import get_cache_key, traverse_pagination
 from ecommerce.extensions.offer.decorators import check_condition_applicability
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
+from ecommerce.programs.ownership import OwnershipSnapshot, get_ownership_snapshot
 from ecommerce.programs.utils import get_program
 
 Condition = get_model('offer', 'Condition')
@@ -45,41 +43,13 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
                         program_skus.add(entitlement['sku'])
         return program_skus
 
-    def get_lms_resource(self, basket, resource_name, endpoint):
-        cache_key = get_cache_key(
-            site_domain=basket.site.domain,
-            resource=resource_name,
-            username=basket.owner.username,
-        )
-        data_list = cache.get(cache_key)
-        if not data_list:
-            user = basket.owner.username
-            try:
-                data_list = endpoint.get(user=user)
-                cache.set(cache_key, data_list, settings.ENROLLMENT_API_CACHE_TIMEOUT)
-            except (ConnectionError, SlumberBaseException, Timeout) as exc:
-                logger.error('Failed to retrieve %s : %s', resource_name, str(exc))
-        return data_list if data_list else []
-
-    def get_user_ownership_data(self, basket, retrieve_entitlements=False):
+    def get_user_ownership_snapshot(self, basket, retrieve_entitlements=False):
         """
-        Retrieves existing enrollments and entitlements for a user from LMS
+        Retrieves a snapshot of the user's existing enrollments and entitlements from LMS
         """
-        enrollments = []
-        entitlements = []
-        site_configuration = basket.site.siteconfiguration
-        if site_configuration.enable_partial_program:
-            enrollments = self.get_lms_resource(
-                basket, 'enrollments', site_configuration.enrollment_api_client.enrollment)
-            if retrieve_entitlements:
-                response = self.get_lms_resource(
-                    basket, 'entitlements', site_configuration.entitlement_api_client.entitlements
-                )
-                if isinstance(response, dict):
-                    entitlements = traverse_pagination(response, site_configuration.entitlement_api_client.entitlements)
-                else:
-                    entitlements = response
-        return enrollments, entitlements
+        if not basket.site.siteconfiguration.enable_partial_program:
+            return OwnershipSnapshot([])
+        return get_ownership_snapshot(basket.site, basket.owner.username, include_entitlements=retrieve_entitlements)
 
     def has_entitlements(self, program):
         """
@@ -114,15 +84,11 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             return False
 
         retrieve_entitlements = self.has_entitlements(program)
-        enrollments, entitlements = self.get_user_ownership_data(basket, retrieve_entitlements)
+        ownership = self.get_user_ownership_snapshot(basket, retrieve_entitlements)
 
         for course in program['courses']:
-            # If the user is already enrolled in a course, we do not need to check their basket for it
-            if any(course['key'] in enrollment['course_details']['course_id'] and
-                   enrollment['mode'] in applicable_seat_types for enrollment in enrollments):
-                continue
-            if any(course['uuid'] in entitlement['course_uuid'] and
-                   entitlement['mode'] in applicable_seat_types for entitlement in entitlements):
+            # If the user is already enrolled in, or entitled to, a course, we do not need to check their basket for it
+            if ownership.owns_course(course, applicable_seat_types):
                 continue
 
             # If the  basket has no SKUs left, but we still have courses over which
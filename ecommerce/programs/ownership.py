@@ -0,0 +1,154 @@
+"""
+Snapshots of the courses a user owns, used to evaluate program offers.
+
+A snapshot is built from the user's enrollments and entitlements in the LMS, which are requested concurrently,
+and indexes them so that ownership of a program course can be checked without scanning either list. Snapshots
+are cached per user until the user's orders are fulfilled or refunded, when invalidate_ownership_snapshot is
+called, or until PROGRAM_OWNERSHIP_CACHE_TIMEOUT elapses.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.core.utils import get_cache_key, iterate_pagination, run_in_thread
+
+logger = logging.getLogger(__name__)
+
+
+class OwnershipSnapshot(object):
+    """
+    The modes in which a user is enrolled in, or entitled to, each course.
+
+    Arguments:
+        enrollments (list): Enrollments returned by the LMS Enrollment API.
+        entitlements (list): Entitlements returned by the LMS Entitlement API, or None if they were not retrieved.
+    """
+
+    def __init__(self, enrollments, entitlements=None):
+        # Enrollments are indexed by course run key, and by the key of the course the run belongs to.
+        self.enrollment_modes = {}
+        for enrollment in enrollments:
+            course_run_key = enrollment['course_details']['course_id']
+            for key in (course_run_key, self._get_course_key(course_run_key)):
+                if key:
+                    self.enrollment_modes.setdefault(key, set()).add(enrollment['mode'])
+
+        self.entitlement_modes = None
+        if entitlements is not None:
+            self.entitlement_modes = self.index_entitlements(entitlements)
+
+    @staticmethod
+    def index_entitlements(entitlements):
+        """ Returns the modes of entitlements returned by the LMS Entitlement API, indexed by course UUID. """
+        entitlement_modes = {}
+        for entitlement in entitlements:
+            entitlement_modes.setdefault(entitlement['course_uuid'], set()).add(entitlement['mode'])
+        return entitlement_modes
+
+    @staticmethod
+    def _get_course_key(course_run_key):
+        try:
+            course_run_key = CourseKey.from_string(course_run_key)
+        except InvalidKeyError:
+            return None
+        return '{org}+{course}'.format(org=course_run_key.org, course=course_run_key.course)
+
+    @property
+    def has_entitlements(self):
+        """ Whether the user's entitlements were retrieved. """
+        return self.entitlement_modes is not None
+
+    def owns_course(self, course, seat_types):
+        """ Returns True if the user is enrolled in, or entitled to, a program course in one of the given modes.
+
+        Arguments:
+            course (dict): Program course returned by the Discovery API.
+            seat_types (iterable): Modes the user must be enrolled or entitled in.
+        """
+        seat_types = set(seat_types)
+        if self.enrollment_modes.get(course['key'], set()) & seat_types:
+            return True
+        return bool(self.entitlement_modes and self.entitlement_modes.get(course['uuid'], set()) & seat_types)
+
+
+def _cache_key(site, username):
+    return get_cache_key(site_domain=site.domain, resource='program_ownership', username=username)
+
+
+def _fetch(resource_name, endpoint, username, paginated=False, consume=list):
+    """ Returns the user's enrollments or entitlements, or None if they could not be retrieved.
+
+    The results are passed to consume as an iterable. Pages of paginated results are requested as they are
+    consumed, so that consume can index them without all of them being held in memory.
+    """
+    try:
+        response = endpoint.get(user=username)
+        if paginated and isinstance(response, dict):
+            response = iterate_pagination(response, endpoint)
+        return consume(response)
+    except (ConnectionError, SlumberBaseException, Timeout) as exc:
+        logger.error('Failed to retrieve %s : %s', resource_name, str(exc))
+        return None
+
+
+def get_ownership_snapshot(site, username, include_entitlements=False):
+    """ Returns an OwnershipSnapshot of the courses a user owns.
+
+    Arguments:
+        site (Site): Site whose LMS holds the user's enrollments and entitlements.
+        username (str): Username of the user.
+        include_entitlements (bool): Whether the snapshot must include the user's entitlements.
+
+    Returns:
+        OwnershipSnapshot
+    """
+    cache_key = _cache_key(site, username)
+    snapshot = cache.get(cache_key)
+    if snapshot is not None and (snapshot.has_entitlements or not include_entitlements):
+        return snapshot
+
+    site_configuration = site.siteconfiguration
+    # The clients are built here, as building them may request an access token.
+    enrollment_endpoint = site_configuration.enrollment_api_client.enrollment if snapshot is None else None
+    wait_for_entitlements = None
+    if include_entitlements:
+        entitlement_endpoint = site_configuration.entitlement_api_client.entitlements
+        wait_for_entitlements = run_in_thread(
+            _fetch, 'entitlements', entitlement_endpoint, username, paginated=True,
+            consume=OwnershipSnapshot.index_entitlements
+        )
+
+    enrollments_retrieved = True
+    if snapshot is None:
+        enrollments = _fetch('enrollments', enrollment_endpoint, username)
+        enrollments_retrieved = enrollments is not None
+        snapshot = OwnershipSnapshot(enrollments or [])
+
+    if wait_for_entitlements:
+        entitlement_modes = wait_for_entitlements()
+        if entitlement_modes is not None:
+            snapshot.entitlement_modes = entitlement_modes
+
+    # Snapshots are not cached if the enrollments could not be retrieved. Entitlements which could not be
+    # retrieved are treated as none, and requested again the next time they are needed.
+    if enrollments_retrieved:
+        cache.set(cache_key, snapshot, settings.PROGRAM_OWNERSHIP_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_ownership_snapshot(site, user):
+    """ Remove the cached snapshot of the courses a user owns, after the user's enrollments or entitlements change.
+
+    Arguments:
+        site (Site): Site the snapshot was built for. Nothing is done if None.
+        user (User): The user. Nothing is done if None.
+    """
+    if site and user:
+        cache.delete(_cache_key(site, user.username))
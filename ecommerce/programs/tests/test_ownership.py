@@ -0,0 +1,112 @@
+import httpretty
+import mock
+from requests.exceptions import ConnectionError
+
+from ecommerce.programs.ownership import (
+    OwnershipSnapshot,
+    _fetch,
+    get_ownership_snapshot,
+    invalidate_ownership_snapshot
+)
+from ecommerce.programs.tests.mixins import ProgramTestMixin
+from ecommerce.tests.testcases import TestCase
+
+COURSE = {'key': 'test-org+course', 'uuid': '268afbfc-cc1e-415b-a5d8-c58d955bcfc1'}
+ENROLLMENT = {'mode': 'verified', 'course_details': {'course_id': 'course-v1:test-org+course+1'}}
+SEAT_TYPES = ['verified', 'professional']
+
+
+class OwnershipSnapshotTests(TestCase):
+    def test_enrollments(self):
+        """ Verify enrollments satisfy program courses matching their course run or course, in the given modes. """
+        snapshot = OwnershipSnapshot([ENROLLMENT])
+
+        self.assertTrue(snapshot.owns_course(COURSE, SEAT_TYPES))
+        self.assertTrue(snapshot.owns_course(dict(COURSE, key='course-v1:test-org+course+1'), SEAT_TYPES))
+        self.assertFalse(snapshot.owns_course(dict(COURSE, key='test-org+other'), SEAT_TYPES))
+        self.assertFalse(snapshot.owns_course(COURSE, ['credit']))
+        self.assertFalse(snapshot.has_entitlements)
+
+    def test_entitlements(self):
+        """ Verify entitlements satisfy program courses matching their course UUID, in the given modes. """
+        snapshot = OwnershipSnapshot([], [{'mode': 'verified', 'course_uuid': COURSE['uuid']}])
+
+        self.assertTrue(snapshot.has_entitlements)
+        self.assertTrue(snapshot.owns_course(COURSE, SEAT_TYPES))
+        self.assertFalse(snapshot.owns_course(dict(COURSE, uuid='other'), SEAT_TYPES))
+
+
+class GetOwnershipSnapshotTests(ProgramTestMixin, TestCase):
+    def setUp(self):
+        super(GetOwnershipSnapshotTests, self).setUp()
+        self.user = self.create_user()
+
+    @httpretty.activate
+    def test_cached_until_invalidated(self):
+        """ Verify snapshots are cached until they are invalidated. """
+        self.mock_user_data(self.user.username, owned_products=[ENROLLMENT])
+        self.mock_user_data(self.user.username, mocked_api='entitlements', owned_products={
+            'count': 1, 'next': None, 'previous': None,
+            'results': [{'mode': 'verified', 'course_uuid': 'bd56ac27-f8ce-4d6b-96b6-2bcb1d1b3a0c'}],
+        })
+
+        snapshot = get_ownership_snapshot(self.site, self.user.username, include_entitlements=True)
+        self.assertTrue(snapshot.owns_course(COURSE, SEAT_TYPES))
+
+        self.mock_user_data(self.user.username, owned_products=[])
+        self.assertTrue(get_ownership_snapshot(self.site, self.user.username).owns_course(COURSE, SEAT_TYPES))
+
+        invalidate_ownership_snapshot(self.site, self.user)
+        self.assertFalse(get_ownership_snapshot(self.site, self.user.username).owns_course(COURSE, SEAT_TYPES))
+
+    @httpretty.activate
+    def test_entitlements_requested(self):
+        """ Verify entitlements are added to a cached snapshot without them when entitlements are required. """
+        self.mock_user_data(self.user.username)
+        self.assertFalse(get_ownership_snapshot(self.site, self.user.username).has_entitlements)
+
+        self.mock_user_data(self.user.username, mocked_api='entitlements', owned_products=[])
+        snapshot = get_ownership_snapshot(self.site, self.user.username, include_entitlements=True)
+        self.assertTrue(snapshot.has_entitlements)
+
+    @httpretty.activate
+    def test_failure_not_cached(self):
+        """ Verify snapshots missing data due to an error are not cached. """
+        self.mock_user_data(self.user.username, response_code=500)
+        self.assertFalse(get_ownership_snapshot(self.site, self.user.username).owns_course(COURSE, SEAT_TYPES))
+
+        self.mock_user_data(self.user.username, owned_products=[ENROLLMENT])
+        self.assertTrue(get_ownership_snapshot(self.site, self.user.username).owns_course(COURSE, SEAT_TYPES))
+
+    @httpretty.activate
+    def test_entitlement_failure(self):
+        """ Verify enrollments are cached if entitlements cannot be retrieved, and that these are requested again. """
+        self.mock_user_data(self.user.username, owned_products=[ENROLLMENT])
+        self.mock_user_data(self.user.username, mocked_api='entitlements', response_code=500)
+        snapshot = get_ownership_snapshot(self.site, self.user.username, include_entitlements=True)
+        self.assertTrue(snapshot.owns_course(COURSE, SEAT_TYPES))
+        self.assertFalse(snapshot.has_entitlements)
+
+        self.mock_user_data(self.user.username, owned_products=[])
+        self.mock_user_data(self.user.username, mocked_api='entitlements', owned_products=[])
+        snapshot = get_ownership_snapshot(self.site, self.user.username, include_entitlements=True)
+        self.assertTrue(snapshot.owns_course(COURSE, SEAT_TYPES))
+        self.assertTrue(snapshot.has_entitlements)
+
+    def test_entitlement_pages_indexed(self):
+        """ Verify pages of entitlements are indexed as they are retrieved, and an error on any page is handled. """
+        endpoint = mock.Mock()
+        first_page = {
+            'next': 'http://lms.example.com/api/entitlements/v1/entitlements/?page=2',
+            'results': [{'mode': 'verified', 'course_uuid': COURSE['uuid']}],
+        }
+        endpoint.get.side_effect = [first_page, {'next': None, 'results': []}]
+        entitlement_modes = _fetch(
+            'entitlements', endpoint, self.user.username, paginated=True, consume=OwnershipSnapshot.index_entitlements
+        )
+        self.assertEqual(entitlement_modes, {COURSE['uuid']: {'verified'}})
+
+        endpoint.get.side_effect = [first_page, ConnectionError]
+        self.assertIsNone(_fetch(
+            'entitlements', endpoint, self.user.username, paginated=True, consume=OwnershipSnapshot.index_entitlements
+        ))
@@ -267,6 +267,13 @@ OSCAR_DASHBOARD_NAVIGATION = [
 # Default timeout for Enrollment API calls
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
 
+# Maximum number of connections to the Enrollment API kept open by each process, which is also the number of
+# enrollment requests sent at once when fulfilling or revoking several lines.
+ENROLLMENT_API_POOL_SIZE = 10
+
+# Class through which enrollments are sent to the LMS.
+ENROLLMENT_GATEWAY = 'ecommerce.extensions.fulfillment.gateway.EnrollmentGateway'
+
 # Coupon code length
 VOUCHER_CODE_LENGTH = 16
 
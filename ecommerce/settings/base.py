@@ -212,6 +212,9 @@ TEMPLATES = [
 # MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    # NOTE: ProfilingMiddleware is only active when REQUEST_PROFILING_ENABLED is set. It
+    # is listed first so that the queries made by all other middleware are profiled.
+    'ecommerce.core.middleware.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -249,17 +252,73 @@ PROGRAM_CACHE_TIMEOUT = 3600  # Value is in seconds.
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
+# Maximum number of concurrent requests checking a user's credit eligibility in several courses.
+CREDIT_ELIGIBILITY_CONCURRENCY = 10
 
 # Anonymous User Calculate Cache timeout
 ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
 # Enrollment API settings used for fetching information from LMS
 ENROLLMENT_API_CACHE_TIMEOUT = 30  # Value is in seconds.
+# Snapshots of the enrollments and entitlements of users, used to evaluate program offers. Snapshots are also
+# invalidated when orders are fulfilled or refunded. See ecommerce.programs.ownership.
+PROGRAM_OWNERSHIP_CACHE_TIMEOUT = 3600  # Value is in seconds.
 # END URL CONFIGURATION
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+# Google Analytics client IDs seen by TrackingMiddleware are buffered in the cache until written to the database.
+TRACKING_CONTEXT_BUFFER_TIMEOUT = 3600  # Value is in seconds.
+
+# Stock record SKU index, held in the cache and in each process. See ecommerce.extensions.partner.sku_index.
+SKU_INDEX_CACHE_TIMEOUT = 3600  # Value is in seconds.
+# Entries are invalidated locally when stock records change, but other processes keep their copies until this
+# timeout elapses. Set to 0 to only use the cache.
+SKU_INDEX_LOCAL_TIMEOUT = 60  # Value is in seconds.
+
+# Stock records selected by the partner strategy for products which do not track stock. Entries also expire
+# with their product. See ecommerce.extensions.partner.strategy.
+PURCHASE_INFO_CACHE_TIMEOUT = 3600  # Value is in seconds.
+
+# Coupons with more offers than this are updated by a background task when their benefit or offers change.
+# Set to None to always update coupons within the request.
+COUPON_BULK_UPDATE_ASYNC_THRESHOLD = None
+COUPON_UPDATE_PROGRESS_TIMEOUT = 86400  # Value is in seconds.
+
+# Times at which users' orders last changed, from which the order list API derives its ETag and Last-Modified headers.
+ORDER_HISTORY_VERSION_CACHE_TIMEOUT = 86400  # Value is in seconds.
+
+# Responses of the read-only catalog APIs (courses, products, catalogs, partners and stock records) are cached,
+# and tagged with ETags, per catalog version. The version changes when products, stock records, courses, catalogs
+# or partners are saved, and responses also expire after CATALOG_API_RESPONSE_CACHE_TIMEOUT, as product
+# availability depends on the current time.
+CATALOG_VERSION_CACHE_TIMEOUT = 86400  # Value is in seconds.
+CATALOG_API_RESPONSE_CACHE_TIMEOUT = 300  # Value is in seconds.
+
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
+# Results of SDN and embargo checks are cached briefly, so that payment form retries and basket reloads do not
+# query these services again. Checks already in progress elsewhere are awaited for at most the request or collapse
+# timeout, rather than repeated. See ecommerce.core.utils.call_collapsed.
+SDN_CHECK_CACHE_TIMEOUT = 300  # Value is in seconds.
+SDN_CHECK_POOL_SIZE = 10
+EMBARGO_CHECK_CACHE_TIMEOUT = 60  # Value is in seconds.
+EMBARGO_CHECK_COLLAPSE_TIMEOUT = 5  # Value is in seconds.
+
+# SOAP clients, such as the CyberSource Simple Order API client. See ecommerce.extensions.payment.soap.
+# WSDL and XSD documents are cached in a SQLite database at SOAP_WSDL_CACHE_PATH, or zeep's default location if None.
+SOAP_WSDL_CACHE_PATH = None
+SOAP_WSDL_CACHE_TIMEOUT = 86400  # Value is in seconds.
+# Timeout of SOAP operations, or None to wait indefinitely.
+SOAP_OPERATION_TIMEOUT = None  # Value is in seconds.
+SOAP_CLIENT_POOL_SIZE = 10
+
+# Number of rows across which the redemptions of each offer and voucher are counted, until they are added to the
+# offer or voucher by the reconcile_redemption_counters command. See ecommerce.extensions.offer.redemptions.
+REDEMPTION_COUNTER_STRIPES = 8
+
+# Payment source and event types are looked up once per process, rather than each time an order is placed.
+# See ecommerce.extensions.payment.utils.get_payment_type.
+PAYMENT_TYPE_LOCAL_CACHE = True
 
 # APP CONFIGURATION
 DJANGO_APPS = [
@@ -311,6 +370,11 @@ syslog_address = '/var/run/syslog' if platform.system().lower() == 'darwin' else
 syslog_format = '[service_variant=ecommerce][%(name)s] %(levelname)s [{hostname}  %(process)d] ' \
                 '[%(pathname)s:%(lineno)d] - %(message)s'.format(hostname=hostname)
 
+# Records are handed to the console and syslog handlers by background threads, through queues holding at most
+# LOGGING_QUEUE_CAPACITY records, so that logging never blocks requests. Records logged when a queue is full are
+# dropped and counted. Audit events are sent to syslog as JSON. See ecommerce.core.logging_utils.
+LOGGING_QUEUE_CAPACITY = 10000
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -319,6 +383,7 @@ LOGGING = {
             'format': '%(asctime)s %(levelname)s %(process)d [%(name)s] %(pathname)s:%(lineno)d - %(message)s',
         },
         'syslog_format': {'format': syslog_format},
+        'json': {'()': 'ecommerce.core.logging_utils.JsonFormatter'},
     },
     'handlers': {
         'console': {
@@ -334,40 +399,71 @@ LOGGING = {
             'formatter': 'syslog_format',
             'facility': SysLogHandler.LOG_LOCAL0,
         },
+        'audit_local': {
+            'level': 'INFO',
+            'class': 'logging.handlers.SysLogHandler',
+            'address': syslog_address,
+            'formatter': 'json',
+            'facility': SysLogHandler.LOG_LOCAL0,
+        },
+        'queued_console': {
+            'level': level,
+            'class': 'ecommerce.core.logging_utils.QueueHandler',
+            'capacity': LOGGING_QUEUE_CAPACITY,
+            'target': 'console',
+        },
+        'queued_local': {
+            'level': level,
+            'class': 'ecommerce.core.logging_utils.QueueHandler',
+            'capacity': LOGGING_QUEUE_CAPACITY,
+            'target': 'local',
+        },
+        'queued_audit_local': {
+            'level': 'INFO',
+            'class': 'ecommerce.core.logging_utils.QueueHandler',
+            'capacity': LOGGING_QUEUE_CAPACITY,
+            'target': 'audit_local',
+        },
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'INFO'
         },
         'requests': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'WARNING'
         },
         'factory': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'WARNING'
         },
         'elasticsearch': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'WARNING'
         },
         'urllib3': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'WARNING'
         },
         'django.request': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'propagate': True,
             'level': 'WARNING'
         },
+        # Audit events, logged by ecommerce.extensions.analytics.utils.audit_log.
+        'ecommerce.extensions.analytics.utils': {
+            'handlers': ['queued_console', 'queued_audit_local'],
+            'propagate': False,
+            'level': 'INFO'
+        },
         '': {
-            'handlers': ['console', 'local'],
+            'handlers': ['queued_console', 'queued_local'],
             'level': 'DEBUG',
             'propagate': False
         },
@@ -499,12 +595,15 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.extensions.voucher.tasks',
 )
 
 CELERY_ROUTES = {
     'ecommerce_worker.fulfillment.v1.tasks.fulfill_order': {'queue': 'fulfillment'},
     'ecommerce_worker.sailthru.v1.tasks.update_course_enrollment': {'queue': 'email_marketing'},
     'ecommerce_worker.sailthru.v1.tasks.send_course_refund_email': {'queue': 'email_marketing'},
+    # Consumed by a worker running this project's Celery app, e.g. `celery -A ecommerce.celery_app worker -Q coupons`.
+    'ecommerce.extensions.voucher.tasks.update_coupon_offers': {'queue': 'coupons'},
 }
 
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
@@ -596,3 +695,13 @@ if os.environ.get('ENABLE_DJANGO_TOOLBAR', False):
 
 # Determines if events are actually sent to Segment. This should only be set to False for testing purposes.
 SEND_SEGMENT_EVENTS = True
+
+# REQUEST PROFILING
+# Profile the queries, outbound calls and cache lookups made by each request. See ecommerce.core.profiling.
+REQUEST_PROFILING_ENABLED = False
+
+# Per-view limits, keyed by URL name, on the work done by a single request. Limits may be set for
+# queries, duplicate_queries and outbound_calls. For example:
+#   {'basket:summary': {'queries': 40, 'duplicate_queries': 0, 'outbound_calls': 2}}
+REQUEST_PROFILING_BUDGETS = {}
+# END REQUEST PROFILING
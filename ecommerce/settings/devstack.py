@@ -11,6 +11,9 @@ ENABLE_AUTO_AUTH = True
 LOGGING['handlers']['local'] = {
     'class': 'logging.NullHandler',
 }
+LOGGING['handlers']['audit_local'] = {
+    'class': 'logging.NullHandler',
+}
 
 SOCIAL_AUTH_REDIRECT_IS_HTTPS = False
 
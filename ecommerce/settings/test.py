@@ -19,6 +19,7 @@ TEST_RUNNER = 'django_nose.NoseTestSuiteRunner'
 
 # Disable syslog logging since we usually do not have syslog enabled in test environments.
 LOGGING['handlers']['local'] = {'class': 'logging.NullHandler'}
+LOGGING['handlers']['audit_local'] = {'class': 'logging.NullHandler'}
 
 # Disable console logging to cut down on log size. Nose will capture the logs for us.
 LOGGING['handlers']['console'] = {'class': 'logging.NullHandler'}
@@ -162,3 +163,7 @@ ENTERPRISE_API_URL = urljoin(ENTERPRISE_SERVICE_URL, 'api/v1/')
 
 # Don't bother sending fake events to Segment. Doing so creates unnecessary threads.
 SEND_SEGMENT_EVENTS = False
+
+# Tests reuse database IDs, so the per-process SKU index and payment types would outlive the data they describe.
+SKU_INDEX_LOCAL_TIMEOUT = 0
+PAYMENT_TYPE_LOCAL_CACHE = False
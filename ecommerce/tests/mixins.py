@@ -3,6 +3,7 @@
 import datetime
 import json
 import re
+from contextlib import contextmanager
 from decimal import Decimal
 
 import httpretty
@@ -20,6 +21,7 @@ from oscar.test.utils import RequestFactory
 from social_django.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.profiling import Budget, Profiler, get_budget
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
@@ -83,6 +85,27 @@ class ThrottlingMixin(object):
         self.addCleanup(cache.clear)
 
 
+class ProfilingMixin(object):
+    """ Mixin for asserting that code stays within a query and outbound call budget. """
+
+    @contextmanager
+    def assert_within_budget(self, view_name=None, **limits):
+        """ Profile the wrapped code, and fail if it exceeds the given limits.
+
+        Arguments:
+            view_name (str): URL name of a view whose budget, declared in REQUEST_PROFILING_BUDGETS, applies.
+            **limits: Limits for queries, duplicate_queries and/or outbound_calls, used instead of a declared budget.
+        """
+        budget = Budget(**limits) if limits else get_budget(view_name)
+        self.assertIsNotNone(budget, 'No budget is declared for [{}].'.format(view_name))
+
+        with Profiler(site=getattr(self, 'site', None)) as profile:
+            yield profile
+
+        violations = budget.check(profile)
+        self.assertFalse(violations, '; '.join(violations))
+
+
 class JwtMixin(object):
     """ Mixin with JWT-related helper functions. """
     JWT_SECRET_KEY = settings.JWT_AUTH['JWT_SECRET_KEY']
@@ -0,0 +1,43 @@
+"""
+Guards the modules imported when a process starts.
+
+Every web worker, Celery worker and management command imports the settings, the installed apps and, once serving
+requests, every view. Payment SDKs, zeep and libsass are imported when first used, rather than at startup.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+from ecommerce.tests.testcases import TestCase
+
+LAZY_MODULES = ('paypalrestsdk', 'sass', 'stripe', 'zeep')
+
+STARTUP_SCRIPT = """
+import json
+import sys
+
+import django
+django.setup()
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+
+print(json.dumps(sorted(name for name in sys.modules if name.split('.')[0] in %r)))
+"""
+
+
+class StartupTests(TestCase):
+    def test_startup(self):
+        """ Verify the apps and URLs load without importing optional SDKs. """
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='ecommerce.settings.test')
+        output = subprocess.check_output(
+            [sys.executable, '-c', STARTUP_SCRIPT % (LAZY_MODULES,)],
+            cwd=os.path.dirname(settings.DJANGO_ROOT),
+            env=env
+        )
+        modules = json.loads(output.strip().splitlines()[-1])
+
+        self.assertEqual(modules, [])
@@ -1,6 +1,9 @@
 """
 Tests for Management commands of comprehensive theming.
 """
+import shutil
+import tempfile
+
 from django.conf import settings
 from django.core.management import CommandError, call_command
 from django.test import TestCase, override_settings
@@ -12,7 +15,10 @@ from ecommerce.theming.management.commands.update_assets import (
     SYSTEM_SASS_PATHS,
     Command,
     compile_sass,
-    get_sass_directories
+    compile_sass_group,
+    get_sass_directories,
+    get_sass_fingerprint,
+    group_sass_directories
 )
 
 
@@ -157,3 +163,56 @@ class TestUpdateAssets(TestCase):
             call_command("update_assets", "--skip-collect", "--skip-system", themes=[])
 
             self.assertFalse(mock_call_command.called)
+
+    def test_group_sass_directories(self):
+        """
+        Test that sass directories are grouped by css destination, preserving compilation order within a group.
+        """
+        sass_dirs = get_sass_directories(themes=self.themes, system=True)
+        groups = group_sass_directories(sass_dirs)
+
+        self.assertEqual(len(groups), len({sass_dir['css_destination_dir'] for sass_dir in sass_dirs}))
+        self.assertEqual([sass_dir for group in groups for sass_dir in group], sass_dirs)
+        for group in groups:
+            self.assertEqual(len({sass_dir['css_destination_dir'] for sass_dir in group}), 1)
+
+    def write_sass(self, path, text):
+        with open(path, 'w') as sass_file:
+            sass_file.write(text)
+
+    def test_compile_sass_group_incremental(self):
+        """
+        Test that an unchanged group is skipped and a changed group is recompiled when compiling incrementally.
+        """
+        source_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, source_dir)
+        self.write_sass(source_dir / 'main.scss', 'a { color: red; }')
+        sass_dirs = [{
+            'sass_source_dir': source_dir,
+            'css_destination_dir': source_dir / 'css',
+            'lookup_paths': [],
+        }]
+
+        with patch('ecommerce.theming.management.commands.update_assets.sass.compile') as mock_compile:
+            __, __, skipped, __ = compile_sass_group(sass_dirs, incremental=True)
+            self.assertFalse(skipped)
+
+            __, __, skipped, __ = compile_sass_group(sass_dirs, incremental=True)
+            self.assertTrue(skipped)
+            self.assertEqual(mock_compile.call_count, 1)
+
+            self.write_sass(source_dir / 'main.scss', 'a { color: blue; }')
+            __, __, skipped, __ = compile_sass_group(sass_dirs, incremental=True)
+            self.assertFalse(skipped)
+            self.assertEqual(mock_compile.call_count, 2)
+
+    def test_sass_fingerprint_depends_on_options(self):
+        """
+        Test that the sass fingerprint changes with the compilation options.
+        """
+        sass_dirs = get_sass_directories(themes=[], system=True)
+        self.assertEqual(get_sass_fingerprint(sass_dirs), get_sass_fingerprint(sass_dirs))
+        self.assertNotEqual(
+            get_sass_fingerprint(sass_dirs, output_style='nested'),
+            get_sass_fingerprint(sass_dirs, output_style='compressed'),
+        )
@@ -5,16 +5,21 @@ Managements for asset compilation and collection.
 from __future__ import unicode_literals
 
 import datetime
+import hashlib
+import json
 import logging
+from collections import OrderedDict
+from multiprocessing import Pool
 
-import sass
 from django.conf import settings
 from django.core.management import BaseCommand, CommandError, call_command
 from path import Path
 
+from ecommerce.core.utils import lazy_import
 from ecommerce.theming.helpers import get_theme_base_dirs, get_themes, is_comprehensive_theming_enabled
 
 logger = logging.getLogger(__name__)
+sass = lazy_import('sass')
 
 SYSTEM_SASS_PATHS = [
     # to resolve @import, we need to first look in 'sass/partials' then 'sass/base' and finally in "sass" dirs
@@ -25,6 +30,10 @@ SYSTEM_SASS_PATHS = [
     Path("ecommerce/static/sass"),
 ]
 
+# Name of the file, placed in every css destination directory, that records a fingerprint of the sass sources
+# last compiled into it. Dot-files are ignored by collectstatic, so the manifest never ends up in STATIC_ROOT.
+SASS_MANIFEST_NAME = ".sass-manifest.json"
+
 
 class Command(BaseCommand):
     """
@@ -88,6 +97,22 @@ class Command(BaseCommand):
             help="Skip collection of static assets.",
         )
 
+        parser.add_argument(
+            '--processes',
+            dest='processes',
+            type=int,
+            default=1,
+            help="Number of worker processes used to compile sass (default=1, i.e. compile serially).",
+        )
+
+        parser.add_argument(
+            '--incremental',
+            dest='incremental',
+            action='store_true',
+            default=False,
+            help="Skip themes whose sass sources and imports have not changed since the last compilation.",
+        )
+
     @staticmethod
     def parse_arguments(*args, **options):  # pylint: disable=unused-argument
         """
@@ -140,28 +165,39 @@ class Command(BaseCommand):
         Handle update_assets command.
         """
         logger.info("Sass compilation started.")
-        info = []
 
         themes, system, source_comments, output_style, collect = self.parse_arguments(*args, **options)
+        processes = options.get('processes', 1)
+        incremental = options.get('incremental', False)
 
         if not is_comprehensive_theming_enabled():
             themes = []
             logger.info("Skipping theme sass compilation as theming is disabled.")
 
-        for sass_dir in get_sass_directories(themes, system):
-            result = compile_sass(
-                sass_source_dir=sass_dir['sass_source_dir'],
-                css_destination_dir=sass_dir['css_destination_dir'],
-                lookup_paths=sass_dir['lookup_paths'],
-                output_style=output_style,
-                source_comments=source_comments,
-            )
-            info.append(result)
+        groups = group_sass_directories(get_sass_directories(themes, system))
+        compile_options = {'output_style': output_style, 'source_comments': source_comments}
+        tasks = [(sass_dirs, compile_options, incremental) for sass_dirs in groups]
+
+        if processes > 1 and len(tasks) > 1:
+            pool = Pool(processes=min(processes, len(tasks)))
+            try:
+                results = pool.map(_compile_sass_group_task, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_compile_sass_group_task(task) for task in tasks]
 
         logger.info("Sass compilation completed.")
 
-        for sass_dir, css_dir, duration in info:
-            logger.info(">> %s -> %s in %ss", sass_dir, css_dir, duration)
+        for css_dir, info, skipped, duration in results:
+            if skipped:
+                logger.info(">> %s is up to date, skipped.", css_dir)
+                continue
+
+            for sass_dir, __, dir_duration in info:
+                logger.info(">> %s -> %s in %ss", sass_dir, css_dir, dir_duration)
+            logger.info(">> %s compiled in %ss", css_dir, duration)
         logger.info("\n")
 
         if collect and not settings.DEBUG:
@@ -226,6 +262,125 @@ def get_theme_sass_directories(themes):
     return applicable_dirs
 
 
+def group_sass_directories(sass_dirs):
+    """
+    Group sass directories by their css destination directory.
+
+    Theme overrides are compiled into the same destination as the system sass compiled against the theme partials,
+    and must be applied after it. Directories sharing a destination are therefore kept together, in their original
+    order, while separate groups (i.e. the system css and each theme) are independent of each other.
+
+    Args:
+        sass_dirs (list): sass directories, as returned by get_sass_directories.
+
+    Returns:
+        List of lists of sass directories, one list per css destination directory.
+    """
+    groups = OrderedDict()
+    for sass_dir in sass_dirs:
+        groups.setdefault(sass_dir['css_destination_dir'], []).append(sass_dir)
+
+    return list(groups.values())
+
+
+def get_sass_fingerprint(sass_dirs, **kwargs):
+    """
+    Compute a content hash of everything that affects the css compiled for the given sass directories.
+
+    The hash covers every sass file in the source directories and lookup paths (which is where @imports are
+    resolved from, including theme overrides), the compilation options and the libsass version.
+
+    Args:
+        sass_dirs (list): sass directories sharing a css destination directory.
+
+    Returns:
+        str: hex digest of the fingerprint.
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps({
+        'libsass': sass.__version__,
+        'output_style': kwargs.get('output_style', 'compressed'),
+        'source_comments': kwargs.get('source_comments', False),
+    }, sort_keys=True).encode('utf-8'))
+
+    for sass_dir in sass_dirs:
+        directories = [sass_dir['sass_source_dir']] + list(sass_dir['lookup_paths'])
+        for directory in directories:
+            directory = Path(directory)
+            digest.update(directory.encode('utf-8'))
+            if not directory.isdir():
+                continue
+
+            for sass_file in sorted(directory.walkfiles('*.scss')):
+                digest.update(directory.relpathto(sass_file).encode('utf-8'))
+                digest.update(sass_file.bytes())
+
+    return digest.hexdigest()
+
+
+def read_sass_manifest(css_destination_dir):
+    """
+    Return the fingerprint recorded by the last compilation into the given css directory, or None.
+    """
+    try:
+        with open(Path(css_destination_dir) / SASS_MANIFEST_NAME) as manifest:
+            return json.load(manifest).get('fingerprint')
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_sass_manifest(css_destination_dir, fingerprint):
+    """
+    Record the fingerprint of the sass sources compiled into the given css directory.
+    """
+    with open(Path(css_destination_dir) / SASS_MANIFEST_NAME, 'w') as manifest:
+        json.dump({'fingerprint': fingerprint}, manifest)
+
+
+def compile_sass_group(sass_dirs, incremental=False, **kwargs):
+    """
+    Compile sass directories sharing a css destination directory.
+
+    Args:
+        sass_dirs (list): sass directories sharing a css destination directory, in compilation order.
+        incremental (bool): skip compilation if sources are unchanged since the last compilation.
+
+    Returns:
+        A tuple containing the css destination dir, the list of compile_sass results, whether compilation was
+        skipped and the total duration.
+    """
+    start = datetime.datetime.now()
+    css_destination_dir = sass_dirs[0]['css_destination_dir']
+    fingerprint = None
+
+    if incremental:
+        fingerprint = get_sass_fingerprint(sass_dirs, **kwargs)
+        if fingerprint == read_sass_manifest(css_destination_dir):
+            return css_destination_dir, [], True, datetime.datetime.now() - start
+
+    info = []
+    for sass_dir in sass_dirs:
+        info.append(compile_sass(
+            sass_source_dir=sass_dir['sass_source_dir'],
+            css_destination_dir=sass_dir['css_destination_dir'],
+            lookup_paths=sass_dir['lookup_paths'],
+            **kwargs
+        ))
+
+    if incremental:
+        write_sass_manifest(css_destination_dir, fingerprint)
+
+    return css_destination_dir, info, False, datetime.datetime.now() - start
+
+
+def _compile_sass_group_task(task):
+    """
+    Unpack arguments for compile_sass_group. Module-level so that it can be used with a process pool.
+    """
+    sass_dirs, compile_options, incremental = task
+    return compile_sass_group(sass_dirs, incremental=incremental, **compile_options)
+
+
 def compile_sass(sass_source_dir, css_destination_dir, lookup_paths, **kwargs):
     """
     Compile given sass files.